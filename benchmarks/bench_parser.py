@@ -0,0 +1,58 @@
+"""
+Parser engine throughput on long operator chains, and on deep nesting for the engines that
+do not recurse.
+
+    python -m benchmarks.bench_parser [operands]
+"""
+import random
+import sys
+import time
+
+from src.veda import Parser, Scanner
+from src.veda.pratt_parser import PrattParser
+from src.veda.table_parser import TableParser
+
+OPERATORS = ["+", "-", "*", "/", "==", "!=", "<", "<=", ">", ">="]
+
+
+def operator_chain(operands: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts = [str(rng.randint(0, 999))]
+    for _ in range(operands - 1):
+        parts.append(rng.choice(OPERATORS))
+        parts.append(("-" if rng.random() < 0.1 else "") + str(rng.randint(0, 999)))
+    return " ".join(parts)
+
+
+def measure(engine, tokens, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        engine(tokens).parse()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def main(operands: int = 100_000):
+    sample = Scanner(operator_chain(50)).scan_tokens()
+    assert Parser(sample).parse() == PrattParser(sample).parse() == TableParser(sample).parse()
+
+    tokens = Scanner(operator_chain(operands), engine="regex").scan_tokens()
+
+    baseline = None
+    for engine in (Parser, PrattParser, TableParser):
+        seconds = measure(engine, tokens)
+        baseline = baseline or seconds
+        print(
+            f"{engine.__name__:12} {len(tokens) / seconds:12,.0f} tokens/s"
+            f"  {baseline / seconds:5.2f}x"
+        )
+
+    depth = operands // 2
+    nested = Scanner("-(" * depth + "1" + ")" * depth, engine="regex").scan_tokens()
+    seconds = measure(TableParser, nested)
+    print(f"{'TableParser':12} {len(nested) / seconds:12,.0f} tokens/s  (nesting depth {depth:,})")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,95 @@
+"""
+Load test of `veda serve`: requests per second and latency percentiles of a mix of scan,
+parse, print and evaluate requests on a few open documents, with many requests in flight
+and the documents edited between them.
+
+    python -m benchmarks.bench_server [requests] [concurrency]
+"""
+import asyncio
+import json
+import random
+import statistics
+import sys
+import time
+
+from benchmarks.corpus import CORPORA
+from src.veda.server import encode_message, read_message
+
+DOCUMENTS = 8
+METHODS = ["scan", "parse", "print", "evaluate"]
+
+
+async def load(requests: int, concurrency: int, seed: int = 0):
+    process = await asyncio.create_subprocess_exec(
+        sys.executable,
+        "-m",
+        "src.veda",
+        "serve",
+        stdin=asyncio.subprocess.PIPE,
+        stdout=asyncio.subprocess.PIPE,
+    )
+    rng = random.Random(seed)
+    pending = dict()  # id -> (future, start)
+
+    def send(message):
+        process.stdin.write(encode_message(message))
+
+    async def receive():
+        while True:
+            body = await read_message(process.stdout)
+            if body is None:
+                break
+            response = json.loads(body)
+            future, start = pending.pop(response["id"])
+            future.set_result(time.perf_counter() - start)
+
+    async def request(id, method, params):
+        future = asyncio.get_running_loop().create_future()
+        pending[id] = (future, time.perf_counter())
+        send({"jsonrpc": "2.0", "id": id, "method": method, "params": params})
+        return await future
+
+    receiver = asyncio.ensure_future(receive())
+    uris = [f"doc{i}" for i in range(DOCUMENTS)]
+    for i, uri in enumerate(uris):
+        text = CORPORA["chain"](200, i)
+        send({"jsonrpc": "2.0", "method": "open", "params": {"uri": uri, "text": text}})
+
+    latencies = list()
+    ids = iter(range(requests))
+    slots = asyncio.Semaphore(concurrency)
+
+    async def client():
+        for id in ids:
+            async with slots:
+                uri = rng.choice(uris)
+                if rng.random() < 0.05:
+                    text = CORPORA["chain"](200, rng.randrange(1000))
+                    params = {"uri": uri, "text": text}
+                    send({"jsonrpc": "2.0", "method": "change", "params": params})
+                latencies.append(await request(id, rng.choice(METHODS), {"uri": uri}))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(client() for _ in range(concurrency)))
+    seconds = time.perf_counter() - start
+
+    await request(requests, "shutdown", {})
+    send({"jsonrpc": "2.0", "method": "exit"})
+    process.stdin.close()
+    await receiver
+    await process.wait()
+    return seconds, latencies
+
+
+def main(requests: int = 20_000, concurrency: int = 32):
+    seconds, latencies = asyncio.run(load(requests, concurrency))
+    percentiles = statistics.quantiles(latencies, n=100)
+    print(f"{requests:,} requests, {concurrency} in flight: {requests / seconds:,.0f} req/s")
+    print(
+        f"latency p50 {percentiles[49] * 1000:.2f} ms  p99 {percentiles[98] * 1000:.2f} ms"
+        f"  max {max(latencies) * 1000:.2f} ms"
+    )
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
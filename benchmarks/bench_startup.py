@@ -0,0 +1,62 @@
+"""
+Wall time of launching `python -m src.veda` on a small script, against launching a bare
+interpreter, and the slowest imports of the package on that path. Exits with 1 if the
+package takes longer than `BUDGET_US` to import.
+
+    python -m benchmarks.bench_startup [runs]
+"""
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+# Cumulative import time of the `src` package when running a small script, in microseconds.
+# Measured at 22-36ms on an idle machine; the budget is a quarter above the slowest of those.
+BUDGET_US = 45_000
+
+
+def launch(args, runs: int) -> float:
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run([sys.executable, *args], check=True, stdout=subprocess.DEVNULL)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times)
+
+
+def main(runs: int = 20):
+    with tempfile.TemporaryDirectory() as directory:
+        script = os.path.join(directory, "script.veda")
+        with open(script, "w") as f:
+            f.write("(1 + 2) * 3 == 9")
+
+        bare = launch(["-c", "pass"], runs)
+        veda = launch(["-m", "src.veda", script], runs)
+        print(f"python -c pass      {bare * 1000:7.1f} ms")
+        print(f"python -m src.veda  {veda * 1000:7.1f} ms  (+{(veda - bare) * 1000:.1f} ms)")
+
+        process = subprocess.run(
+            [sys.executable, "-X", "importtime", "-m", "src.veda", script],
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+    imports = []
+    total = 0
+    for line in process.stderr.splitlines()[1:]:
+        own, cumulative, name = line[len("import time:") :].split("|")
+        if name.strip().startswith("src"):
+            imports.append((int(own), name.strip()))
+            if not name.startswith("  "):
+                total += int(cumulative)
+    print("slowest package imports (self time):")
+    for own, name in sorted(imports, reverse=True)[:8]:
+        print(f"  {own:6} us  {name}")
+    print(f"package import time {total:6} us  (budget {BUDGET_US} us)")
+    return 0 if total < BUDGET_US else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main(*map(int, sys.argv[1:])))
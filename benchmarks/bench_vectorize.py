@@ -0,0 +1,44 @@
+"""
+NumPy column evaluation against evaluating a formula row by row with compiled Python code.
+
+    python -m benchmarks.bench_vectorize [rows]
+"""
+import sys
+import time
+
+import numpy as np
+
+from src.veda import Parser, Scanner
+from src.veda.codegen import PythonCompiler
+from src.veda.vectorize import evaluate_columns
+
+FORMULA = "(price * quantity - discount) / quantity > 10 == !(quantity < 1)"
+
+
+def main(rows: int = 1_000_000):
+    rng = np.random.default_rng(0)
+    columns = {
+        "price": rng.uniform(1, 100, rows),
+        "quantity": rng.integers(0, 20, rows).astype(np.float64),
+        "discount": rng.uniform(0, 50, rows),
+    }
+    expression = Parser(Scanner(FORMULA).scan_tokens()).parse()
+    assert expression is not None
+
+    start = time.perf_counter()
+    vector = evaluate_columns(expression, columns)
+    vectorized = time.perf_counter() - start
+
+    function = PythonCompiler().compile(expression)
+    names = list(columns)
+    start = time.perf_counter()
+    scalar = [function(dict(zip(names, row))) for row in zip(*(columns[n].tolist() for n in names))]
+    row_by_row = time.perf_counter() - start
+
+    assert vector.tolist() == scalar
+    print(f"row by row {rows / row_by_row:14,.0f} rows/s")
+    print(f"vectorized {rows / vectorized:14,.0f} rows/s  {row_by_row / vectorized:6.1f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,54 @@
+"""
+Bytecode VM and Python code generation against the tree-walking interpreter, evaluating
+compiled expressions repeatedly.
+
+    python -m benchmarks.bench_vm [operands] [evaluations]
+"""
+import random
+import sys
+import time
+
+from src.veda import Parser, Scanner
+from src.veda.codegen import PythonCompiler
+from src.veda.compiler import Compiler
+from src.veda.interpreter import Interpreter
+from src.veda.vm import VM
+
+
+def arithmetic(operands: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts = [str(rng.randint(1, 99))]
+    for _ in range(operands - 1):
+        operand = str(rng.randint(1, 99))
+        if rng.random() < 0.2:
+            operand = f"(-{operand} * {rng.randint(1, 9)})"
+        parts.append(rng.choice(["+", "-", "*", "/"]))
+        parts.append(operand)
+    return f"({' '.join(parts)}) > 0 == !nil"
+
+
+def measure(evaluate, evaluations: int) -> float:
+    start = time.perf_counter()
+    for _ in range(evaluations):
+        evaluate()
+    return time.perf_counter() - start
+
+
+def main(operands: int = 200, evaluations: int = 2_000):
+    expression = Parser(Scanner(arithmetic(operands)).scan_tokens()).parse()
+    assert expression is not None
+    chunk = Compiler().compile(expression)
+    interpreter, vm = Interpreter(), VM()
+    function = PythonCompiler().compile(expression)
+    assert interpreter.evaluate(expression) == vm.run(chunk) == function()
+
+    tree = measure(lambda: interpreter.evaluate(expression), evaluations)
+    bytecode = measure(lambda: vm.run(chunk), evaluations)
+    print(f"tree-walker {evaluations / tree:12,.0f} evaluations/s")
+    native = measure(function, evaluations)
+    print(f"bytecode VM {evaluations / bytecode:12,.0f} evaluations/s  {tree / bytecode:5.2f}x")
+    print(f"python code {evaluations / native:12,.0f} evaluations/s  {tree / native:5.2f}x")
+
+
+if __name__ == "__main__":
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,95 @@
+"""
+Synthetic Veda sources for benchmarking. Every generator is deterministic for a seed and
+returns a source of about `size` characters.
+"""
+import random
+from typing import Callable, Dict
+
+OPERATORS = ["+", "-", "*", "/", "==", "!=", "<", "<=", ">", ">="]
+
+# Nesting depth of `deep_nesting`, kept within what the recursive `Parser` can handle.
+MAX_DEPTH = 50
+
+
+def operator_chain(size: int, seed: int = 0) -> str:
+    """
+    One long expression of numbers joined by binary operators.
+    """
+    rng = random.Random(seed)
+    parts = [str(rng.randint(0, 999))]
+    length = len(parts[0])
+    while length < size:
+        operand = ("-" if rng.random() < 0.1 else "") + str(rng.randint(0, 999))
+        parts.append(f"{rng.choice(OPERATORS)} {operand}")
+        length += len(parts[-1]) + 1
+    return " ".join(parts)
+
+
+def deep_nesting(size: int, seed: int = 0) -> str:
+    """
+    A chain of parenthesized groups, each nested `MAX_DEPTH` levels deep.
+    """
+    rng = random.Random(seed)
+    parts = list()
+    length = 0
+    while length < size or not parts:
+        depth = rng.randint(1, MAX_DEPTH)
+        group = "(" * depth + "1" + "".join(f" + {rng.randint(0, 9)})" for _ in range(depth))
+        parts.append(group)
+        length += len(group) + 3
+    return " * ".join(parts)
+
+
+def literals(size: int, seed: int = 0) -> str:
+    """
+    String and number literals, alternating between concatenations and comparisons.
+    """
+    rng = random.Random(seed)
+    parts = list()
+    length = 0
+    while length < size or not parts:
+        word = "".join(rng.choice("abcdefghij") for _ in range(rng.randint(1, 12)))
+        number = f"{rng.randint(0, 99999)}.{rng.randint(0, 999)}"
+        parts.append(f'("{word}" + "{word}" == "{word}{word}") != ({number} < {number})')
+        length += len(parts[-1]) + 4
+    return " == ".join(parts)
+
+
+def comments(size: int, seed: int = 0) -> str:
+    """
+    Mostly `//` comment lines, with a short expression every few lines.
+    """
+    rng = random.Random(seed)
+    lines = list()
+    length = 0
+    while length < size or not lines:
+        if rng.random() < 0.2:
+            lines.append(f"{rng.randint(0, 99)} +")
+        else:
+            lines.append("// " + " ".join("comment" for _ in range(rng.randint(1, 10))))
+        length += len(lines[-1]) + 1
+    lines.append("1")
+    return "\n".join(lines)
+
+
+def errors(size: int, seed: int = 0) -> str:
+    """
+    Unexpected characters and unterminated strings between valid tokens.
+    """
+    rng = random.Random(seed)
+    parts = list()
+    length = 0
+    while length < size or not parts:
+        parts.append(rng.choice(["1 +", "@", "#", "2", "$ 3", "&", "| 4"]))
+        length += len(parts[-1]) + 1
+    parts.append('"unterminated')
+    return " ".join(parts)
+
+
+CORPORA = {
+    "chain": operator_chain,
+    "nesting": deep_nesting,
+    "literals": literals,
+    "comments": comments,
+    "errors": errors,
+}  # type: Dict[str, Callable[[int, int], str]]
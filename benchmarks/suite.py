@@ -0,0 +1,136 @@
+"""
+Throughput of the scanner, parser and printer on every corpus of `benchmarks.corpus`, at
+several input sizes, with regression gating against a stored baseline:
+
+    python -m benchmarks.suite --output results.json
+    python -m benchmarks.suite --baseline benchmarks/baseline.json --threshold 0.2
+
+Metrics are `Scanner.scan_tokens` tokens/s, `Parser.parse` nodes/s and `AstPrinter.print`
+output bytes/s, each the best of `--repeat` runs. With `--baseline`, the exit status is 1
+when any metric is more than `--threshold` (a fraction) below its baseline value. Save a
+baseline on the machine that gates, since throughput is only comparable on one machine.
+"""
+import argparse
+import io
+import json
+import platform
+import sys
+import time
+from typing import Callable, Dict, List, Optional, Sequence
+
+from src.veda import Parser, Scanner
+from src.veda.ast_printer import AstPrinter
+from src.veda.session import Session
+from src.veda.walker import postorder
+
+from .corpus import CORPORA
+
+SIZES = [1_000, 10_000, 100_000]
+
+
+def best_time(function: Callable[[], object], repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - start)
+    return best
+
+
+def measure(source: str, repeat: int) -> Dict[str, float]:
+    """
+    Throughputs for one source. Sources that do not parse only get a scanner metric.
+    """
+    # Error-heavy corpora report diagnostics on every run.
+    session = Session(io.StringIO())
+    tokens = Scanner(source, reporter=session).scan_tokens()
+    expression = Parser(tokens, reporter=session).parse()
+    results = {
+        "scanner tokens/s": len(tokens)
+        / best_time(lambda: Scanner(source, reporter=session).scan_tokens(), repeat)
+    }
+    if expression is None:
+        return results
+
+    nodes = sum(1 for _ in postorder(expression))
+    results["parser nodes/s"] = nodes / best_time(lambda: Parser(tokens).parse(), repeat)
+    printed = len(AstPrinter().print(expression).encode())
+    results["printer bytes/s"] = printed / best_time(lambda: AstPrinter().print(expression), repeat)
+    return results
+
+
+def run(sizes: Sequence[int], repeat: int, corpora: Sequence[str]) -> Dict[str, float]:
+    """
+    `{"<corpus>/<size>/<metric>": throughput}` for every corpus and size.
+    """
+    results = dict()  # type: Dict[str, float]
+    for name in corpora:
+        for size in sizes:
+            source = CORPORA[name](size, 0)
+            for metric, value in measure(source, repeat).items():
+                results[f"{name}/{size}/{metric}"] = value
+    return results
+
+
+def regressions(
+    results: Dict[str, float], baseline: Dict[str, float], threshold: float
+) -> List[str]:
+    """
+    Descriptions of the metrics more than `threshold` below their baseline value, and of
+    those missing from `results`, e.g. because their corpus no longer parses.
+    """
+    failures = list()  # type: List[str]
+    for key, expected in sorted(baseline.items()):
+        actual = results.get(key)
+        if actual is None:
+            failures.append(f"{key}: missing, {expected:,.0f} in the baseline")
+        elif actual < expected * (1 - threshold):
+            failures.append(
+                f"{key}: {actual:,.0f} is {1 - actual / expected:.0%} below {expected:,.0f}"
+            )
+    return failures
+
+
+def main(args: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0].strip())
+    parser.add_argument(
+        "--sizes", default=",".join(map(str, SIZES)), help="source sizes, in characters"
+    )
+    parser.add_argument("--corpora", default=",".join(CORPORA), help="corpora to run")
+    parser.add_argument("--repeat", type=int, default=5, help="runs per measurement, best is kept")
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="compare against this JSON file of earlier results")
+    parser.add_argument(
+        "--threshold", type=float, default=0.2, help="tolerated drop, as a fraction"
+    )
+    options = parser.parse_args(args)
+
+    sizes = [int(size) for size in options.sizes.split(",")]
+    results = run(sizes, options.repeat, options.corpora.split(","))
+    for key, value in results.items():
+        print(f"{key:40} {value:16,.0f}")
+
+    if options.output:
+        with open(options.output, "w") as f:
+            document = {"python": platform.python_version(), "results": results}
+            json.dump(document, f, indent=2, sort_keys=True)
+            f.write("\n")
+
+    if options.baseline:
+        with open(options.baseline) as f:
+            baseline = json.load(f)["results"]
+        # Only the corpora and sizes of this run are compared.
+        runs = {f"{name}/{size}/" for name in options.corpora.split(",") for size in sizes}
+        baseline = {
+            key: value for key, value in baseline.items() if key[: key.rindex("/") + 1] in runs
+        }
+        failures = regressions(results, baseline, options.threshold)
+        for failure in failures:
+            print(f"REGRESSION {failure}", file=sys.stderr)
+        if failures:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,7 +1,54 @@
-from .parser import Parser
-from .scanner import Scanner
-from .token import Token
-from .token_type import TokenType
-from .veda import Veda
+from importlib import import_module
 
-__all__ = ["Scanner", "Token", "TokenType", "Veda", "Parser"]
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from .parser import BufferParser, Parser, StreamParser
+    from .pratt_parser import PrattParser
+    from .scanner import Scanner
+    from .session import Session
+    from .token import Token
+    from .token_buffer import TokenBuffer, TokenView
+    from .token_type import TokenType
+    from .veda import Veda
+
+__all__ = [
+    "Scanner",
+    "Token",
+    "TokenBuffer",
+    "TokenView",
+    "TokenType",
+    "Veda",
+    "Session",
+    "Parser",
+    "StreamParser",
+    "BufferParser",
+    "PrattParser",
+]
+
+# Module of each name in `__all__`. They are imported on first access, so that starting
+# `veda` only imports the modules that running a script needs.
+_MODULES = {
+    "Scanner": ".scanner",
+    "Token": ".token",
+    "TokenBuffer": ".token_buffer",
+    "TokenView": ".token_buffer",
+    "TokenType": ".token_type",
+    "Veda": ".veda",
+    "Session": ".session",
+    "Parser": ".parser",
+    "StreamParser": ".parser",
+    "BufferParser": ".parser",
+    "PrattParser": ".pratt_parser",
+}
+
+
+def __getattr__(name: str):
+    if name not in _MODULES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(_MODULES[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,5 @@
+import sys
+
+from .veda import Veda
+
+Veda().main(*sys.argv[1:])
@@ -1,11 +1,39 @@
 from typing import List
 
-from .expr import Binary, Expr, Grouping, Literal, Unary
+from .expr import Binary, Expr, Grouping, Literal, Unary, Variable
+from .walker import fold
 
 
 class AstPrinter:
-    def print(self, expr: Expr):
-        return expr.accept(self)
+    def __init__(self, memoize: bool = False) -> None:
+        # Render each distinct node once, for trees with shared subtrees (see `Interner`).
+        self.memoize = memoize
+        self.handlers = {
+            Binary: self.print_binary,
+            Grouping: self.print_grouping,
+            Literal: self.print_literal,
+            Unary: self.print_unary,
+            Variable: self.print_variable,
+        }
+
+    def print(self, expr: Expr) -> str:
+        # Walks the tree with an explicit stack, so any nesting depth can be printed.
+        return fold(expr, self.handlers, dict() if self.memoize else None)
+
+    def print_binary(self, expr: Binary, left: str, right: str):
+        return f"({expr.operator.lexeme} {left} {right})"
+
+    def print_grouping(self, expr: Grouping, expression: str):
+        return f"(group {expression})"
+
+    def print_literal(self, expr: Literal):
+        return self.visit_literal_expr(expr)
+
+    def print_unary(self, expr: Unary, right: str):
+        return f"({expr.operator.lexeme} {right})"
+
+    def print_variable(self, expr: Variable):
+        return expr.name.lexeme
 
     def visit_binary_expr(self, expr: Binary):
         return self.parenthesize(expr.operator.lexeme, expr.left, expr.right)
@@ -21,6 +49,9 @@ class AstPrinter:
     def visit_unary_expr(self, expr: Unary):
         return self.parenthesize(expr.operator.lexeme, expr.right)
 
+    def visit_variable_expr(self, expr: Variable):
+        return expr.name.lexeme
+
     def parenthesize(self, name: str, *exprs: Expr):
         buffer = list()  # type: List[str]
         buffer.append("(")
@@ -0,0 +1,127 @@
+import argparse
+import io
+import os
+import sys
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import redirect_stdout
+from typing import Callable, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple, TypeVar
+
+from .veda import Veda
+
+# Suffix of the scripts collected from a directory.
+SUFFIX = ".veda"
+
+T = TypeVar("T")
+
+
+class _ArgumentParser(argparse.ArgumentParser):
+    def error(self, message: str):
+        self.print_usage(sys.stderr)
+        print(f"veda: {message}", file=sys.stderr)
+        sys.exit(64)
+
+
+def _argument_parser(
+    prog: str = "veda", description: str = "Run Veda scripts."
+) -> argparse.ArgumentParser:
+    parser = _ArgumentParser(
+        prog=prog,
+        description=f"{description} Directories are searched for *{SUFFIX} files.",
+    )
+    parser.add_argument("paths", nargs="+", metavar="path", help="script or directory")
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=0,
+        help="worker processes (default: one per CPU, 1 runs in-process)",
+    )
+    parser.add_argument(
+        "--chunksize",
+        type=int,
+        default=0,
+        help="scripts sent to a worker at a time (default: a few chunks per worker)",
+    )
+    return parser
+
+
+def collect_paths(paths: Iterable[str]) -> List[str]:
+    """
+    Expand directories to the scripts below them, in sorted order; files are kept as given.
+    """
+    collected = list()  # type: List[str]
+    for path in paths:
+        if not os.path.isdir(path):
+            collected.append(path)
+            continue
+        for root, directories, files in os.walk(path):
+            directories.sort()
+            collected.extend(
+                os.path.join(root, name) for name in sorted(files) if name.endswith(SUFFIX)
+            )
+    return collected
+
+
+def run_file(path: str) -> Tuple[str, int]:
+    """
+    Run one script, returning what it printed and its exit status (66 if unreadable).
+    """
+    Veda.had_error = False
+    Veda.had_runtime_error = False
+    output = io.StringIO()
+    try:
+        with redirect_stdout(output):
+            status = Veda().run_file(path)
+    except (OSError, UnicodeDecodeError) as error:
+        output.write(f"Cannot read script: {error}\n")
+        status = 66
+    finally:
+        Veda.had_error = False
+        Veda.had_runtime_error = False
+    return output.getvalue(), status
+
+
+def map_paths(
+    function: Callable[[str], T], paths: Sequence[str], jobs: int = 0, chunksize: int = 0
+) -> Iterator[T]:
+    """
+    Yield `function` of every path, in the order given, running `jobs` processes at a time.
+    `function` has to be a module-level function, so that workers can unpickle it.
+    """
+    jobs = jobs or os.cpu_count() or 1
+    if jobs == 1 or len(paths) <= 1:
+        yield from map(function, paths)
+        return
+
+    jobs = min(jobs, len(paths))
+    # A few chunks per worker keeps them all busy without a round trip per script.
+    chunksize = chunksize or max(1, len(paths) // (jobs * 4))
+    with ProcessPoolExecutor(max_workers=jobs) as executor:
+        yield from executor.map(function, paths, chunksize=chunksize)
+
+
+def run_files(paths: Sequence[str], jobs: int = 0, chunksize: int = 0) -> Iterator[Tuple[str, int]]:
+    """
+    Yield `run_file` of every path, in the order given, running `jobs` processes at a time.
+    """
+    return map_paths(run_file, paths, jobs, chunksize)
+
+
+def main(args: Sequence[str], out: Optional[TextIO] = None) -> int:
+    """
+    `veda [-j JOBS] [--chunksize N] path...`: run every script and print each one's output
+    under a `==> path <==` header, in argument order. Returns 0 if all succeeded, else the
+    highest status of any script (65 syntax error, 66 unreadable, 70 runtime error).
+    """
+    options = _argument_parser().parse_args(args)
+    if options.jobs < 0 or options.chunksize < 0:
+        _argument_parser().error("--jobs and --chunksize must not be negative")
+
+    out = out or sys.stdout
+    paths = collect_paths(options.paths)
+    status = 0
+    for path, (output, _status) in zip(paths, run_files(paths, options.jobs, options.chunksize)):
+        out.write(f"==> {path} <==\n{output}")
+        status = max(status, _status)
+    out.flush()
+    return status
@@ -0,0 +1,73 @@
+import json
+import sys
+from operator import itemgetter
+from typing import Dict, List, Optional, Sequence, TextIO, Tuple
+
+from .batch import _argument_parser, collect_paths, map_paths
+from .scanner import Scanner
+from .session import CollectingSession
+from .table_parser import BufferTableParser
+
+# A diagnostic as written out: `{"path", "line", "column", "where", "message"}`.
+Diagnostic = Dict[str, object]
+
+
+def check_source(source: str, path: str = "<string>") -> List[Diagnostic]:
+    """
+    Every scanner and parser diagnostic of `source`, in source order, nested however deeply.
+    Columns count from 1, as lines do.
+
+    `veda run` evaluates a script's first expression and ignores what follows it, while this
+    parses every `;`-separated expression up to EOF. So a script that fails to run with 65
+    always has diagnostics, but one whose only errors come after its first expression (`1 2`
+    gets "Expect end of expression.") still runs. Constant limits are checked by the
+    compiler, which this does not call.
+    """
+    session = CollectingSession()
+    tokens = Scanner(source, reporter=session, symbols=session.symbols).scan_buffer()
+    BufferTableParser(tokens, reporter=session).parse_all()
+    session.diagnostics.sort(key=itemgetter("line", "column"))
+    return [{"path": path, **diagnostic} for diagnostic in session.diagnostics]
+
+
+def check_file(path: str) -> Tuple[List[Diagnostic], int]:
+    """
+    Check one script, returning its diagnostics and exit status: 65 if it has any, 66 if it
+    cannot be read, else 0.
+    """
+    try:
+        with open(path, encoding="utf-8", newline="") as f:
+            source = f.read()
+    except (OSError, UnicodeDecodeError) as error:
+        diagnostic = {
+            "path": path,
+            "line": 0,
+            "column": 0,
+            "where": "",
+            "message": f"Cannot read script: {error}",
+        }
+        return [diagnostic], 66
+    diagnostics = check_source(source, path)
+    return diagnostics, 65 if diagnostics else 0
+
+
+def main(args: Sequence[str], out: Optional[TextIO] = None) -> int:
+    """
+    `veda check [-j JOBS] [--chunksize N] path...`: scan and parse every script without
+    running it and write each diagnostic as one JSON object per line, in argument order.
+    Returns the highest status of any script.
+    """
+    parser = _argument_parser("veda check", "Report every syntax error as JSON lines.")
+    options = parser.parse_args(args)
+    if options.jobs < 0 or options.chunksize < 0:
+        parser.error("--jobs and --chunksize must not be negative")
+
+    out = out or sys.stdout
+    paths = collect_paths(options.paths)
+    status = 0
+    for diagnostics, _status in map_paths(check_file, paths, options.jobs, options.chunksize):
+        for diagnostic in diagnostics:
+            out.write(json.dumps(diagnostic) + "\n")
+        status = max(status, _status)
+    out.flush()
+    return status
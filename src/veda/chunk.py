@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+from array import array
+
+from .token import Token
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, List, Tuple
+
+
+class OpCode:
+    CONSTANT = 0
+    CONSTANT_LONG = 1
+    NIL = 2
+    TRUE = 3
+    FALSE = 4
+    NEGATE = 5
+    NOT = 6
+    ADD = 7
+    SUBTRACT = 8
+    MULTIPLY = 9
+    DIVIDE = 10
+    EQUAL = 11
+    NOT_EQUAL = 12
+    GREATER = 13
+    GREATER_EQUAL = 14
+    LESS = 15
+    LESS_EQUAL = 16
+    RETURN = 17
+    GET_VARIABLE = 18
+
+
+class Chunk:
+    """
+    A compiled expression: a byte-per-slot instruction stream, its constant pool, and the
+    operator token of every instruction that can fail, for runtime error reporting.
+
+    Constant operands are at most 24 bits, so a chunk holds up to `MAX_CONSTANTS` distinct
+    constants; equal constants of the same type share one slot.
+    """
+
+    MAX_CONSTANTS = 1 << 24
+
+    class LimitError(RuntimeError):
+        pass
+
+    def __init__(self) -> None:
+        self.code = array("B")
+        self.constants = list()  # type: List[object]
+        # (type, value) -> index in `constants`; the type keeps `1.0` apart from `true`.
+        self.indices = dict()  # type: Dict[Tuple[type, object], int]
+        self.tokens = dict()  # type: Dict[int, Token]
+
+    def write(self, byte: int):
+        self.code.append(byte)
+
+    def write_op(self, op: int, token: Token):
+        self.tokens[len(self.code)] = token
+        self.code.append(op)
+
+    def add_constant(self, value: object) -> int:
+        # `-0.0 == 0.0`, but not as a divisor.
+        key = (float, value.hex()) if type(value) is float else (type(value), value)
+        index = self.indices.get(key)
+        if index is None:
+            index = len(self.constants)
+            if index >= self.MAX_CONSTANTS:
+                raise self.LimitError("Too many constants in one chunk.")
+            self.constants.append(value)
+            self.indices[key] = index
+        return index
+
+    def write_constant(self, value: object):
+        index = self.add_constant(value)
+        if index < 256:
+            self.code.append(OpCode.CONSTANT)
+            self.code.append(index)
+        else:
+            self.code.append(OpCode.CONSTANT_LONG)
+            self.code.append(index & 0xFF)
+            self.code.append((index >> 8) & 0xFF)
+            self.code.append((index >> 16) & 0xFF)
+
+    def write_variable(self, name: Token):
+        # Operand: 24-bit constant index of the name.
+        index = self.add_constant(name.lexeme)
+        self.write_op(OpCode.GET_VARIABLE, name)
+        self.code.append(index & 0xFF)
+        self.code.append((index >> 8) & 0xFF)
+        self.code.append((index >> 16) & 0xFF)
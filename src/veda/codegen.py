@@ -0,0 +1,270 @@
+import ast
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Any, Callable, Dict, Tuple
+
+from .compiler import Compiler
+from .expr import Binary, Expr, Grouping, Literal, Unary, Variable
+from .runtime import NUMBER_TYPES, VedaRuntimeError, divide, is_equal, lookup
+from .session import Session
+from .table_parser import TableParser
+from .token import Token
+from .token_type import TokenType
+from .vm import VM
+from .walker import fold
+
+# Static types tracked while lowering. `ANY` means only known at runtime.
+NUMBER = "number"
+STRING = "string"
+BOOLEAN = "boolean"
+NIL = "nil"
+ANY = "any"
+
+# (ast node, static type) of a lowered subexpression.
+Lowered = Tuple[ast.expr, str]
+
+
+def _check_numbers(a: object, b: object, token: Token):
+    if type(a) not in NUMBER_TYPES or type(b) not in NUMBER_TYPES:
+        raise VedaRuntimeError(token, "Operands must be numbers.")
+
+
+def _add(a: Any, b: Any, token: Token):
+    if type(a) in NUMBER_TYPES and type(b) in NUMBER_TYPES:
+        return a + b
+    if type(a) is str and type(b) is str:
+        return a + b
+    raise VedaRuntimeError(token, "Operands must be two numbers or two strings.")
+
+
+def _subtract(a: Any, b: Any, token: Token):
+    _check_numbers(a, b, token)
+    return a - b
+
+
+def _multiply(a: Any, b: Any, token: Token):
+    _check_numbers(a, b, token)
+    return a * b
+
+
+def _divide(a: Any, b: Any, token: Token):
+    _check_numbers(a, b, token)
+    return divide(a, b)
+
+
+def _greater(a: Any, b: Any, token: Token):
+    _check_numbers(a, b, token)
+    return a > b
+
+
+def _greater_equal(a: Any, b: Any, token: Token):
+    _check_numbers(a, b, token)
+    return a >= b
+
+
+def _less(a: Any, b: Any, token: Token):
+    _check_numbers(a, b, token)
+    return a < b
+
+
+def _less_equal(a: Any, b: Any, token: Token):
+    _check_numbers(a, b, token)
+    return a <= b
+
+
+def _negate(a: Any, token: Token):
+    if type(a) not in NUMBER_TYPES:
+        raise VedaRuntimeError(token, "Operand must be a number.")
+    return -a
+
+
+HELPERS = {
+    "_add": _add,
+    "_subtract": _subtract,
+    "_multiply": _multiply,
+    "_divide": _divide,
+    "_greater": _greater,
+    "_greater_equal": _greater_equal,
+    "_less": _less,
+    "_less_equal": _less_equal,
+    "_negate": _negate,
+    "_is_equal": is_equal,
+    "_divide_numbers": divide,
+    "_lookup": lookup,
+    "_no_variables": MappingProxyType({}),
+}
+
+
+class PythonCompiler:
+    """
+    Lowers an `Expr` to a Python `ast`, compiles it, and returns a function that CPython
+    then runs directly. Its optional argument maps identifiers to their values.
+
+    Each subexpression's static type is tracked while lowering. Where both operands are
+    statically numbers (or both strings, for `+` and `==`) the native Python operator is
+    emitted; elsewhere a small helper checks the operand types at runtime and raises
+    `VedaRuntimeError` with the operator token, exactly like the `Interpreter`.
+    """
+
+    # (native `ast` operator, runtime-checked helper) of each operator.
+    arithmetic = {
+        TokenType.PLUS: (ast.Add, "_add"),
+        TokenType.MINUS: (ast.Sub, "_subtract"),
+        TokenType.STAR: (ast.Mult, "_multiply"),
+        TokenType.SLASH: (None, "_divide"),
+    }
+
+    comparisons = {
+        TokenType.GREATER: (ast.Gt, "_greater"),
+        TokenType.GREATER_EQUAL: (ast.GtE, "_greater_equal"),
+        TokenType.LESS: (ast.Lt, "_less"),
+        TokenType.LESS_EQUAL: (ast.LtE, "_less_equal"),
+    }
+
+    def __init__(self) -> None:
+        self.namespace = dict(HELPERS)  # type: Dict[str, Any]
+        self.temporaries = 0
+
+    def compile(self, expr: Expr) -> Callable[..., object]:
+        body, _ = fold(
+            expr,
+            {
+                Binary: self.lower_binary,
+                Grouping: self.lower_grouping,
+                Literal: self.lower_literal,
+                Unary: self.lower_unary,
+                Variable: self.lower_variable,
+            },
+        )
+        function = ast.FunctionDef(
+            name="veda_expression",
+            args=ast.arguments(
+                posonlyargs=[],
+                args=[ast.arg("_variables")],
+                kwonlyargs=[],
+                kw_defaults=[],
+                defaults=[ast.Name("_no_variables", ast.Load())],
+            ),
+            body=[ast.Return(body)],
+            decorator_list=[],
+        )
+        try:
+            module = ast.fix_missing_locations(ast.Module(body=[function], type_ignores=[]))
+            code = compile(module, "<veda>", "exec")
+        except RecursionError:
+            # `ast` and CPython's compiler recurse on nesting depth; very deep trees run on
+            # the VM instead.
+            chunk = Compiler(reporter=Session()).compile(expr)
+            if chunk is None:
+                raise VedaSyntaxError("Too many constants in one chunk.")
+            return lambda variables=None: VM(variables).run(chunk)
+
+        exec(code, self.namespace)
+        return self.namespace["veda_expression"]
+
+    def token(self, token: Token) -> ast.expr:
+        name = f"_token{len(self.namespace)}"
+        self.namespace[name] = token
+        return ast.Name(name, ast.Load())
+
+    def call(self, helper: str, *arguments: ast.expr) -> ast.expr:
+        return ast.Call(ast.Name(helper, ast.Load()), list(arguments), [])
+
+    def temporary(self) -> str:
+        self.temporaries += 1
+        return f"_t{self.temporaries}"
+
+    def lower_literal(self, expr: Literal) -> Lowered:
+        value = expr.value
+        if value is None:
+            return ast.Constant(None), NIL
+        if type(value) is bool:
+            return ast.Constant(value), BOOLEAN
+        if type(value) in NUMBER_TYPES:
+            return ast.Constant(value), NUMBER
+        if type(value) is str:
+            return ast.Constant(value), STRING
+        return ast.Constant(value), ANY
+
+    def lower_variable(self, expr: Variable) -> Lowered:
+        return self.call("_lookup", ast.Name("_variables", ast.Load()), self.token(expr.name)), ANY
+
+    def lower_grouping(self, expr: Grouping, expression: Lowered) -> Lowered:
+        return expression
+
+    def lower_unary(self, expr: Unary, right: Lowered) -> Lowered:
+        operand, type = right
+        if expr.operator.type == TokenType.MINUS:
+            if type == NUMBER:
+                return ast.UnaryOp(ast.USub(), operand), NUMBER
+            return self.call("_negate", operand, self.token(expr.operator)), NUMBER
+
+        if type == BOOLEAN:
+            return ast.UnaryOp(ast.Not(), operand), BOOLEAN
+        # `!x` is `x is nil or x is false`, with `x` evaluated once.
+        name = self.temporary()
+        store = ast.NamedExpr(ast.Name(name, ast.Store()), operand)
+        return (
+            ast.BoolOp(
+                ast.Or(),
+                [
+                    ast.Compare(store, [ast.Is()], [ast.Constant(None)]),
+                    ast.Compare(ast.Name(name, ast.Load()), [ast.Is()], [ast.Constant(False)]),
+                ],
+            ),
+            BOOLEAN,
+        )
+
+    def lower_binary(self, expr: Binary, left: Lowered, right: Lowered) -> Lowered:
+        (a, a_type), (b, b_type) = left, right
+        operator = expr.operator
+        numbers = a_type == NUMBER and b_type == NUMBER
+
+        if operator.type in self.arithmetic:
+            native, helper = self.arithmetic[operator.type]
+            if operator.type == TokenType.PLUS and a_type == STRING and b_type == STRING:
+                return ast.BinOp(a, ast.Add(), b), STRING
+            if numbers and native is not None:
+                return ast.BinOp(a, native(), b), NUMBER
+            if numbers:
+                return self.call("_divide_numbers", a, b), NUMBER
+            result = ANY if operator.type == TokenType.PLUS else NUMBER
+            return self.call(helper, a, b, self.token(operator)), result
+
+        if operator.type in self.comparisons:
+            native, helper = self.comparisons[operator.type]
+            if numbers:
+                return ast.Compare(a, [native()], [b]), BOOLEAN
+            return self.call(helper, a, b, self.token(operator)), BOOLEAN
+
+        # `==` / `!=`: numbers and strings compare natively, anything else needs `is_equal`.
+        same = a_type == b_type and a_type in (NUMBER, STRING)
+        if operator.type == TokenType.EQUAL_EQUAL:
+            if same:
+                return ast.Compare(a, [ast.Eq()], [b]), BOOLEAN
+            return self.call("_is_equal", a, b), BOOLEAN
+        if same:
+            return ast.Compare(a, [ast.NotEq()], [b]), BOOLEAN
+        return ast.UnaryOp(ast.Not(), self.call("_is_equal", a, b)), BOOLEAN
+
+
+class VedaSyntaxError(ValueError):
+    ...
+
+
+def compile_source(source: str) -> Callable[..., object]:
+    """
+    Scan, parse and compile `source`, reusing the compiled function for a source string
+    seen before. Raises `VedaSyntaxError` after reporting diagnostics if it does not parse.
+    """
+    return _compile_source(source)
+
+
+@lru_cache(maxsize=1024)
+def _compile_source(source: str) -> Callable[..., object]:
+    # Failures raise, so they are not cached and report their diagnostics every time.
+    session = Session()
+    expression = TableParser(session.scan(source), reporter=session).parse()
+    if session.had_error or expression is None:
+        raise VedaSyntaxError("Source has syntax errors.")
+    return PythonCompiler().compile(expression)
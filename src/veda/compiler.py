@@ -0,0 +1,81 @@
+from __future__ import annotations
+
+from .chunk import Chunk, OpCode
+from .expr import Binary, Expr, Grouping, Literal, Unary, Variable
+from .token_type import TokenType
+from .veda import Veda
+from .walker import postorder
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Optional
+
+    from .session import Session
+
+
+class Compiler:
+    """
+    Compiles an `Expr` tree to a stack-machine `Chunk`. A post-order walk of an expression
+    is exactly its evaluation order, so each node emits its own instruction after those of
+    its operands, and the walk runs in constant Python stack.
+
+    An expression past the limits of a chunk is reported to `reporter`, `Veda` by default, at
+    the operator or name compiled last, and compiles to `None`.
+    """
+
+    binary_ops = {
+        TokenType.PLUS: OpCode.ADD,
+        TokenType.MINUS: OpCode.SUBTRACT,
+        TokenType.STAR: OpCode.MULTIPLY,
+        TokenType.SLASH: OpCode.DIVIDE,
+        TokenType.EQUAL_EQUAL: OpCode.EQUAL,
+        TokenType.BANG_EQUAL: OpCode.NOT_EQUAL,
+        TokenType.GREATER: OpCode.GREATER,
+        TokenType.GREATER_EQUAL: OpCode.GREATER_EQUAL,
+        TokenType.LESS: OpCode.LESS,
+        TokenType.LESS_EQUAL: OpCode.LESS_EQUAL,
+    }
+
+    unary_ops = {
+        TokenType.MINUS: OpCode.NEGATE,
+        TokenType.BANG: OpCode.NOT,
+    }
+
+    def __init__(self, reporter: Optional[Session] = None) -> None:
+        self.reporter = reporter if reporter is not None else Veda  # type: Any
+
+    def compile(self, expr: Expr) -> Optional[Chunk]:
+        chunk = Chunk()
+        token = None
+        try:
+            for node in postorder(expr):
+                _type = type(node)
+                if _type is Binary:
+                    token = node.operator  # type: ignore
+                    chunk.write_op(self.binary_ops[token.type], token)
+                elif _type is Literal:
+                    value = node.value  # type: ignore
+                    if value is None:
+                        chunk.write(OpCode.NIL)
+                    elif value is True:
+                        chunk.write(OpCode.TRUE)
+                    elif value is False:
+                        chunk.write(OpCode.FALSE)
+                    else:
+                        chunk.write_constant(value)
+                elif _type is Unary:
+                    token = node.operator  # type: ignore
+                    chunk.write_op(self.unary_ops[token.type], token)
+                elif _type is Variable:
+                    token = node.name  # type: ignore
+                    chunk.write_variable(token)
+                elif _type is not Grouping:
+                    raise TypeError(f"Cannot compile {_type.__name__}")
+        except Chunk.LimitError as error:
+            if token is None:
+                self.reporter.error(1, str(error))
+            else:
+                self.reporter.error_token(token, str(error))
+            return None
+        chunk.write(OpCode.RETURN)
+        return chunk
@@ -1,10 +1,13 @@
 # NOTE: This file is generated by `generate_ast.py` automatically, do not modify it manually
 
-from typing import TYPE_CHECKING
+from __future__ import annotations
 
 from .token import Token
 
+TYPE_CHECKING = False
 if TYPE_CHECKING:
+    from typing import Any, Dict, List, Tuple
+
     from .ast_printer import AstPrinter
 else:
     AstPrinter = None
@@ -15,12 +18,18 @@ class Expr:
     Grouping: "Grouping"
     Literal: "Literal"
     Unary: "Unary"
+    Variable: "Variable"
+
+    __slots__ = ()
 
     def accept(self, visitor: AstPrinter) -> str:
         raise NotImplementedError
 
 
 class Binary(Expr):
+    __slots__ = ("left", "operator", "right")
+    __match_args__ = ("left", "operator", "right")
+
     def __init__(self, left: Expr, operator: Token, right: Expr):
         self.left = left
         self.operator = operator
@@ -29,24 +38,75 @@ class Binary(Expr):
     def accept(self, visitor: AstPrinter) -> str:
         return visitor.visit_binary_expr(self)
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Binary):
+            return NotImplemented
+        return _equal(self, other)
+
+    def __hash__(self) -> int:
+        return _hash(self)
+
+    def __repr__(self) -> str:
+        return _repr(self)
+
+    def __reduce__(self):
+        return (_rebuild, (_flatten(self),))
+
 
 class Grouping(Expr):
+    __slots__ = ("expression",)
+    __match_args__ = ("expression",)
+
     def __init__(self, expression: Expr):
         self.expression = expression
 
     def accept(self, visitor: AstPrinter) -> str:
         return visitor.visit_grouping_expr(self)
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Grouping):
+            return NotImplemented
+        return _equal(self, other)
+
+    def __hash__(self) -> int:
+        return _hash(self)
+
+    def __repr__(self) -> str:
+        return _repr(self)
+
+    def __reduce__(self):
+        return (_rebuild, (_flatten(self),))
+
 
 class Literal(Expr):
+    __slots__ = ("value",)
+    __match_args__ = ("value",)
+
     def __init__(self, value: object):
         self.value = value
 
     def accept(self, visitor: AstPrinter) -> str:
         return visitor.visit_literal_expr(self)
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Literal):
+            return NotImplemented
+        return type(self.value) is type(other.value) and self.value == other.value
+
+    def __hash__(self) -> int:
+        return hash((Literal, type(self.value), self.value))
+
+    def __repr__(self) -> str:
+        return f"Literal(value={self.value!r})"
+
+    def __reduce__(self):
+        return (Literal, (self.value,))
+
 
 class Unary(Expr):
+    __slots__ = ("operator", "right")
+    __match_args__ = ("operator", "right")
+
     def __init__(self, operator: Token, right: Expr):
         self.operator = operator
         self.right = right
@@ -54,8 +114,189 @@ class Unary(Expr):
     def accept(self, visitor: AstPrinter) -> str:
         return visitor.visit_unary_expr(self)
 
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Unary):
+            return NotImplemented
+        return _equal(self, other)
+
+    def __hash__(self) -> int:
+        return _hash(self)
+
+    def __repr__(self) -> str:
+        return _repr(self)
+
+    def __reduce__(self):
+        return (_rebuild, (_flatten(self),))
+
+
+class Variable(Expr):
+    __slots__ = ("name",)
+    __match_args__ = ("name",)
+
+    def __init__(self, name: Token):
+        self.name = name
+
+    def accept(self, visitor: AstPrinter) -> str:
+        return visitor.visit_variable_expr(self)
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Variable):
+            return NotImplemented
+        return self.name == other.name
+
+    def __hash__(self) -> int:
+        return hash((Variable, self.name))
+
+    def __repr__(self) -> str:
+        return f"Variable(name={self.name!r})"
+
+    def __reduce__(self):
+        return (Variable, (self.name,))
+
 
 setattr(Expr, "Binary", Binary)
 setattr(Expr, "Grouping", Grouping)
 setattr(Expr, "Literal", Literal)
 setattr(Expr, "Unary", Unary)
+setattr(Expr, "Variable", Variable)
+
+# Fields of each node class in constructor order, with how they are compared: `_CHILD`
+# fields hold nodes, and `_TYPED` values also compare their types, so that `Literal(1.0)`
+# and `Literal(True)` stay distinct.
+_CHILD, _PLAIN, _TYPED = range(3)
+_FIELDS = {
+    Binary: (("left", _CHILD), ("operator", _PLAIN), ("right", _CHILD)),
+    Grouping: (("expression", _CHILD),),
+    Literal: (("value", _TYPED),),
+    Unary: (("operator", _PLAIN), ("right", _CHILD)),
+    Variable: (("name", _PLAIN),),
+}  # type: Dict[type, Tuple[Tuple[str, int], ...]]
+_ARITY = {
+    node: sum(kind == _CHILD for _, kind in fields) for node, fields in _FIELDS.items()
+}  # type: Dict[type, int]
+
+
+# Marks, on a work stack, that the node below it has had all its children handled.
+_EXIT = object()
+
+
+# The functions below walk the tree with an explicit stack instead of recursing, so that
+# deep trees compare, hash, print and pickle like shallow ones.
+
+
+def _equal(left: Expr, right: Expr) -> bool:
+    stack = [(left, right)]  # type: List[Tuple[Any, Any]]
+    while stack:
+        a, b = stack.pop()
+        if a is b:
+            continue
+        fields = _FIELDS.get(type(a))
+        if fields is None or type(b) is not type(a):
+            if a != b:
+                return False
+            continue
+        for name, kind in fields:
+            x, y = getattr(a, name), getattr(b, name)
+            if kind == _CHILD:
+                stack.append((x, y))
+            elif (kind == _TYPED and type(x) is not type(y)) or x != y:
+                return False
+    return True
+
+
+def _hash(root: Expr) -> int:
+    hashes = list()  # type: List[int]
+    stack = [root]  # type: List[Any]
+    while stack:
+        node = stack.pop()
+        if node is _EXIT:
+            node = stack.pop()
+            start = len(hashes) - _ARITY[type(node)]
+            children = iter(hashes[start:])
+            del hashes[start:]
+            key = [type(node)]  # type: List[object]
+            for name, kind in _FIELDS[type(node)]:
+                if kind == _CHILD:
+                    key.append(next(children))
+                    continue
+                value = getattr(node, name)
+                if kind == _TYPED:
+                    key.append(type(value))
+                key.append(value)
+            hashes.append(hash(tuple(key)))
+        elif _ARITY.get(type(node)):
+            stack.append(node)
+            stack.append(_EXIT)
+            for name, kind in reversed(_FIELDS[type(node)]):
+                if kind == _CHILD:
+                    stack.append(getattr(node, name))
+        else:
+            hashes.append(hash(node))
+    return hashes[0]
+
+
+def _repr(root: Expr) -> str:
+    parts = list()  # type: List[str]
+    stack = [root]  # type: List[Any]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+        elif _ARITY.get(type(item)):
+            pending = [type(item).__name__ + "("]  # type: List[Any]
+            for index, (name, kind) in enumerate(_FIELDS[type(item)]):
+                prefix = (", " if index else "") + name + "="
+                if kind == _CHILD:
+                    pending.append(prefix)
+                    pending.append(getattr(item, name))
+                else:
+                    pending.append(prefix + repr(getattr(item, name)))
+            pending.append(")")
+            stack.extend(reversed(pending))
+        else:
+            parts.append(repr(item))
+    return "".join(parts)
+
+
+def _flatten(root: Expr) -> Tuple[Tuple[object, ...], ...]:
+    """
+    The nodes of `root` in postorder, each as its class followed by its field values, with
+    child nodes replaced by their index in the tuple. A subtree shared by several parents is
+    listed once.
+    """
+    indices = dict()  # type: Dict[int, int]
+    nodes = list()  # type: List[Tuple[object, ...]]
+    stack = [root]  # type: List[Any]
+    while stack:
+        node = stack.pop()
+        if node is _EXIT:
+            node = stack.pop()
+            if id(node) in indices:
+                continue
+            entry = [type(node)]  # type: List[object]
+            for name, kind in _FIELDS[type(node)]:
+                value = getattr(node, name)
+                entry.append(indices[id(value)] if kind == _CHILD else value)
+            indices[id(node)] = len(nodes)
+            nodes.append(tuple(entry))
+        elif id(node) not in indices:
+            stack.append(node)
+            stack.append(_EXIT)
+            for name, kind in reversed(_FIELDS[type(node)]):
+                if kind == _CHILD:
+                    stack.append(getattr(node, name))
+    return tuple(nodes)
+
+
+def _rebuild(nodes: Tuple[Tuple[Any, ...], ...]) -> Expr:
+    """
+    The tree that `_flatten` encoded.
+    """
+    built = list()  # type: List[Expr]
+    for entry in nodes:
+        arguments = list(entry[1:])
+        for index, (_, kind) in enumerate(_FIELDS[entry[0]]):
+            if kind == _CHILD:
+                arguments[index] = built[arguments[index]]
+        built.append(entry[0](*arguments))
+    return built[-1]
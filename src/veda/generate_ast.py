@@ -1,6 +1,135 @@
 import sys
 from typing import List
 
+# Functions behind `__eq__`, `__hash__`, `__repr__` and `__reduce__` of the nodes that have
+# children, appended to the generated module after `_FIELDS`. `{base}` is the base class.
+_NODE_FUNCTIONS = '''
+# Marks, on a work stack, that the node below it has had all its children handled.
+_EXIT = object()
+
+
+# The functions below walk the tree with an explicit stack instead of recursing, so that
+# deep trees compare, hash, print and pickle like shallow ones.
+
+
+def _equal(left: {base}, right: {base}) -> bool:
+    stack = [(left, right)]  # type: List[Tuple[Any, Any]]
+    while stack:
+        a, b = stack.pop()
+        if a is b:
+            continue
+        fields = _FIELDS.get(type(a))
+        if fields is None or type(b) is not type(a):
+            if a != b:
+                return False
+            continue
+        for name, kind in fields:
+            x, y = getattr(a, name), getattr(b, name)
+            if kind == _CHILD:
+                stack.append((x, y))
+            elif (kind == _TYPED and type(x) is not type(y)) or x != y:
+                return False
+    return True
+
+
+def _hash(root: {base}) -> int:
+    hashes = list()  # type: List[int]
+    stack = [root]  # type: List[Any]
+    while stack:
+        node = stack.pop()
+        if node is _EXIT:
+            node = stack.pop()
+            start = len(hashes) - _ARITY[type(node)]
+            children = iter(hashes[start:])
+            del hashes[start:]
+            key = [type(node)]  # type: List[object]
+            for name, kind in _FIELDS[type(node)]:
+                if kind == _CHILD:
+                    key.append(next(children))
+                    continue
+                value = getattr(node, name)
+                if kind == _TYPED:
+                    key.append(type(value))
+                key.append(value)
+            hashes.append(hash(tuple(key)))
+        elif _ARITY.get(type(node)):
+            stack.append(node)
+            stack.append(_EXIT)
+            for name, kind in reversed(_FIELDS[type(node)]):
+                if kind == _CHILD:
+                    stack.append(getattr(node, name))
+        else:
+            hashes.append(hash(node))
+    return hashes[0]
+
+
+def _repr(root: {base}) -> str:
+    parts = list()  # type: List[str]
+    stack = [root]  # type: List[Any]
+    while stack:
+        item = stack.pop()
+        if isinstance(item, str):
+            parts.append(item)
+        elif _ARITY.get(type(item)):
+            pending = [type(item).__name__ + "("]  # type: List[Any]
+            for index, (name, kind) in enumerate(_FIELDS[type(item)]):
+                prefix = (", " if index else "") + name + "="
+                if kind == _CHILD:
+                    pending.append(prefix)
+                    pending.append(getattr(item, name))
+                else:
+                    pending.append(prefix + repr(getattr(item, name)))
+            pending.append(")")
+            stack.extend(reversed(pending))
+        else:
+            parts.append(repr(item))
+    return "".join(parts)
+
+
+def _flatten(root: {base}) -> Tuple[Tuple[object, ...], ...]:
+    """
+    The nodes of `root` in postorder, each as its class followed by its field values, with
+    child nodes replaced by their index in the tuple. A subtree shared by several parents is
+    listed once.
+    """
+    indices = dict()  # type: Dict[int, int]
+    nodes = list()  # type: List[Tuple[object, ...]]
+    stack = [root]  # type: List[Any]
+    while stack:
+        node = stack.pop()
+        if node is _EXIT:
+            node = stack.pop()
+            if id(node) in indices:
+                continue
+            entry = [type(node)]  # type: List[object]
+            for name, kind in _FIELDS[type(node)]:
+                value = getattr(node, name)
+                entry.append(indices[id(value)] if kind == _CHILD else value)
+            indices[id(node)] = len(nodes)
+            nodes.append(tuple(entry))
+        elif id(node) not in indices:
+            stack.append(node)
+            stack.append(_EXIT)
+            for name, kind in reversed(_FIELDS[type(node)]):
+                if kind == _CHILD:
+                    stack.append(getattr(node, name))
+    return tuple(nodes)
+
+
+def _rebuild(nodes: Tuple[Tuple[Any, ...], ...]) -> {base}:
+    """
+    The tree that `_flatten` encoded.
+    """
+    built = list()  # type: List[{base}]
+    for entry in nodes:
+        arguments = list(entry[1:])
+        for index, (_, kind) in enumerate(_FIELDS[entry[0]]):
+            if kind == _CHILD:
+                arguments[index] = built[arguments[index]]
+        built.append(entry[0](*arguments))
+    return built[-1]
+'''
+
 
 class GenerateAst:
     @classmethod
@@ -9,16 +138,15 @@ class GenerateAst:
             print("Usage: generate_ast <output directort>")
             sys.exit(64)
         output_dir = args[0]
-        cls.define_ast(
-            output_dir,
-            "Expr",
-            [
-                "Binary   -> left: Expr, operator: Token, right: Expr",
-                "Grouping -> expression: Expr",
-                "Literal  -> value: object",
-                "Unary    -> operator: Token, right: Expr",
-            ],
-        )
+        types = [
+            "Binary   -> left: Expr, operator: Token, right: Expr",
+            "Grouping -> expression: Expr",
+            "Literal  -> value: object",
+            "Unary    -> operator: Token, right: Expr",
+            "Variable -> name: Token",
+        ]
+        cls.define_ast(output_dir, "Expr", types)
+        cls.define_walker(output_dir, "Expr", types)
 
     @classmethod
     def define_ast(cls, output_dir: str, base_name: str, types: List[str]):
@@ -28,9 +156,12 @@ class GenerateAst:
         lines.append(
             "# NOTE: This file is generated by `generate_ast.py` automatically, do not modify it manually\n\n"
         )
-        lines.append("from typing import TYPE_CHECKING\n\n")
+        lines.append("from __future__ import annotations\n\n")
         lines.append("from .token import Token\n\n")
+        # Not `typing.TYPE_CHECKING`: importing `typing` would slow down startup.
+        lines.append("TYPE_CHECKING = False\n")
         lines.append("if TYPE_CHECKING:\n")
+        lines.append("    from typing import Any, Dict, List, Tuple\n\n")
         lines.append("    from .ast_printer import AstPrinter\n")
         lines.append("else:\n")
         lines.append("    AstPrinter = None\n\n\n")
@@ -52,31 +183,249 @@ class GenerateAst:
             class_name = type.split("->")[0].strip()
             lines.append(f'setattr({base_name}, "{class_name}", {class_name})\n')
 
+        cls.define_fields(lines, base_name, types)
+
         with open(path, "w") as f:
             f.writelines(lines)
 
         lines.clear()
         del lines
 
+    @classmethod
+    def define_fields(cls, lines: List[str], base_name: str, types: List[str]):
+        lines.append("\n")
+        lines.append(
+            "# Fields of each node class in constructor order, with how they are compared: `_CHILD`\n"
+        )
+        lines.append(
+            "# fields hold nodes, and `_TYPED` values also compare their types, so that `Literal(1.0)`\n"
+        )
+        lines.append("# and `Literal(True)` stay distinct.\n")
+        lines.append("_CHILD, _PLAIN, _TYPED = range(3)\n")
+        lines.append("_FIELDS = {\n")
+        for type in types:
+            class_name, fields = type.split("->")
+            kinds = list()  # type: List[str]
+            for field in fields.strip().split(", "):
+                name, field_type = field.split(": ")
+                kind = {base_name: "_CHILD", "object": "_TYPED"}.get(field_type, "_PLAIN")
+                kinds.append(f'("{name}", {kind})')
+            entry = ", ".join(kinds) + ("," if len(kinds) == 1 else "")
+            lines.append(f"    {class_name.strip()}: ({entry}),\n")
+        lines.append("}  # type: Dict[type, Tuple[Tuple[str, int], ...]]\n")
+        lines.append("_ARITY = {\n")
+        lines.append(
+            "    node: sum(kind == _CHILD for _, kind in fields) for node, fields in _FIELDS.items()\n"
+        )
+        lines.append("}  # type: Dict[type, int]\n\n")
+        lines.append(_NODE_FUNCTIONS.format(base=base_name))
+
     @classmethod
     def define_type(cls, lines: List[str], base_name: str, class_name: str, fields: str):
+        _fields = [field.split(": ") for field in fields.split(", ")]
+        names = [name for name, _ in _fields]
+        # Nodes with children delegate to the functions of `_NODE_FUNCTIONS`.
+        parent = any(type == base_name for _, type in _fields)
+        slots = ", ".join(f'"{name}"' for name in names) + ("," if len(names) == 1 else "")
+
         lines.append(f"class {class_name}({base_name}):\n")
+        # Fields live in slots rather than a per-instance `__dict__`.
+        lines.append(f"    __slots__ = ({slots})\n")
+        lines.append(f"    __match_args__ = ({slots})\n")
+        lines.append("\n")
         # Constructor.
         lines.append(f"    def __init__(self, {fields}):\n")
         # Fields.
-        _fields = fields.split(", ")
-        for field in _fields:
-            name = field.split(": ")[0]
+        for name in names:
             lines.append(f"        self.{name} = {name}\n")
 
         lines.append("\n")
         lines.append(f"    def accept(self, visitor: AstPrinter) -> str:\n")
         lines.append(f"        return visitor.visit_{class_name.lower()}_expr(self)\n")
 
+        # Structural equality. `object` fields also compare their types, so that
+        # `Literal(1.0)` and `Literal(True)` stay distinct.
+        lines.append("\n")
+        lines.append("    def __eq__(self, other: object) -> bool:\n")
+        lines.append(f"        if not isinstance(other, {class_name}):\n")
+        lines.append("            return NotImplemented\n")
+        if parent:
+            lines.append("        return _equal(self, other)\n")
+            lines.append("\n")
+            lines.append("    def __hash__(self) -> int:\n")
+            lines.append("        return _hash(self)\n")
+            lines.append("\n")
+            lines.append("    def __repr__(self) -> str:\n")
+            lines.append("        return _repr(self)\n")
+            lines.append("\n")
+            lines.append("    def __reduce__(self):\n")
+            lines.append("        return (_rebuild, (_flatten(self),))\n")
+            lines.append("\n\n")
+            return
+
+        comparisons = list()  # type: List[str]
+        for name, type in _fields:
+            if type == "object":
+                comparisons.append(f"type(self.{name}) is type(other.{name})")
+            comparisons.append(f"self.{name} == other.{name}")
+        condition = " and ".join(comparisons)
+        if len(condition) <= 80:
+            lines.append(f"        return {condition}\n")
+        else:
+            lines.append("        return (\n")
+            lines.append(f"            {comparisons[0]}\n")
+            for comparison in comparisons[1:]:
+                lines.append(f"            and {comparison}\n")
+            lines.append("        )\n")
+
+        values = list()  # type: List[str]
+        for name, type in _fields:
+            if type == "object":
+                values.append(f"type(self.{name})")
+            values.append(f"self.{name}")
+        lines.append("\n")
+        lines.append("    def __hash__(self) -> int:\n")
+        lines.append(f"        return hash(({class_name}, {', '.join(values)}))\n")
+
+        arguments = ", ".join(f"{name}={{self.{name}!r}}" for name in names)
+        lines.append("\n")
+        lines.append("    def __repr__(self) -> str:\n")
+        lines.append(f'        return f"{class_name}({arguments})"\n')
+
+        arguments = ", ".join(f"self.{name}" for name in names) + ("," if len(names) == 1 else "")
+        lines.append("\n")
+        lines.append("    def __reduce__(self):\n")
+        lines.append(f"        return ({class_name}, ({arguments}))\n")
+
         lines.append("\n\n")
 
+    @classmethod
+    def define_walker(cls, output_dir: str, base_name: str, types: List[str]):
+        """
+        Generate `walker.py`: explicit-stack traversals of the `base_name` tree, dispatching
+        through tables keyed by node class instead of recursive `accept` calls.
+        """
+        path = f"{output_dir}/walker.py"
+        class_names = [type.split("->")[0].strip() for type in types]
+
+        lines = list()  # type: List[str]
+        lines.append(
+            "# NOTE: This file is generated by `generate_ast.py` automatically, do not modify it manually\n\n"
+        )
+        lines.append("from __future__ import annotations\n\n")
+        lines.append(
+            f"from .{base_name.lower()} import {', '.join(sorted([base_name] + class_names))}\n\n"
+        )
+        lines.append("TYPE_CHECKING = False\n")
+        lines.append("if TYPE_CHECKING:\n")
+        lines.append(
+            "    from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, TypeVar\n\n"
+        )
+        lines.append('    T = TypeVar("T")\n\n')
+        lines.append(
+            "# Marks, on the work stack, that the node below it has had all its children handled.\n"
+        )
+        lines.append("_EXIT = object()\n\n")
+
+        lines.append(
+            f"# Child {base_name.lower()}s of each node class, last child first: the order they are pushed onto\n"
+        )
+        lines.append("# the work stack so that they are handled first child first.\n")
+        lines.append("CHILDREN = {\n")
+        arities = list()  # type: List[str]
+        for type in types:
+            class_name, fields = type.split("->")
+            class_name = class_name.strip()
+            children = [
+                field.split(": ")[0]
+                for field in fields.strip().split(", ")
+                if field.split(": ")[1] == base_name
+            ]
+            pushed = "".join(f"node.{name}, " for name in reversed(children))
+            if len(children) > 1:
+                pushed = pushed[:-2]
+            lines.append(f"    {class_name}: lambda node: ({pushed.rstrip()}),\n")
+            arities.append(f"    {class_name}: {len(children)},\n")
+        lines.append(
+            f"}}  # type: Dict[Type[{base_name}], Callable[[Any], Tuple[{base_name}, ...]]]\n\n"
+        )
+        lines.append("ARITY = {\n")
+        lines.extend(arities)
+        lines.append(f"}}  # type: Dict[Type[{base_name}], int]\n\n\n")
+
+        lines.append(f"def postorder(root: {base_name}) -> Iterator[{base_name}]:\n")
+        lines.append('    """\n')
+        lines.append(
+            "    Yield every node of `root`, children before their parent, in constant Python stack.\n"
+        )
+        lines.append('    """\n')
+        lines.append("    children = CHILDREN\n")
+        lines.append("    stack = [root]  # type: List[Any]\n")
+        lines.append("    while stack:\n")
+        lines.append("        node = stack.pop()\n")
+        lines.append("        if node is _EXIT:\n")
+        lines.append("            yield stack.pop()\n")
+        lines.append("        else:\n")
+        lines.append("            stack.append(node)\n")
+        lines.append("            stack.append(_EXIT)\n")
+        lines.append("            stack.extend(children[type(node)](node))\n\n\n")
+
+        lines.append("def fold(\n")
+        lines.append(f"    root: {base_name},\n")
+        lines.append(f"    handlers: Dict[Type[{base_name}], Callable[..., T]],\n")
+        lines.append("    memo: Optional[Dict[int, T]] = None,\n")
+        lines.append(") -> T:\n")
+        lines.append('    """\n')
+        lines.append(
+            "    Compute `handlers[type(node)](node, *child_results)` for every node, bottom-up, and\n"
+        )
+        lines.append(
+            "    return the result for `root`. Runs in constant Python stack whatever the tree depth.\n"
+        )
+        lines.append("\n")
+        lines.append(
+            "    With a `memo` dict, results are recorded by node `id`, and a node met again (a shared\n"
+        )
+        lines.append(
+            "    subtree of a DAG) reuses its result without being walked again. The caller keeps the\n"
+        )
+        lines.append("    nodes alive for as long as it keeps the memo.\n")
+        lines.append('    """\n')
+        lines.append("    children = CHILDREN\n")
+        lines.append("    arity = ARITY\n")
+        lines.append("    values = list()  # type: List[T]\n")
+        lines.append("    stack = [root]  # type: List[Any]\n")
+        lines.append("    while stack:\n")
+        lines.append("        node = stack.pop()\n")
+        lines.append("        if node is _EXIT:\n")
+        lines.append("            node = stack.pop()\n")
+        lines.append("            count = arity[type(node)]\n")
+        lines.append("            arguments = values[-count:]\n")
+        lines.append("            del values[-count:]\n")
+        lines.append("            value = handlers[type(node)](node, *arguments)\n")
+        lines.append("            if memo is not None:\n")
+        lines.append("                memo[id(node)] = value\n")
+        lines.append("            values.append(value)\n")
+        lines.append("        elif memo is not None and id(node) in memo:\n")
+        lines.append("            values.append(memo[id(node)])\n")
+        lines.append("        elif arity[type(node)]:\n")
+        lines.append("            stack.append(node)\n")
+        lines.append("            stack.append(_EXIT)\n")
+        lines.append("            stack.extend(children[type(node)](node))\n")
+        lines.append("        else:\n")
+        lines.append("            value = handlers[type(node)](node)\n")
+        lines.append("            if memo is not None:\n")
+        lines.append("                memo[id(node)] = value\n")
+        lines.append("            values.append(value)\n")
+        lines.append("    return values[0]\n")
+
+        with open(path, "w") as f:
+            f.writelines(lines)
+
     @classmethod
     def define_visitor(cls, lines: List[str], base_name: str, types: List[str]):
+        lines.append("\n")
+        lines.append("    __slots__ = ()\n")
         lines.append("\n")
         lines.append("    def accept(self, visitor: AstPrinter) -> str:\n")
         lines.append("        raise NotImplementedError\n")
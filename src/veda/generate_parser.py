@@ -0,0 +1,192 @@
+import ast
+import os
+import re
+import sys
+from typing import Dict, List, Tuple
+
+# Values of the keyword literals of `primary`. The grammar only says that `"true"` is an
+# operand, not what it evaluates to.
+KEYWORD_VALUES = {"true": "True", "false": "False", "nil": "None"}
+
+
+class GenerateParser:
+    """
+    Generate `parse_tables.py`, the operator-precedence tables `TableParser` runs on, from
+    the grammar written out in the `Parser` docstring.
+
+    The grammar has to be an operator-precedence grammar in the shape `Parser` uses: a chain
+    of left-associative binary levels (`a → b ( ( "op" | ... ) b )* ;`), loosest first, then
+    one prefix level (`u → ( "op" | ... ) u | next ;`), then `primary`, whose alternatives
+    are terminals or a parenthesized `expression`. Quoted lexemes are mapped to token types
+    with the scanner's own `operators` / `keywords` tables.
+    """
+
+    @classmethod
+    def run(cls, *args: str):
+        if len(args) != 1:
+            print("Usage: generate_parser <output directory>")
+            sys.exit(64)
+        output_dir = args[0]
+        source_dir = os.path.dirname(os.path.abspath(__file__))
+        grammar = cls.read_docstring(f"{source_dir}/parser.py", "Parser")
+        lexemes = cls.read_lexemes(f"{source_dir}/scanner.py", "Scanner")
+        cls.define_tables(output_dir, cls.read_grammar(grammar), lexemes)
+
+    @classmethod
+    def read_docstring(cls, path: str, class_name: str) -> str:
+        with open(path) as f:
+            module = ast.parse(f.read())
+        for node in module.body:
+            if isinstance(node, ast.ClassDef) and node.name == class_name:
+                return ast.get_docstring(node) or ""
+        raise ValueError(f"No class {class_name} in {path}")
+
+    @classmethod
+    def read_lexemes(cls, path: str, class_name: str) -> Dict[str, str]:
+        """
+        Lexeme → `TokenType` member name, from the `operators` and `keywords` class dicts.
+        """
+        with open(path) as f:
+            module = ast.parse(f.read())
+        lexemes = dict()  # type: Dict[str, str]
+        for node in module.body:
+            if not (isinstance(node, ast.ClassDef) and node.name == class_name):
+                continue
+            for statement in node.body:
+                if not (
+                    isinstance(statement, ast.Assign) and isinstance(statement.value, ast.Dict)
+                ):
+                    continue
+                for key, value in zip(statement.value.keys, statement.value.values):
+                    if isinstance(key, ast.Constant) and isinstance(value, ast.Attribute):
+                        lexemes[key.value] = value.attr
+        return lexemes
+
+    @classmethod
+    def read_grammar(cls, grammar: str) -> Dict[str, str]:
+        """
+        Rule name → right-hand side, in the order the rules are written.
+        """
+        rules = dict()  # type: Dict[str, str]
+        for rule in grammar.split(";"):
+            rule = " ".join(rule.split())
+            if not rule:
+                continue
+            name, _, body = rule.partition("→")
+            rules[name.strip()] = body.strip()
+        return rules
+
+    @classmethod
+    def alternatives(cls, body: str) -> List[str]:
+        return [alternative.strip() for alternative in body.split("|")]
+
+    @classmethod
+    def unquote(cls, symbol: str) -> str:
+        return symbol[1:-1]
+
+    @classmethod
+    def token_type(cls, symbol: str, lexemes: Dict[str, str]) -> str:
+        if symbol.startswith('"'):
+            return f"TokenType.{lexemes[cls.unquote(symbol)]}"
+        return f"TokenType.{symbol}"
+
+    @classmethod
+    def levels(
+        cls, rules: Dict[str, str]
+    ) -> Tuple[List[List[str]], List[str], List[str], Tuple[str, str]]:
+        """
+        Walk the rule chain from the first rule and return the binary operator levels
+        (loosest first), the prefix operators, the operand terminals of `primary`, and the
+        opening / closing lexemes of its parenthesized expression.
+        """
+        start = next(iter(rules))
+        binary = list()  # type: List[List[str]]
+        prefix = list()  # type: List[str]
+        name = start
+        while True:
+            body = rules[name]
+            if re.fullmatch(r"\w+", body):
+                name = body
+                continue
+            level = re.fullmatch(r"(\w+) \( \( (.+) \) \1 \)\*", body)
+            if level:
+                binary.append(cls.alternatives(level.group(2)))
+                name = level.group(1)
+                continue
+            unary = re.fullmatch(r"\( (.+) \) (\w+) \| (\w+)", body)
+            if unary and unary.group(2) == name:
+                prefix = cls.alternatives(unary.group(1))
+                name = unary.group(3)
+                continue
+            break
+
+        operands = list()  # type: List[str]
+        group = None
+        for alternative in cls.alternatives(rules[name]):
+            parenthesized = re.fullmatch(r'("[^"]+") (\w+) ("[^"]+")', alternative)
+            if parenthesized and parenthesized.group(2) == start:
+                group = (parenthesized.group(1), parenthesized.group(3))
+            elif re.fullmatch(r'\w+|"\w+"', alternative):
+                operands.append(alternative)
+            else:
+                raise ValueError(f"Unsupported alternative of {name}: {alternative}")
+        if group is None:
+            raise ValueError(f"No parenthesized {start} in {name}")
+        return binary, prefix, operands, group
+
+    @classmethod
+    def define_tables(cls, output_dir: str, rules: Dict[str, str], lexemes: Dict[str, str]):
+        binary, prefix, operands, (opening, closing) = cls.levels(rules)
+
+        lines = list()  # type: List[str]
+        lines.append(
+            "# NOTE: This file is generated by `generate_parser.py` automatically, do not modify it manually\n\n"
+        )
+        lines.append("from .token_type import TokenType\n\n")
+
+        lines.append(
+            "# Binding power of each binary operator, higher binds tighter. All are left-associative.\n"
+        )
+        lines.append("BINARY = {\n")
+        for power, operators in enumerate(binary, 1):
+            for operator in operators:
+                lines.append(f"    {cls.token_type(operator, lexemes)}: {power},\n")
+        lines.append("}\n\n")
+
+        lines.append("# Prefix operators, which bind tighter than any binary operator.\n")
+        prefixes = ", ".join(cls.token_type(operator, lexemes) for operator in prefix)
+        lines.append(f"PREFIX = frozenset(({prefixes}{',' if len(prefix) == 1 else ''}))\n\n")
+
+        lines.append("# How each token that is an operand on its own becomes a node.\n")
+        lines.append("LITERAL = 0  # Literal(token.literal)\n")
+        lines.append("VARIABLE = 1  # Variable(token)\n")
+        lines.append("CONSTANT = 2  # Literal(CONSTANTS[token.type])\n\n")
+        lines.append("OPERANDS = {\n")
+        constants = list()  # type: List[str]
+        for operand in operands:
+            token_type = cls.token_type(operand, lexemes)
+            if operand.startswith('"'):
+                lines.append(f"    {token_type}: CONSTANT,\n")
+                constants.append(f"    {token_type}: {KEYWORD_VALUES[cls.unquote(operand)]},\n")
+            elif operand == "IDENTIFIER":
+                lines.append(f"    {token_type}: VARIABLE,\n")
+            else:
+                lines.append(f"    {token_type}: LITERAL,\n")
+        lines.append("}\n\n")
+        lines.append("CONSTANTS = {\n")
+        lines.extend(constants)
+        lines.append("}\n\n")
+
+        lines.append("# Parenthesized expressions.\n")
+        lines.append(f"GROUP_OPEN = {cls.token_type(opening, lexemes)}\n")
+        lines.append(f"GROUP_CLOSE = {cls.token_type(closing, lexemes)}\n")
+        lines.append(
+            f"GROUP_CLOSE_MESSAGE = \"Expect '{cls.unquote(closing)}' after expression.\"\n"
+        )
+
+        with open(f"{output_dir}/parse_tables.py", "w") as f:
+            f.writelines(lines)
+
+
+if __name__ == "__main__":
+    GenerateParser.run("./src/veda/")
@@ -0,0 +1,527 @@
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional, Tuple
+
+from .expr import Binary, Expr, Grouping, Literal, Unary, Variable
+from .parser import Parser
+from .scanner import Scanner
+from .session import Session
+from .token import Token
+from .token_type import TokenType
+from .walker import fold
+
+# Rules whose results are kept between parses: the four binary operator levels, from the
+# loosest, and parenthesized groups.
+_EQUALITY, _COMPARISON, _TERM, _FACTOR, _GROUP = range(5)
+
+_OPERATORS = {
+    _EQUALITY: (TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL),
+    _COMPARISON: (
+        TokenType.GREATER,
+        TokenType.GREATER_EQUAL,
+        TokenType.LESS,
+        TokenType.LESS_EQUAL,
+    ),
+    _TERM: (TokenType.MINUS, TokenType.PLUS),
+    _FACTOR: (TokenType.SLASH, TokenType.STAR),
+}
+
+_NONE = dict()  # type: Dict[int, _Parsed]
+
+# Edits remembered to map parse results forward; results older than that are parsed again.
+MAX_EDITS = 256
+
+
+class _Parsed:
+    """
+    The result of parsing one rule from token `start`, which was at `index` as of document
+    `version`: `count` tokens and `node`, whose value depends on the tokens up to `extent`
+    positions after `start` (one past the end for an operator chain, which stopped because
+    of the token after it).
+
+    For an operator chain, `first` is the first operand and `first_end` where it ends, and
+    step `k` appended `operators[k]` and `rights[k]`, giving the chain `nodes[k]` that ends
+    at `ends[k]`, relative to `start`.
+    """
+
+    __slots__ = (
+        "start",
+        "version",
+        "index",
+        "count",
+        "extent",
+        "node",
+        "first",
+        "first_end",
+        "ends",
+        "operators",
+        "rights",
+        "nodes",
+    )
+
+    def __init__(self, start: Token, version: int, index: int, count: int, node: Expr) -> None:
+        self.start = start
+        self.version = version
+        self.index = index
+        self.count = count
+        self.extent = count - 1
+        self.node = node
+        self.first = node
+        self.first_end = 0
+        self.ends = array("i")
+        self.operators = list()  # type: List[Token]
+        self.rights = list()  # type: List[Expr]
+        self.nodes = list()  # type: List[Expr]
+
+
+class Document:
+    """
+    A source buffer that keeps its token stream and AST up to date across text edits.
+
+    `edit` re-scans only the tokens around the edit until the new scan lines up with the old
+    stream again, splices the new tokens in, and re-parses only what the new tokens touch.
+    The resulting tokens and tree are those of a full `Scanner(source).scan_tokens()` /
+    `Parser(tokens).parse()` of the new source.
+
+    Each operator chain and group parsed is remembered by its first token, with the edits
+    since mapping it to the current token stream. One no edit touched is reused as it is.
+    One an edit touched resumes from its longest untouched prefix, and once the parse is
+    past the edit, the rest of the chain is rebuilt from its old operands without parsing
+    them again. An edit then costs time in proportion to the edit and to the number of
+    nodes above it, which is the length of a chain an edit lands in; trees returned before
+    are never modified. An edit that adds or removes lines also moves every token after it
+    to another line: those tokens, and the remembered nodes that hold them, are copied with
+    their new line, without being parsed again.
+
+    Token offsets live in the `starts` / `ends` columns. Entries after the most recent edit
+    are stored un-shifted, with the shift kept pending (`pending_index`, `pending_shift`)
+    and only applied to the tokens between two consecutive edits.
+
+    Diagnostics of every scan and parse go to `reporter`, `Veda` by default.
+    """
+
+    def __init__(self, source: str, reporter: Optional[Session] = None) -> None:
+        self.source = source
+        self.reporter = reporter
+        self.tokens = list()  # type: List[Token]
+        self.starts = array("i")
+        self.ends = array("i")
+        self.pending_index = 0
+        self.pending_shift = 0
+        # Edit `version - base - 1` replaced tokens `[low, resync)` with `count` new ones.
+        self.version = 0
+        self.base = 0
+        self.edits = list()  # type: List[Tuple[int, int, int]]
+        # id(first token) -> rule -> result.
+        self.parsed = dict()  # type: Dict[int, Dict[int, _Parsed]]
+        # Results taken over from the previous parse, and tokens parsed, by the last parse.
+        self.reused = 0
+        self.reparsed = 0
+
+        scanner = Scanner(source, reporter=reporter)
+        for token, start, end in scanner.match_spans(source, 0, final=True):
+            self.tokens.append(token)
+            self.starts.append(start)
+            self.ends.append(end)
+        self.tokens.append(Token(TokenType.EOF, "", None, scanner.line))
+        self.starts.append(len(source))
+        self.ends.append(len(source))
+        self.expression = self.parse()
+
+    def start_at(self, index: int) -> int:
+        if index >= self.pending_index:
+            return self.starts[index] + self.pending_shift
+        return self.starts[index]
+
+    def end_at(self, index: int) -> int:
+        if index >= self.pending_index:
+            return self.ends[index] + self.pending_shift
+        return self.ends[index]
+
+    def line_at(self, index: int) -> int:
+        return self.tokens[index].line
+
+    def edit(self, offset: int, deleted: int, inserted: str) -> Optional[Expr]:
+        """
+        Replace `deleted` characters at `offset` with `inserted`, then return the new AST.
+        """
+        if not (0 <= offset and 0 <= deleted and offset + deleted <= len(self.source)):
+            raise ValueError(f"Edit ({offset}, {deleted}) is out of range")
+
+        old_source = self.source
+        source = self.source = old_source[:offset] + inserted + old_source[offset + deleted :]
+        shift = len(inserted) - deleted
+        # New offsets at or beyond `clean` hold exactly the old text that followed the edit.
+        clean = offset + len(inserted)
+
+        # Re-scan from one token before the first token reaching the edit, because the token
+        # in front of an edit can absorb the inserted text (`1.` + `5`, `a` + `b`, `/` + `/`).
+        # The scan restarts at the end of the token before that, which is a point where the
+        # old scan sat between tokens and whose line is known.
+        low = max(self.find_end(offset) - 1, 0)
+        scanner = Scanner(source, reporter=self.reporter)
+        if low > 0:
+            restart = self.end_at(low - 1)
+            scanner.line = self.line_at(low - 1)
+        else:
+            restart = 0
+
+        tokens = list()  # type: List[Token]
+        starts = array("i")
+        ends = array("i")
+        resync = len(self.tokens)
+        for token, start, end in scanner.match_spans(source, restart, final=True):
+            if start >= clean:
+                # Replace at least the token at `low`, so that what was parsed from it moves
+                # to the tokens now in front of it (see below).
+                index = self.find_start(start - shift)
+                if low < index < len(self.tokens) and self.tokens[index].type == token.type:
+                    resync = index
+                    line_shift = token.line - self.line_at(resync)
+                    break
+            tokens.append(token)
+            starts.append(start)
+            ends.append(end)
+        else:
+            # Ran to the end of the source: the old EOF lines up with the new one.
+            resync = len(self.tokens) - 1
+            line_shift = scanner.line - self.line_at(resync)
+
+        # What was parsed from a replaced token moves to the token now at its index, for the
+        # part after the edit.
+        parsed = self.parsed
+        for index, token in enumerate(self.tokens[low:resync]):
+            entries = parsed.pop(id(token), None)
+            if entries is not None and index < len(tokens):
+                for entry in entries.values():
+                    entry.start = tokens[index]
+                parsed[id(tokens[index])] = entries
+        self.splice(low, resync, tokens, starts, ends, shift)
+        if line_shift:
+            self.move_lines(low + len(tokens), line_shift)
+        self.edits.append((low, resync, len(tokens)))
+        self.version += 1
+        if len(self.edits) > MAX_EDITS:
+            del self.edits[0]
+            self.base += 1
+        self.expression = self.parse()
+        return self.expression
+
+    def find_end(self, offset: int) -> int:
+        """
+        Index of the first token whose end offset is at or after `offset`.
+        """
+        low, high = 0, len(self.tokens) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if self.end_at(middle) < offset:
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def find_start(self, offset: int) -> int:
+        """
+        Index of the token starting at `offset`, or `len(self.tokens)` if there is none.
+        """
+        low, high = 0, len(self.tokens) - 1
+        while low < high:
+            middle = (low + high) // 2
+            if self.start_at(middle) < offset:
+                low = middle + 1
+            else:
+                high = middle
+        return low if self.start_at(low) == offset else len(self.tokens)
+
+    def splice(
+        self,
+        low: int,
+        high: int,
+        tokens: List[Token],
+        starts: array,
+        ends: array,
+        shift: int,
+    ):
+        """
+        Replace tokens `[low, high)` and keep a single pending offset shift, materializing it
+        only for the tokens between the previous edit and this one.
+        """
+        if self.pending_index < low:
+            self.apply_shift(self.pending_index, low, self.pending_shift)
+        elif self.pending_index > high:
+            self.apply_shift(high, self.pending_index, -self.pending_shift)
+
+        self.tokens[low:high] = tokens
+        self.starts[low:high] = starts
+        self.ends[low:high] = ends
+        self.pending_index = low + len(tokens)
+        self.pending_shift += shift
+
+    def apply_shift(self, low: int, high: int, shift: int):
+        if shift:
+            self.starts[low:high] = array("i", [start + shift for start in self.starts[low:high]])
+            self.ends[low:high] = array("i", [end + shift for end in self.ends[low:high]])
+
+    def move_lines(self, low: int, line_shift: int):
+        """
+        Replace the tokens from `low` on with copies `line_shift` lines further, and every
+        remembered result with one that holds the copies, sharing the nodes it can.
+        """
+        tokens = self.tokens
+        # The maps below are by `id`, so the old tokens and nodes are kept alive until done.
+        old = tokens[low:]
+        moved = dict()  # type: Dict[int, Token]
+        for index, token in enumerate(old, low):
+            moved[id(token)] = tokens[index] = Token(
+                token.type, token.lexeme, token.literal, token.line + line_shift, token.symbol
+            )
+
+        def binary(node: Binary, left: Expr, right: Expr) -> Expr:
+            operator = moved.get(id(node.operator))
+            if operator is None and left is node.left and right is node.right:
+                return node
+            return Binary(left, operator or node.operator, right)
+
+        def grouping(node: Grouping, expression: Expr) -> Expr:
+            return node if expression is node.expression else Grouping(expression)
+
+        def unary(node: Unary, right: Expr) -> Expr:
+            operator = moved.get(id(node.operator))
+            if operator is None and right is node.right:
+                return node
+            return Unary(operator or node.operator, right)
+
+        def variable(node: Variable) -> Expr:
+            name = moved.get(id(node.name))
+            return node if name is None else Variable(name)
+
+        handlers = {
+            Binary: binary,
+            Grouping: grouping,
+            Literal: lambda node: node,
+            Unary: unary,
+            Variable: variable,
+        }
+        memo = dict()  # type: Dict[int, Expr]
+        roots = list()  # type: List[Expr]
+        parsed = dict()  # type: Dict[int, Dict[int, _Parsed]]
+        for entries in self.parsed.values():
+            for entry in entries.values():
+                roots.append(entry.node)
+                roots.append(entry.first)
+                roots += entry.rights
+                roots += entry.nodes
+                entry.start = moved.get(id(entry.start), entry.start)
+                entry.node = fold(entry.node, handlers, memo)
+                entry.first = fold(entry.first, handlers, memo)
+                entry.operators = [moved.get(id(token), token) for token in entry.operators]
+                entry.rights = [fold(right, handlers, memo) for right in entry.rights]
+                entry.nodes = [fold(node, handlers, memo) for node in entry.nodes]
+                parsed[id(entry.start)] = entries
+        self.parsed = parsed
+
+    def locate(self, parsed: _Parsed) -> Optional[Tuple[int, int, int, int]]:
+        """
+        Map `parsed` through the edits since its version: its index now, the tokens
+        `[dirty, clean)` that edits replaced or inserted within its extent (`dirty == clean ==
+        -1` if none), and the index of its last dependent token, `-1` if an edit removed it.
+        `None` if it is older than the edits remembered.
+        """
+        if parsed.version < self.base:
+            return None
+        index = parsed.index
+        last = index + parsed.extent
+        dirty = clean = -1
+        for low, resync, count in self.edits[parsed.version - self.base :]:
+            delta = count - (resync - low)
+            if index >= resync:
+                # Entirely after the edit.
+                index += delta
+                if last >= 0:
+                    last += delta
+                if dirty >= 0:
+                    dirty += delta
+                    clean += delta
+                continue
+            if last >= 0 and last < low:
+                continue
+            # An edit can start before a result whose first token it replaced.
+            if dirty < 0:
+                dirty, clean = max(low, index), low + count
+            else:
+                if dirty >= resync:
+                    dirty += delta
+                dirty = max(min(dirty, low), index)
+                clean = clean + delta if clean >= resync else low + count
+                clean = max(clean, low + count)
+            if last >= resync:
+                last += delta
+            elif last >= low:
+                last = -1
+        return index, dirty, clean, last
+
+    def parse(self) -> Optional[Expr]:
+        self.reused = 0
+        self.reparsed = 0
+        return _DocumentParser(self).parse()
+
+
+class _DocumentParser(Parser):
+    def __init__(self, document: Document) -> None:
+        super().__init__(document.tokens, reporter=document.reporter)
+        self.document = document
+
+    def advance(self):
+        self.document.reparsed += 1
+        return super().advance()
+
+    def equality(self) -> Expr:
+        return self.chain(_EQUALITY, self.comparison)
+
+    def comparison(self) -> Expr:
+        return self.chain(_COMPARISON, self.term)
+
+    def term(self) -> Expr:
+        return self.chain(_TERM, self.factor)
+
+    def factor(self) -> Expr:
+        return self.chain(_FACTOR, self.unary)
+
+    def lookup(self, rule: int) -> Tuple[Optional[_Parsed], Optional[Tuple[int, int, int, int]]]:
+        """
+        The previous result of `rule` at the current token and where it stands now.
+        """
+        token = self.tokens[self.current]
+        parsed = self.document.parsed.get(id(token), _NONE).get(rule)
+        if parsed is None or parsed.start is not token:
+            return None, None
+        position = self.document.locate(parsed)
+        if position is None or position[0] != self.current:
+            return None, None
+        return parsed, position
+
+    def reuse(self, parsed: _Parsed) -> Expr:
+        document = self.document
+        parsed.version = document.version
+        parsed.index = self.current
+        self.current += parsed.count
+        document.reused += 1
+        return parsed.node
+
+    def primary(self) -> Expr:
+        if not self.check(TokenType.LEFT_PAREN):
+            return super().primary()
+
+        start = self.current
+        parsed, position = self.lookup(_GROUP)
+        if parsed is not None and position is not None and position[1] < 0:
+            return self.reuse(parsed)
+
+        expr = super().primary()
+        document = self.document
+        parsed = _Parsed(self.tokens[start], document.version, start, self.current - start, expr)
+        document.parsed.setdefault(id(parsed.start), dict())[_GROUP] = parsed
+        return expr
+
+    def chain(self, rule: int, operand) -> Expr:
+        """
+        `operand ( OPERATOR operand )*` with the operators of `rule`, left-associative, as
+        `Parser.term` and its siblings, reusing what it can of the previous result.
+        """
+        document = self.document
+        start = self.current
+        if id(self.tokens[start]) in document.parsed:
+            old, position = self.lookup(rule)
+        else:
+            old = position = None
+        result = None  # type: Optional[_Parsed]
+        clean = last = -1
+        if old is not None and position is not None:
+            _, dirty, clean, last = position
+            if dirty < 0 and last >= 0:
+                return self.reuse(old)
+            result = self.resume(old, dirty - start)
+        operators = _OPERATORS[rule]
+        if result is None:
+            expr = operand()
+            if self.peek().type not in operators:
+                return expr
+            result = _Parsed(self.tokens[start], document.version, start, 0, expr)
+            result.first_end = self.current - start
+        expr = result.node
+
+        while self.match(*operators):
+            operator = self.previous()
+            if 0 <= clean < self.current and last >= 0:
+                if self.fast_forward(result, old, operator, last):  # type: ignore
+                    break
+            right = operand()
+            expr = self.nodes.Binary(expr, operator, right)
+            result.ends.append(self.current - start)
+            result.operators.append(operator)
+            result.rights.append(right)
+            result.nodes.append(expr)
+
+        entries = document.parsed.setdefault(id(result.start), dict())
+        if result.nodes:
+            result.node = result.nodes[-1]
+            result.count = result.extent = self.current - start
+            entries[rule] = result
+        else:
+            entries.pop(rule, None)
+        return result.node
+
+    def resume(self, old: _Parsed, untouched: int) -> Optional[_Parsed]:
+        """
+        Continue after the longest prefix of chain `old` that the edits left alone, with the
+        token after it, which its last operand looked at: `untouched` tokens from its start.
+        """
+        steps = bisect_left(old.ends, untouched)
+        if not steps and old.first_end >= untouched:
+            return None
+        start = self.current
+        node = old.nodes[steps - 1] if steps else old.first
+        result = _Parsed(old.start, self.document.version, start, 0, node)
+        result.first, result.first_end = old.first, old.first_end
+        result.ends = old.ends[:steps]
+        result.operators = old.operators[:steps]
+        result.rights = old.rights[:steps]
+        result.nodes = old.nodes[:steps]
+        self.current = start + (old.ends[steps - 1] if steps else old.first_end)
+        self.document.reused += 1
+        return result
+
+    def fast_forward(self, result: _Parsed, old: _Parsed, operator: Token, last: int) -> bool:
+        """
+        Past the edits, if `operator` is one of chain `old`'s, so is everything after it up to
+        `last`, where `old` ends now: finish `result` with the old operands instead of parsing
+        them again.
+        """
+        # The old chain's offsets from its start are `shift` tokens off past the edits.
+        start = result.index
+        shift = (last - start) - old.extent
+        at = self.current - 1 - start - shift
+        if at == old.first_end:
+            step = 0
+        else:
+            step = bisect_left(old.ends, at)
+            if step == len(old.ends) or old.ends[step] != at:
+                return False
+            step += 1
+        if step == len(old.operators) or old.operators[step] is not operator:
+            return False
+
+        Binary = self.nodes.Binary
+        expr = result.nodes[-1] if result.nodes else result.node
+        operators = old.operators[step:]
+        rights = old.rights[step:]
+        append = result.nodes.append
+        for operator, right in zip(operators, rights):
+            expr = Binary(expr, operator, right)
+            append(expr)
+        result.ends.extend([end + shift for end in old.ends[step:]])
+        result.operators += operators
+        result.rights += rights
+        self.current = last
+        self.document.reused += 1
+        return True
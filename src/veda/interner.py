@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import math
+
+from .expr import Binary, Expr, Grouping, Literal, Unary, Variable
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, Hashable, Tuple
+
+    from .token import Token
+
+
+class Interner:
+    """
+    Hash-consing node factory. Structurally identical subtrees are built once and shared,
+    turning the parsed tree into a DAG whose size is the number of distinct subexpressions.
+
+    Its methods are named like the node classes, so it can stand in for the `Expr` namespace
+    a `Parser` builds nodes from (`Parser(tokens, Interner())`). Operators are keyed
+    by type and line, so a shared node still reports runtime errors on the right line.
+    """
+
+    def __init__(self) -> None:
+        self.nodes = dict()  # type: Dict[Tuple[Hashable, ...], Expr]
+
+    def __len__(self) -> int:
+        return len(self.nodes)
+
+    def Binary(self, left: Expr, operator: Token, right: Expr) -> Expr:
+        key = (Binary, id(left), operator.type, operator.line, id(right))
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = Binary(left, operator, right)
+        return node
+
+    def Grouping(self, expression: Expr) -> Expr:
+        key = (Grouping, id(expression))
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = Grouping(expression)
+        return node
+
+    def Literal(self, value: object) -> Expr:
+        if type(value) is float:
+            # Keep `0.0` / `-0.0` apart and let NaN match itself.
+            key = (
+                Literal,
+                float,
+                math.copysign(1.0, value),
+                repr(value),
+            )  # type: Tuple[Hashable, ...]
+        else:
+            key = (Literal, type(value), value)
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = Literal(value)
+        return node
+
+    def Unary(self, operator: Token, right: Expr) -> Expr:
+        key = (Unary, operator.type, operator.line, id(right))
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = Unary(operator, right)
+        return node
+
+    def Variable(self, name: Token) -> Expr:
+        key = (Variable, name.lexeme, name.line)
+        node = self.nodes.get(key)
+        if node is None:
+            node = self.nodes[key] = Variable(name)
+        return node
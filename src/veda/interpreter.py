@@ -0,0 +1,124 @@
+from __future__ import annotations
+
+from .expr import Binary, Expr, Grouping, Literal, Unary, Variable
+from .runtime import NUMBER_TYPES, VedaRuntimeError, divide, is_equal, is_truthy, lookup, stringify
+from .token import Token
+from .token_type import TokenType
+from .veda import Veda
+from .walker import fold
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Mapping, Optional
+
+    from .session import Session
+
+
+class Interpreter:
+    """
+    Straightforward tree-walking evaluator. It defines the reference semantics the
+    bytecode `VM` has to match. Identifiers are looked up in `variables`.
+    """
+
+    def __init__(
+        self,
+        variables: Optional[Mapping[str, object]] = None,
+        reporter: Optional[Session] = None,
+    ) -> None:
+        self.variables = variables if variables is not None else dict()
+        self.reporter = reporter if reporter is not None else Veda  # type: Any
+
+    def interpret(self, expr: Expr):
+        try:
+            value = self.evaluate(expr)
+            print(stringify(value))
+        except VedaRuntimeError as error:
+            self.reporter.runtime_error(error)
+
+    def evaluate(self, expr: Expr) -> object:
+        return expr.accept(self)  # type: ignore
+
+    def evaluate_shared(self, expr: Expr) -> object:
+        """
+        Evaluate `expr` bottom-up with an explicit stack, computing each distinct node once.
+        Expressions are pure, so on a tree with shared subtrees (see `Interner`) the cost is
+        the number of distinct nodes rather than the size of the expanded tree.
+        """
+        return fold(
+            expr,
+            {
+                Binary: lambda expr, left, right: self.binary(expr.operator, left, right),
+                Grouping: lambda expr, expression: expression,
+                Literal: lambda expr: expr.value,
+                Unary: lambda expr, right: self.unary(expr.operator, right),
+                Variable: lambda expr: lookup(self.variables, expr.name),
+            },
+            dict(),
+        )
+
+    def visit_literal_expr(self, expr: Literal):
+        return expr.value
+
+    def visit_grouping_expr(self, expr: Grouping):
+        return self.evaluate(expr.expression)
+
+    def visit_variable_expr(self, expr: Variable):
+        return lookup(self.variables, expr.name)
+
+    def visit_unary_expr(self, expr: Unary):
+        return self.unary(expr.operator, self.evaluate(expr.right))
+
+    def visit_binary_expr(self, expr: Binary):
+        left = self.evaluate(expr.left)
+        right = self.evaluate(expr.right)
+        return self.binary(expr.operator, left, right)
+
+    def unary(self, operator: Token, right: object):
+        if operator.type == TokenType.MINUS:
+            self.check_number_operand(operator, right)
+            return -right  # type: ignore
+        if operator.type == TokenType.BANG:
+            return not is_truthy(right)
+
+        return None
+
+    def binary(self, operator: Token, left: object, right: object):
+        _type = operator.type
+        if _type == TokenType.BANG_EQUAL:
+            return not is_equal(left, right)
+        elif _type == TokenType.EQUAL_EQUAL:
+            return is_equal(left, right)
+        elif _type == TokenType.PLUS:
+            if type(left) in NUMBER_TYPES and type(right) in NUMBER_TYPES:
+                return left + right  # type: ignore
+            if type(left) is str and type(right) is str:
+                return left + right
+            raise VedaRuntimeError(operator, "Operands must be two numbers or two strings.")
+
+        self.check_number_operands(operator, left, right)
+        if _type == TokenType.GREATER:
+            return left > right  # type: ignore
+        elif _type == TokenType.GREATER_EQUAL:
+            return left >= right  # type: ignore
+        elif _type == TokenType.LESS:
+            return left < right  # type: ignore
+        elif _type == TokenType.LESS_EQUAL:
+            return left <= right  # type: ignore
+        elif _type == TokenType.MINUS:
+            return left - right  # type: ignore
+        elif _type == TokenType.SLASH:
+            return divide(left, right)  # type: ignore
+        elif _type == TokenType.STAR:
+            return left * right  # type: ignore
+
+        return None
+
+    def check_number_operand(self, operator: Token, operand: object):
+        if type(operand) in NUMBER_TYPES:
+            return
+        raise VedaRuntimeError(operator, "Operand must be a number.")
+
+    def check_number_operands(self, operator: Token, left: object, right: object):
+        if type(left) in NUMBER_TYPES and type(right) in NUMBER_TYPES:
+            return
+        raise VedaRuntimeError(operator, "Operands must be numbers.")
@@ -0,0 +1,50 @@
+from __future__ import annotations
+
+from array import array
+from bisect import bisect_right
+from functools import lru_cache
+from operator import methodcaller
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import re
+    from typing import Tuple, Union
+
+    from .scanner import Binary
+
+_END = methodcaller("end")
+
+
+@lru_cache(maxsize=None)
+def _newline(binary: bool) -> re.Pattern:
+    import re
+
+    return re.compile(b"\n" if binary else "\n")
+
+
+class LineTable:
+    """
+    The offsets at which the lines of a source start, 4 bytes per line, found in one pass of
+    `re.finditer` over the whole source. The line and column of an offset are then a binary
+    search away, so token stores only need to keep offsets.
+
+    Lines and columns count from 1. For a binary source (see `is_binary`) offsets and columns
+    are in bytes.
+    """
+
+    def __init__(self, source: Union[str, Binary]) -> None:
+        self.starts = array("i", [0])
+        self.starts.extend(map(_END, _newline(not isinstance(source, str)).finditer(source)))
+
+    def __len__(self) -> int:
+        return len(self.starts)
+
+    def line(self, offset: int) -> int:
+        return bisect_right(self.starts, offset)
+
+    def column(self, offset: int) -> int:
+        return offset - self.starts[bisect_right(self.starts, offset) - 1] + 1
+
+    def position(self, offset: int) -> Tuple[int, int]:
+        line = bisect_right(self.starts, offset)
+        return line, offset - self.starts[line - 1] + 1
@@ -0,0 +1,174 @@
+from __future__ import annotations
+
+import sys
+import tracemalloc
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, List, Optional, Sequence, TextIO, Tuple
+
+    from .expr import Expr
+    from .session import Session
+
+
+class Usage:
+    """
+    Memory used by one call, as traced by `tracemalloc` and counted from what was allocated
+    when it started: `peak` bytes at its highest point, `retained` bytes still allocated when
+    it returned (its result included) and `blocks`, the number of memory blocks it left
+    allocated. `count` items of `unit` were produced, for the per-item figures.
+    """
+
+    __slots__ = ("name", "peak", "retained", "blocks", "count", "unit")
+
+    def __init__(self, name: str, peak: int, retained: int, blocks: int) -> None:
+        self.name = name
+        self.peak = peak
+        self.retained = retained
+        self.blocks = blocks
+        self.count = 0
+        self.unit = ""
+
+    @property
+    def per_item(self) -> float:
+        return self.retained / self.count if self.count else 0.0
+
+
+def measure(function: Callable[..., Any], *args: Any, name: str = "") -> Tuple[Any, Usage]:
+    """
+    Call `function(*args)` and return its result with its `Usage`. Tracing is started for the
+    call unless it is already on; either way its peak is reset, so an enclosing measurement
+    loses its own.
+    """
+    tracing = tracemalloc.is_tracing()
+    if not tracing:
+        tracemalloc.start()
+    try:
+        tracemalloc.reset_peak()
+        before = tracemalloc.get_traced_memory()[0]
+        blocks = sys.getallocatedblocks()
+        result = function(*args)
+        blocks = sys.getallocatedblocks() - blocks
+        current, peak = tracemalloc.get_traced_memory()
+    finally:
+        if not tracing:
+            tracemalloc.stop()
+    return result, Usage(name or function.__name__, peak - before, current - before, blocks)
+
+
+def node_sizes(expr: Expr) -> Dict[str, Tuple[int, int]]:
+    """
+    Count and total `sys.getsizeof` of the nodes of each type in `expr`, i.e. the cost of the
+    `expr.py` classes themselves, without the tokens and values they point to. A subtree
+    shared by several parents is counted once.
+    """
+    from .walker import postorder
+
+    sizes = dict()  # type: Dict[str, Tuple[int, int]]
+    seen = set()
+    for node in postorder(expr):
+        if id(node) in seen:
+            continue
+        seen.add(id(node))
+        name = type(node).__name__
+        count, size = sizes.get(name, (0, 0))
+        sizes[name] = (count + 1, size + sys.getsizeof(node))
+    return sizes
+
+
+class MemoryReport:
+    """
+    `Usage` of scanning, parsing and printing one source, in `stages`, and the size of its
+    tree by node type, in `nodes`. Parsing and printing are left out when the source has
+    syntax errors.
+    """
+
+    def __init__(self, stages: List[Usage], nodes: Dict[str, Tuple[int, int]]) -> None:
+        self.stages = stages
+        self.nodes = nodes
+
+    def stage(self, name: str) -> Optional[Usage]:
+        for usage in self.stages:
+            if usage.name == name:
+                return usage
+        return None
+
+    def write(self, file: TextIO):
+        file.write(
+            f"{'stage':10} {'peak (B)':>14} {'retained (B)':>14} {'blocks':>12} "
+            f"{'count':>20} {'retained/item':>20}\n"
+        )
+        for usage in self.stages:
+            file.write(
+                f"{usage.name:10} {usage.peak:14,} {usage.retained:14,} {usage.blocks:12,} "
+                f"{f'{usage.count:,} {usage.unit}':>20} "
+                f"{f'{usage.per_item:,.1f} B/{usage.unit[:-1]}':>20}\n"
+            )
+        if self.nodes:
+            file.write(f"\n{'node':10} {'count':>14} {'bytes':>14} {'bytes/node':>12}\n")
+            for name, (count, size) in sorted(self.nodes.items()):
+                file.write(f"{name:10} {count:14,} {size:14,} {size / count:12.1f}\n")
+
+
+def profile_memory(
+    source: str, engine: str = "classic", reporter: Optional[Session] = None
+) -> MemoryReport:
+    """
+    Measure `Scanner.scan_tokens`, `TableParser.parse` and `AstPrinter.print` on `source`,
+    each holding on to the previous stage's result, as a run does. Diagnostics go to
+    `reporter`, a new `Session` by default.
+    """
+    from .ast_printer import AstPrinter
+    from .scanner import Scanner
+    from .session import Session
+    from .table_parser import TableParser
+
+    session = Session() if reporter is None else reporter
+    scanner = Scanner(source, engine=engine, reporter=session)
+    tokens, scan = measure(scanner.scan_tokens, name="scan")
+    scan.count, scan.unit = len(tokens), "tokens"
+    stages = [scan]
+    nodes = dict()  # type: Dict[str, Tuple[int, int]]
+    if session.had_error:
+        return MemoryReport(stages, nodes)
+
+    parser = TableParser(tokens, reporter=session)
+    expression, parse = measure(parser.parse, name="parse")
+    parse.unit = "nodes"
+    stages.append(parse)
+    if session.had_error or expression is None:
+        return MemoryReport(stages, nodes)
+    nodes = node_sizes(expression)
+    parse.count = sum(count for count, _ in nodes.values())
+
+    text, printing = measure(AstPrinter().print, expression, name="print")
+    printing.count, printing.unit = len(text), "chars"
+    stages.append(printing)
+    return MemoryReport(stages, nodes)
+
+
+def main(args: Sequence[str], out: Optional[TextIO] = None) -> int:
+    """
+    `veda --memory [--engine ENGINE] script`: scan, parse and print the script without
+    running it, and write the memory each stage used.
+    """
+    from .batch import _ArgumentParser
+    from .scanner import Scanner
+    from .session import Session
+
+    parser = _ArgumentParser(
+        prog="veda --memory", description="Report the memory used to scan, parse and print."
+    )
+    parser.add_argument("--engine", choices=Scanner.ENGINES, default="classic")
+    parser.add_argument("script")
+    options = parser.parse_args(args)
+
+    try:
+        with open(options.script, encoding="utf-8", newline="") as f:
+            source = f.read()
+    except (OSError, UnicodeDecodeError) as error:
+        print(f"Cannot read script: {error}", file=sys.stderr)
+        return 66
+    session = Session(out)
+    profile_memory(source, options.engine, session).write(out or sys.stdout)
+    return 65 if session.had_error else 0
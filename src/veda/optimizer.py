@@ -0,0 +1,139 @@
+from __future__ import annotations
+
+import math
+
+from .expr import Binary, Expr, Grouping, Literal, Unary, Variable
+from .interpreter import Interpreter
+from .runtime import NUMBER_TYPES, VedaRuntimeError
+from .token_type import TokenType
+from .walker import fold
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, Tuple
+
+    # (optimized node, static type) of a subexpression.
+    Optimized = Tuple[Expr, str]
+
+# Static result types. A subexpression typed NUMBER either evaluates to a number or raises.
+NUMBER = "number"
+STRING = "string"
+BOOLEAN = "boolean"
+ANY = "any"
+
+
+def _literal_type(value: object) -> str:
+    if type(value) in NUMBER_TYPES:
+        return NUMBER
+    if type(value) is str:
+        return STRING
+    if type(value) is bool:
+        return BOOLEAN
+    return ANY
+
+
+class Optimizer:
+    """
+    Bottom-up simplification of an `Expr` tree:
+
+    - `Grouping` nodes are dropped, since the tree shape already encodes them.
+    - `Unary` / `Binary` nodes over `Literal`s are evaluated with the `Interpreter`'s own
+      semantics and replaced by their value. Nodes that raise (`"a" - 1`) are kept, so the
+      error is still reported at runtime with its operator token.
+    - Identities that hold for every IEEE double are applied when the other operand is
+      statically a number: `x * 1`, `1 * x`, `x / 1`, `x - 0` and `- -x` become `x`.
+      `x + 0` is not, because `-0 + 0` is `0`. Likewise `x + ""` / `"" + x` for strings
+      and `!!x` for booleans.
+    """
+
+    arithmetic = frozenset((TokenType.MINUS, TokenType.SLASH, TokenType.STAR))
+    by_one = frozenset((TokenType.SLASH, TokenType.STAR))
+
+    def __init__(self) -> None:
+        self.interpreter = Interpreter()
+        # id(optimized node) -> static type, for looking through nested unary operators.
+        self.types = dict()  # type: Dict[int, str]
+
+    def optimize(self, expr: Expr) -> Expr:
+        optimized, _ = fold(
+            expr,
+            {
+                Binary: self.optimize_binary,
+                Grouping: self.optimize_grouping,
+                Literal: self.optimize_literal,
+                Unary: self.optimize_unary,
+                Variable: self.optimize_variable,
+            },
+            # A subtree shared by several parents (see `Interner`) is optimized once.
+            dict(),
+        )
+        self.types.clear()
+        return optimized
+
+    def result(self, expr: Expr, type: str) -> Optimized:
+        self.types[id(expr)] = type
+        return expr, type
+
+    def constant(self, expr: Expr, type: str) -> Optimized:
+        try:
+            value = self.interpreter.evaluate(expr)
+        except VedaRuntimeError:
+            return self.result(expr, type)
+        return self.result(Literal(value), _literal_type(value))
+
+    def optimize_literal(self, expr: Literal) -> Optimized:
+        return self.result(expr, _literal_type(expr.value))
+
+    def optimize_variable(self, expr: Variable) -> Optimized:
+        return self.result(expr, ANY)
+
+    def optimize_grouping(self, expr: Grouping, expression: Optimized) -> Optimized:
+        return expression
+
+    def optimize_unary(self, expr: Unary, right: Optimized) -> Optimized:
+        operand, _ = right
+        type = NUMBER if expr.operator.type == TokenType.MINUS else BOOLEAN
+
+        if isinstance(operand, Literal):
+            return self.constant(Unary(expr.operator, operand), type)
+        # `- -x` is `x` for a number, `!!x` is `x` for a boolean.
+        if isinstance(operand, Unary) and operand.operator.type == expr.operator.type:
+            if self.types.get(id(operand.right)) == type:
+                return operand.right, type
+        if operand is not expr.right:
+            expr = Unary(expr.operator, operand)
+        return self.result(expr, type)
+
+    def optimize_binary(self, expr: Binary, left: Optimized, right: Optimized) -> Optimized:
+        (a, a_type), (b, b_type) = left, right
+        _type = expr.operator.type
+        if _type in self.arithmetic:
+            type = NUMBER
+        elif _type == TokenType.PLUS:
+            type = a_type if a_type == b_type and a_type in (NUMBER, STRING) else ANY
+        else:
+            type = BOOLEAN
+
+        node = expr if a is expr.left and b is expr.right else Binary(a, expr.operator, b)
+        if isinstance(a, Literal) and isinstance(b, Literal):
+            return self.constant(node, type)
+
+        if a_type == NUMBER and self.is_literal(b, 1.0) and _type in self.by_one:
+            return a, NUMBER
+        if a_type == NUMBER and self.is_literal(b, 0.0) and _type == TokenType.MINUS:
+            return a, NUMBER
+        if b_type == NUMBER and self.is_literal(a, 1.0) and _type == TokenType.STAR:
+            return b, NUMBER
+        if _type == TokenType.PLUS and a_type == STRING and self.is_literal(b, ""):
+            return a, STRING
+        if _type == TokenType.PLUS and b_type == STRING and self.is_literal(a, ""):
+            return b, STRING
+        return self.result(node, type)
+
+    def is_literal(self, expr: Expr, value: object) -> bool:
+        if not isinstance(expr, Literal) or _literal_type(expr.value) != _literal_type(value):
+            return False
+        if expr.value == 0 and value == 0:
+            # `x - -0` is `x + 0`, which is not `x` for `x = -0`.
+            return math.copysign(1.0, expr.value) == 1.0  # type: ignore
+        return expr.value == value
@@ -0,0 +1,214 @@
+from __future__ import annotations
+
+import hashlib
+import marshal
+import os
+
+from .expr import Binary, Expr, Grouping, Literal, Unary, Variable
+from .token import Token
+from .token_type import TokenType
+from .walker import postorder
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, List, Optional, Union
+
+    from .scanner import Binary as BinarySource
+
+# Bumped whenever the encoding below changes.
+FORMAT_VERSION = 2
+
+# Record kinds of the flattened tree.
+_LITERAL = 0
+_GROUPING = 1
+_UNARY = 2
+_BINARY = 3
+_VARIABLE = 4
+
+_SUFFIX = ".vedac"
+
+
+# The modules that decide what a source parses to, `Veda.__run`'s `TableParser` included: a
+# change to any of them changes every cache key.
+_PARSER_SOURCES = [
+    os.path.join(os.path.dirname(__file__), f"{name}.py")
+    for name in ("scanner", "token_type", "parser", "parse_tables", "table_parser")
+]
+
+
+def _fingerprint() -> bytes:
+    digest = hashlib.sha256(b"veda-parse-cache:%d:" % FORMAT_VERSION)
+    for path in _PARSER_SOURCES:
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.digest()
+
+
+def encode(expr: Expr) -> bytes:
+    """
+    Flatten `expr` in postorder into one list of plain values and `marshal` it. Operator and
+    identifier tokens keep their type, lexeme and line, which is all that diagnostics need.
+    """
+    flat = list()  # type: List[Any]
+    for node in postorder(expr):
+        kind = type(node)
+        if kind is Literal:
+            flat += (_LITERAL, node.value)
+        elif kind is Grouping:
+            flat.append(_GROUPING)
+        elif kind is Variable:
+            name = node.name
+            flat += (_VARIABLE, name.type.value, name.lexeme, name.line)
+        else:
+            operator = node.operator
+            flat += (
+                _UNARY if kind is Unary else _BINARY,
+                operator.type.value,
+                operator.lexeme,
+                operator.line,
+            )
+    return marshal.dumps((FORMAT_VERSION, flat))
+
+
+def decode(data: bytes) -> Expr:
+    """
+    Rebuild the tree written by `encode`. Raises `ValueError` on data it did not write.
+    """
+    try:
+        version, flat = marshal.loads(data)
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Parse cache format {version} is not {FORMAT_VERSION}")
+
+        stack = list()  # type: List[Expr]
+        index = 0
+        while index < len(flat):
+            kind = flat[index]
+            if kind == _LITERAL:
+                stack.append(Literal(flat[index + 1]))
+                index += 2
+            elif kind == _GROUPING:
+                stack.append(Grouping(stack.pop()))
+                index += 1
+            else:
+                token = Token(TokenType(flat[index + 1]), flat[index + 2], None, flat[index + 3])
+                if kind == _VARIABLE:
+                    stack.append(Variable(token))
+                elif kind == _UNARY:
+                    stack.append(Unary(token, stack.pop()))
+                else:
+                    right = stack.pop()
+                    stack.append(Binary(stack.pop(), token, right))
+                index += 4
+        (expr,) = stack
+    except (EOFError, IndexError, TypeError, ValueError) as error:
+        raise ValueError("Corrupt parse cache entry") from error
+    return expr
+
+
+class ParseCache:
+    """
+    Parsed trees on disk, like `__pycache__` for Veda scripts.
+
+    Entries are keyed by the sha256 of the source, of the format version and of the scanner
+    and parser sources, so an edited script or a changed scanner or parser simply misses. Entries are written to a temporary file
+    and renamed into place, so concurrent runs never see a partial entry, and unreadable
+    entries are dropped and treated as misses. Once the directory holds more than `max_size`
+    bytes, the least recently used entries are evicted.
+    """
+
+    def __init__(self, directory: str, max_size: int = 64 * 1024 * 1024) -> None:
+        self.directory = directory
+        self.max_size = max_size
+        self.fingerprint = _fingerprint()
+
+    @classmethod
+    def default(cls) -> Optional["ParseCache"]:
+        """
+        The cache under `$VEDA_CACHE_DIR`, else `$XDG_CACHE_HOME/veda` (`~/.cache/veda`).
+        `None` if `$VEDA_NO_CACHE` is set.
+        """
+        if os.environ.get("VEDA_NO_CACHE"):
+            return None
+        directory = os.environ.get("VEDA_CACHE_DIR")
+        if not directory:
+            base = os.environ.get("XDG_CACHE_HOME") or os.path.join(
+                os.path.expanduser("~"), ".cache"
+            )
+            directory = os.path.join(base, "veda")
+        return cls(directory)
+
+    def path(self, source: Union[str, BinarySource]) -> str:
+        digest = hashlib.sha256(self.fingerprint)
+        # The key of a binary source (see `Scanner`) is that of the same text as a `str`.
+        digest.update(
+            source.encode("utf-8", "surrogatepass") if isinstance(source, str) else source
+        )
+        return os.path.join(self.directory, digest.hexdigest() + _SUFFIX)
+
+    def load(self, source: Union[str, BinarySource]) -> Optional[Expr]:
+        path = self.path(source)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+        except OSError:
+            return None
+        try:
+            expr = decode(data)
+        except ValueError:
+            self.remove(path)
+            return None
+        try:
+            # Recency for eviction.
+            os.utime(path)
+        except OSError:
+            pass
+        return expr
+
+    def store(self, source: Union[str, BinarySource], expr: Expr):
+        """
+        Write the entry for `source`. Failures (read-only or full disk) are ignored: the
+        cache is only ever an optimization.
+        """
+        # Only needed on a miss, and slow to import.
+        import tempfile
+
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            fd, temporary = tempfile.mkstemp(suffix=".tmp", dir=self.directory)
+            try:
+                with os.fdopen(fd, "wb") as f:
+                    f.write(encode(expr))
+                os.replace(temporary, self.path(source))
+            except BaseException:
+                self.remove(temporary)
+                raise
+            self.evict()
+        except OSError:
+            pass
+
+    def evict(self):
+        entries = list()
+        total = 0
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if not entry.name.endswith(_SUFFIX):
+                    continue
+                try:
+                    stat = entry.stat()
+                except OSError:
+                    continue
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+                total += stat.st_size
+
+        entries.sort()
+        for _, size, path in entries:
+            if total <= self.max_size:
+                break
+            self.remove(path)
+            total -= size
+
+    def remove(self, path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
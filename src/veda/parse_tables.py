@@ -0,0 +1,45 @@
+# NOTE: This file is generated by `generate_parser.py` automatically, do not modify it manually
+
+from .token_type import TokenType
+
+# Binding power of each binary operator, higher binds tighter. All are left-associative.
+BINARY = {
+    TokenType.BANG_EQUAL: 1,
+    TokenType.EQUAL_EQUAL: 1,
+    TokenType.GREATER: 2,
+    TokenType.GREATER_EQUAL: 2,
+    TokenType.LESS: 2,
+    TokenType.LESS_EQUAL: 2,
+    TokenType.MINUS: 3,
+    TokenType.PLUS: 3,
+    TokenType.SLASH: 4,
+    TokenType.STAR: 4,
+}
+
+# Prefix operators, which bind tighter than any binary operator.
+PREFIX = frozenset((TokenType.BANG, TokenType.MINUS))
+
+# How each token that is an operand on its own becomes a node.
+LITERAL = 0  # Literal(token.literal)
+VARIABLE = 1  # Variable(token)
+CONSTANT = 2  # Literal(CONSTANTS[token.type])
+
+OPERANDS = {
+    TokenType.NUMBER: LITERAL,
+    TokenType.STRING: LITERAL,
+    TokenType.TRUE: CONSTANT,
+    TokenType.FALSE: CONSTANT,
+    TokenType.NIL: CONSTANT,
+    TokenType.IDENTIFIER: VARIABLE,
+}
+
+CONSTANTS = {
+    TokenType.TRUE: True,
+    TokenType.FALSE: False,
+    TokenType.NIL: None,
+}
+
+# Parenthesized expressions.
+GROUP_OPEN = TokenType.LEFT_PAREN
+GROUP_CLOSE = TokenType.RIGHT_PAREN
+GROUP_CLOSE_MESSAGE = "Expect ')' after expression."
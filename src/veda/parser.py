@@ -1,10 +1,20 @@
-from typing import List
+from __future__ import annotations
 
-from .expr import Binary, Expr, Grouping, Literal, Unary
+from collections import deque
+
+from .expr import Expr
 from .token import Token
 from .token_type import TokenType
 from .veda import Veda
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Deque, Iterable, List, Optional
+
+    from .interner import Interner
+    from .session import Session
+    from .token_buffer import TokenBuffer
+
 
 class Parser:
     """
@@ -16,12 +26,21 @@ class Parser:
     unary          → ( "!" | "-" ) unary
                    | primary ;
     primary        → NUMBER | STRING | "true" | "false" | "nil"
-                   | "(" expression ")" ;
+                   | "(" expression ")" | IDENTIFIER ;
     """
 
-    def __init__(self, tokens: List[Token]) -> None:
+    def __init__(
+        self,
+        tokens: List[Token],
+        interner: Optional[Interner] = None,
+        reporter: Optional[Session] = None,
+    ) -> None:
         self.tokens = tokens
         self.current = 0
+        # Node factory: the node classes themselves, or an `Interner` sharing equal subtrees.
+        self.nodes = interner if interner is not None else Expr  # type: Any
+        # Where diagnostics go: a `Session`, or the class-level one of `Veda`.
+        self.reporter = reporter if reporter is not None else Veda  # type: Any
 
     def match(self, *types: TokenType):
         for type in types:
@@ -58,7 +77,7 @@ class Parser:
         while self.match(TokenType.BANG_EQUAL, TokenType.EQUAL_EQUAL):
             operator = self.previous()
             right = self.comparison()
-            expr = Binary(expr, operator, right)
+            expr = self.nodes.Binary(expr, operator, right)
 
         return expr
 
@@ -70,7 +89,7 @@ class Parser:
         ):
             operator = self.previous()
             right = self.term()
-            expr = Binary(expr, operator, right)
+            expr = self.nodes.Binary(expr, operator, right)
 
         return expr
 
@@ -80,7 +99,7 @@ class Parser:
         while self.match(TokenType.MINUS, TokenType.PLUS):
             operator = self.previous()
             right = self.factor()
-            expr = Binary(expr, operator, right)
+            expr = self.nodes.Binary(expr, operator, right)
 
         return expr
 
@@ -90,7 +109,7 @@ class Parser:
         while self.match(TokenType.SLASH, TokenType.STAR):
             operator = self.previous()
             right = self.unary()
-            expr = Binary(expr, operator, right)
+            expr = self.nodes.Binary(expr, operator, right)
 
         return expr
 
@@ -98,25 +117,28 @@ class Parser:
         if self.match(TokenType.BANG, TokenType.MINUS):
             operator = self.previous()
             right = self.unary()
-            return Unary(operator, right)
+            return self.nodes.Unary(operator, right)
 
         return self.primary()
 
     def primary(self) -> Expr:
         if self.match(TokenType.FALSE):
-            return Literal(False)
+            return self.nodes.Literal(False)
         if self.match(TokenType.TRUE):
-            return Literal(True)
+            return self.nodes.Literal(True)
         if self.match(TokenType.NIL):
-            return Literal(None)
+            return self.nodes.Literal(None)
 
         if self.match(TokenType.NUMBER, TokenType.STRING):
-            return Literal(self.previous().literal)
+            return self.nodes.Literal(self.previous().literal)
 
         if self.match(TokenType.LEFT_PAREN):
             expr = self.expression()
             self.consume(TokenType.RIGHT_PAREN, "Expect ')' after expression.")
-            return Grouping(expr)
+            return self.nodes.Grouping(expr)
+
+        if self.match(TokenType.IDENTIFIER):
+            return self.nodes.Variable(self.previous())
 
         raise self.error(self.peek(), "Expect expression.")
 
@@ -130,7 +152,7 @@ class Parser:
         ...
 
     def error(self, token: Token, message: str):
-        Veda.error_token(token, message)
+        self.reporter.error_token(token, message)
         return self.ParserError()
 
     def synchronize(self):
@@ -165,3 +187,102 @@ class Parser:
             return self.expression()
         except self.ParserError:
             return None
+
+    def parse_all(self) -> List[Expr]:
+        """
+        Parse every `;`-separated expression up to EOF with panic-mode recovery: after a
+        syntax error, `synchronize` skips to the next expression and parsing carries on, so a
+        single pass reports every error. Returns the expressions that parsed.
+        """
+        expressions = list()  # type: List[Expr]
+        while not self.is_at_end():
+            try:
+                expression = self.expression()
+                if not self.is_at_end() and not self.match(TokenType.SEMICOLON):
+                    raise self.error(self.peek(), "Expect end of expression.")
+                expressions.append(expression)
+            except self.ParserError:
+                self.synchronize()
+        return expressions
+
+
+class StreamParser(Parser):
+    """
+    A `Parser` that pulls tokens from an iterator (e.g. `Scanner.iter_tokens()`) through a
+    small lookahead buffer instead of indexing a fully materialized token list, so scanning
+    and parsing run in one pass and only a constant number of tokens is alive at a time.
+    """
+
+    def __init__(
+        self,
+        tokens: Iterable[Token],
+        interner: Optional[Interner] = None,
+        reporter: Optional[Session] = None,
+    ) -> None:
+        super().__init__([], interner, reporter)
+        self.stream = iter(tokens)
+        self.lookahead = deque()  # type: Deque[Token]
+        self.last = None  # type: Optional[Token]
+
+    def peek_at(self, distance: int) -> Token:
+        while len(self.lookahead) <= distance:
+            token = next(self.stream, None)
+            if token is None:
+                # A well-formed stream ends with EOF; keep returning it once exhausted.
+                tail = self.lookahead[-1] if self.lookahead else self.last
+                line = tail.line if tail else 1
+                token = Token(TokenType.EOF, "", None, line)
+                self.stream = iter(())
+            self.lookahead.append(token)
+        return self.lookahead[distance]
+
+    def peek(self):
+        if self.lookahead:
+            return self.lookahead[0]
+        return self.peek_at(0)
+
+    def previous(self):
+        return self.last
+
+    def advance(self):
+        if not self.is_at_end():
+            self.last = self.lookahead.popleft()
+            self.current += 1
+        return self.previous()
+
+
+class BufferParser(Parser):
+    """
+    A `Parser` over a `TokenBuffer`: token kinds are tested against the buffer's code column
+    directly, and `TokenView`s are only created for the tokens that end up in the tree or in
+    a diagnostic.
+    """
+
+    EOF_CODE = TokenType.EOF.value
+
+    def __init__(
+        self,
+        buffer: TokenBuffer,
+        interner: Optional[Interner] = None,
+        reporter: Optional[Session] = None,
+    ) -> None:
+        super().__init__(buffer, interner, reporter)  # type: ignore
+        self.kinds = buffer.kinds
+
+    def match(self, *types: TokenType):
+        kind = self.kinds[self.current]
+        if kind == self.EOF_CODE:
+            return False
+        for type in types:
+            if kind == type.value:
+                self.current += 1
+                return True
+
+        return False
+
+    def is_at_end(self):
+        return self.kinds[self.current] == self.EOF_CODE
+
+    def check(self, type: TokenType):
+        kind = self.kinds[self.current]
+        return kind != self.EOF_CODE and kind == type.value
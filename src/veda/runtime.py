@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+import math
+
+from .token import Token
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Mapping
+
+# `bool` is a subclass of `int`, so numbers are checked by exact type.
+NUMBER_TYPES = frozenset((float, int))
+
+
+class VedaRuntimeError(RuntimeError):
+    def __init__(self, token: Token, message: str) -> None:
+        super().__init__(message)
+        self.token = token
+
+
+def is_truthy(value: object) -> bool:
+    if value is None:
+        return False
+    if type(value) is bool:
+        return value
+    return True
+
+
+def is_equal(a: object, b: object) -> bool:
+    # `1 == true` is false in Veda, unlike in Python.
+    if type(a) is bool or type(b) is bool:
+        return a is b
+    return a == b
+
+
+def divide(a: float, b: float) -> float:
+    """
+    IEEE 754 division: dividing by zero gives an infinity or NaN instead of raising.
+    """
+    if b:
+        return a / b
+    if a == 0 or a != a:
+        return math.nan
+    return math.copysign(math.inf, a) * math.copysign(1.0, b)
+
+
+def lookup(variables: Mapping[str, object], name: Token) -> object:
+    try:
+        return variables[name.lexeme]
+    except KeyError:
+        raise VedaRuntimeError(name, f"Undefined variable '{name.lexeme}'.") from None
+
+
+def stringify(value: object) -> str:
+    if value is None:
+        return "nil"
+    if type(value) is bool:
+        return "true" if value else "false"
+    if type(value) in NUMBER_TYPES:
+        text = str(value)
+        if text.endswith(".0"):
+            text = text[:-2]
+        return text
+    return str(value)
@@ -1,11 +1,105 @@
-from typing import List
+from __future__ import annotations
+
+from functools import lru_cache
 
 from .token import Token
 from .token_type import TokenType
 from .veda import Veda
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    import mmap
+    import re
+    from typing import Any, Iterator, List, Optional, TextIO, Tuple, Union
+
+    from .session import Session
+    from .symbols import SymbolTable
+    from .token_buffer import TokenBuffer
+
+    Binary = Union[bytes, bytearray, memoryview, mmap.mmap]
+
+# Master pattern for the "regex" engine. Every alternative consumes a whole lexeme (or a
+# whole run of blanks / a whole comment) in one step, and the final catch-all guarantees
+# that `finditer` walks the source without gaps.
+_TOKEN_REGEX = r"""
+    (?P<blank>[ \r\t\n]+)
+  | (?P<identifier>[A-Za-z_][A-Za-z_0-9]*)
+  | (?P<number>[0-9]+(?:\.[0-9]+)?)
+  | (?P<operator>[!=<>]=?|[(){},.\-+;*]|/(?!/))
+  | (?P<comment>//[^\n]*)
+  | (?P<string>"[^"]*")
+  | (?P<unterminated>"[^"]*)
+  | (?P<unexpected>.)
+    """
+
+# `Match.lastindex` values of the groups above, compared as ints in the hot loop.
+_BLANK, _IDENTIFIER, _NUMBER, _OPERATOR, _COMMENT, _STRING, _UNTERMINATED = range(1, 8)
+
+# On bytes, a non-ASCII character is one whole UTF-8 sequence, so that it is reported once.
+_UNEXPECTED_BYTES = r"(?P<unexpected>[\xc0-\xff][\x80-\xbf]*|.)"
+
+
+@lru_cache(maxsize=None)
+def _token_pattern() -> re.Pattern[str]:
+    # Compiled on first use, so that the classic engine never imports `re`.
+    import re
+
+    return re.compile(_TOKEN_REGEX, re.VERBOSE | re.DOTALL)
+
+
+@lru_cache(maxsize=None)
+def _bytes_token_pattern() -> re.Pattern[bytes]:
+    import re
+
+    regex = _TOKEN_REGEX.replace("(?P<unexpected>.)", _UNEXPECTED_BYTES)
+    return re.compile(regex.encode(), re.VERBOSE | re.DOTALL)
+
+
+def is_binary(source: object) -> bool:
+    """
+    Whether `source` is UTF-8 bytes the scanner reads directly: `bytes`, `bytearray`,
+    `memoryview` or `mmap`.
+    """
+    import mmap
+
+    return isinstance(source, (bytes, bytearray, memoryview, mmap.mmap))
+
+
+def _is_utf8(data: bytes) -> bool:
+    if data.isascii():
+        return True
+    try:
+        data.decode("utf-8")
+    except UnicodeDecodeError:
+        return False
+    return True
+
 
 class Scanner:
+    ENGINES = ("classic", "regex")
+
+    operators = {
+        "(": TokenType.LEFT_PAREN,
+        ")": TokenType.RIGHT_PAREN,
+        "{": TokenType.LEFT_BRACE,
+        "}": TokenType.RIGHT_BRACE,
+        ",": TokenType.COMMA,
+        ".": TokenType.DOT,
+        "-": TokenType.MINUS,
+        "+": TokenType.PLUS,
+        ";": TokenType.SEMICOLON,
+        "/": TokenType.SLASH,
+        "*": TokenType.STAR,
+        "!": TokenType.BANG,
+        "!=": TokenType.BANG_EQUAL,
+        "=": TokenType.EQUAL,
+        "==": TokenType.EQUAL_EQUAL,
+        ">": TokenType.GREATER,
+        ">=": TokenType.GREATER_EQUAL,
+        "<": TokenType.LESS,
+        "<=": TokenType.LESS_EQUAL,
+    }
+
     keywords = {
         "and": TokenType.AND,
         "class": TokenType.CLASS,
@@ -25,14 +119,30 @@ class Scanner:
         "while": TokenType.WHILE,
     }
 
-    def __init__(self, source: str):
+    def __init__(
+        self,
+        source: Union[str, TextIO, Binary],
+        engine: str = "classic",
+        reporter: Optional[Session] = None,
+        symbols: Optional[SymbolTable] = None,
+    ):
+        if engine not in self.ENGINES:
+            raise ValueError(f"Unknown scanner engine: {engine!r}, expected one of {self.ENGINES}")
         self.source = source
+        self.engine = engine
+        # Where diagnostics go: a `Session`, or the class-level one of `Veda`.
+        self.reporter = reporter if reporter is not None else Veda  # type: Any
+        # Interns identifiers when set, see `symbol_token`.
+        self.symbols = symbols
         self.start = 0
         self.current = 0
         self.line = 1
         self.tokens = list()  # type: List[Token]
 
     def scan_tokens(self):
+        if self.engine == "regex" or not isinstance(self.source, str):
+            return self.scan_tokens_regex()
+
         while not self.is_at_end():
             self.start = self.current
             self.scan_token()
@@ -40,6 +150,213 @@ class Scanner:
         self.tokens.append(Token(TokenType.EOF, "", None, self.line))
         return self.tokens
 
+    def scan_tokens_regex(self):
+        """
+        Same tokens and diagnostics as the classic engine, but each identifier, number,
+        string, comment and blank run is consumed by a single match of `_token_pattern()`.
+        """
+        if isinstance(self.source, str):
+            self.tokens.extend(self.match_tokens(self.source, final=True))
+            self.tokens.append(Token(TokenType.EOF, "", None, self.line))
+        elif is_binary(self.source):
+            self.tokens.extend(self.match_bytes(self.source))
+            self.tokens.append(Token(TokenType.EOF, "", None, self.line))
+        else:
+            self.tokens.extend(self.iter_tokens())
+        return self.tokens
+
+    def match_bytes(self, data: Binary) -> Iterator[Token]:
+        """
+        `match_tokens` on UTF-8 bytes, e.g. an `mmap`'d script, without decoding it first.
+        Operator and keyword lexemes are shared constants; only identifiers, numbers and
+        string literals are decoded, one token at a time. Offsets are byte offsets. A string
+        that is not valid UTF-8 is reported and left out.
+        """
+        operators = {lexeme.encode(): (lexeme, type) for lexeme, type in self.operators.items()}
+        keywords = self.keywords
+        symbols = self.symbols
+        line = self.line
+
+        for m in _bytes_token_pattern().finditer(data):
+            kind = m.lastindex
+            if kind == _BLANK:
+                line += m.group().count(b"\n")
+            elif kind == _IDENTIFIER:
+                lexeme = m.group().decode("ascii")
+                if symbols is None:
+                    yield Token(keywords.get(lexeme, TokenType.IDENTIFIER), lexeme, None, line)
+                else:
+                    yield self.symbol_token(lexeme, line)
+            elif kind == _NUMBER:
+                lexeme = m.group()
+                yield Token(TokenType.NUMBER, lexeme.decode("ascii"), float(lexeme), line)
+            elif kind == _OPERATOR:
+                lexeme, type = operators[m.group()]
+                yield Token(type, lexeme, None, line)
+            elif kind == _COMMENT:
+                continue
+            elif kind == _STRING:
+                try:
+                    lexeme = m.group().decode("utf-8")
+                except UnicodeDecodeError:
+                    line += m.group().count(b"\n")
+                    self.reporter.error(line, "Invalid UTF-8 in string.")
+                    continue
+                line += lexeme.count("\n")
+                yield Token(TokenType.STRING, lexeme, lexeme[1:-1], line)
+            elif kind == _UNTERMINATED:
+                line += m.group().count(b"\n")
+                self.reporter.error(line, "Unterminated string.")
+            else:
+                self.reporter.error(line, "Unexpected character.")
+
+        self.start = self.current = len(data)
+        self.line = line
+
+    def scan_buffer(self) -> TokenBuffer:
+        """
+        Scan into a columnar `TokenBuffer` instead of a list of `Token` objects. Diagnostics
+        are the same as `scan_tokens`; lexemes and literals are left in the source. A binary
+        source (see `is_binary`) stays undecoded, with byte offsets, and the buffer decodes
+        the lexemes that are accessed; strings are checked to be valid UTF-8 here, as in
+        `match_bytes`, so that decoding them later cannot fail.
+
+        Lines are not counted while scanning: the buffer's `LineTable` finds them from the
+        offsets, here only for diagnostics, which are also given their column.
+        """
+        if not isinstance(self.source, str) and not is_binary(self.source):
+            self.source = self.source.read()
+        from .token_buffer import TokenBuffer
+
+        source = self.source
+        buffer = TokenBuffer(source)
+        append = buffer.append
+        operators = self.operators  # type: Any
+        keywords = self.keywords  # type: Any
+        pattern = _token_pattern()  # type: Any
+        if not isinstance(source, str):
+            operators = {lexeme.encode(): type for lexeme, type in operators.items()}
+            keywords = {lexeme.encode(): type for lexeme, type in keywords.items()}
+            pattern = _bytes_token_pattern()
+        text = isinstance(source, str)
+        symbols = self.symbols
+
+        for m in pattern.finditer(source):
+            kind = m.lastindex
+            if kind == _BLANK:
+                continue
+            elif kind == _IDENTIFIER:
+                if symbols is None:
+                    type = keywords.get(m.group(), TokenType.IDENTIFIER)
+                else:
+                    lexeme = m.group()
+                    id = symbols.lookup(lexeme if text else lexeme.decode("ascii"))
+                    type = symbols.types[id]
+                    if type == TokenType.IDENTIFIER:
+                        buffer.symbols[len(buffer)] = id
+                append(type, m.start(), m.end())
+            elif kind == _NUMBER:
+                append(TokenType.NUMBER, m.start(), m.end())
+            elif kind == _OPERATOR:
+                append(operators[m.group()], m.start(), m.end())
+            elif kind == _COMMENT:
+                continue
+            elif kind == _STRING:
+                if not text and not _is_utf8(m.group()):
+                    line, column = buffer.lines.position(m.end() - 1)
+                    self.reporter.error(line, "Invalid UTF-8 in string.", column)
+                    continue
+                append(TokenType.STRING, m.start(), m.end())
+            elif kind == _UNTERMINATED:
+                line, column = buffer.lines.position(m.end())
+                self.reporter.error(line, "Unterminated string.", column)
+            else:
+                line, column = buffer.lines.position(m.start())
+                self.reporter.error(line, "Unexpected character.", column)
+
+        self.start = self.current = len(source)
+        append(TokenType.EOF, len(source), len(source))
+        return buffer
+
+    def iter_tokens(self, chunk_size: int = 1 << 16) -> Iterator[Token]:
+        """
+        Yield tokens on demand, ending with EOF. The source may be a `str` or a text stream
+        with a `read(size)` method; streams are consumed `chunk_size` characters at a time so
+        only the unscanned tail of the current chunk is held in memory.
+        """
+        if isinstance(self.source, str):
+            yield from self.match_tokens(self.source, final=True)
+        else:
+            buffer = ""
+            final = False
+            while not final:
+                chunk = self.source.read(chunk_size)
+                final = not chunk
+                buffer += chunk
+                yield from self.match_tokens(buffer, final)
+                buffer = buffer[self.current :]
+
+        yield Token(TokenType.EOF, "", None, self.line)
+
+    def match_tokens(self, text: str, final: bool) -> Iterator[Token]:
+        """
+        Scan `text` with `_token_pattern()`, leaving `self.current` at the first character that
+        was not consumed. Unless `final`, a match that reaches the last two characters of
+        `text` is left unconsumed, because more input could still extend it (`1` → `1.5`,
+        `/` → `//`, an open string).
+        """
+        for token, _, _ in self.match_spans(text, 0, final):
+            yield token
+
+    def match_spans(self, text: str, pos: int, final: bool) -> Iterator[Tuple[Token, int, int]]:
+        """
+        Like `match_tokens`, but starts at offset `pos` (with `self.line` being the line at
+        `pos`) and yields each token together with its start and end offsets in `text`.
+        """
+        operators = self.operators
+        keywords = self.keywords
+        symbols = self.symbols
+        line = self.line
+        limit = len(text) if final else len(text) - 2
+        self.current = len(text)
+
+        for m in _token_pattern().finditer(text, pos):
+            start, end = m.span()
+            if end > limit:
+                self.current = start
+                break
+            kind = m.lastindex
+            if kind == _BLANK:
+                line += text.count("\n", start, end)
+            elif kind == _IDENTIFIER:
+                lexeme = m.group()
+                if symbols is None:
+                    yield Token(
+                        keywords.get(lexeme, TokenType.IDENTIFIER), lexeme, None, line
+                    ), start, end
+                else:
+                    yield self.symbol_token(lexeme, line), start, end
+            elif kind == _NUMBER:
+                lexeme = m.group()
+                yield Token(TokenType.NUMBER, lexeme, float(lexeme), line), start, end
+            elif kind == _OPERATOR:
+                lexeme = m.group()
+                yield Token(operators[lexeme], lexeme, None, line), start, end
+            elif kind == _COMMENT:
+                continue
+            elif kind == _STRING:
+                lexeme = m.group()
+                line += lexeme.count("\n")
+                yield Token(TokenType.STRING, lexeme, lexeme[1:-1], line), start, end
+            elif kind == _UNTERMINATED:
+                line += text.count("\n", start, end)
+                self.reporter.error(line, "Unterminated string.")
+            else:
+                self.reporter.error(line, "Unexpected character.")
+
+        self.line = line
+        self.start = self.current
+
     def scan_token(self):
         c = self.advance()
         if c == "(":
@@ -89,15 +406,29 @@ class Scanner:
             elif self.is_alpha(c):
                 self.identifier()
             else:
-                Veda.error(self.line, "Unexpected character.")
+                self.reporter.error(self.line, "Unexpected character.")
 
     def identifier(self):
         while self.is_alpha_numeric(self.peek()):
             self.advance()
 
         text = self.source[self.start : self.current]
-        type = self.keywords.get(text, TokenType.IDENTIFIER)
-        self.add_token(type)
+        if self.symbols is None:
+            self.add_token(self.keywords.get(text, TokenType.IDENTIFIER))
+        else:
+            self.tokens.append(self.symbol_token(text, self.line))
+
+    def symbol_token(self, text: str, line: int) -> Token:
+        """
+        The token of keyword or identifier `text`, looked up in `self.symbols`: identifiers
+        share the table's name object and carry their symbol id in `Token.symbol`.
+        """
+        symbols = self.symbols  # type: Any
+        id = symbols.lookup(text)
+        type = symbols.types[id]
+        if type == TokenType.IDENTIFIER:
+            return Token(type, symbols.names[id], None, line, id)
+        return Token(type, symbols.names[id], None, line)
 
     def number(self):
         while self.is_digit(self.peek()):
@@ -117,7 +448,7 @@ class Scanner:
             self.advance()
 
         if self.is_at_end():
-            Veda.error(self.line, "Unterminated string.")
+            self.reporter.error(self.line, "Unterminated string.")
             return
 
         self.advance()
@@ -0,0 +1,370 @@
+import asyncio
+import json
+import os
+import sys
+import threading
+from concurrent.futures import Executor
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence
+
+from .ast_printer import AstPrinter
+from .chunk import Chunk
+from .compiler import Compiler
+from .expr import Expr
+from .optimizer import Optimizer
+from .runtime import VedaRuntimeError, stringify
+from .scanner import Scanner
+from .session import CollectingSession
+from .table_parser import BufferTableParser
+from .token_buffer import TokenBuffer
+from .vm import VM
+
+# JSON-RPC 2.0 error codes, and the one LSP uses for cancelled requests.
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+REQUEST_CANCELLED = -32800
+
+
+class RpcError(Exception):
+    def __init__(self, code: int, message: str) -> None:
+        super().__init__(message)
+        self.code = code
+        self.message = message
+
+
+async def read_message(reader: asyncio.StreamReader) -> Optional[bytes]:
+    """
+    Read the body of one `Content-Length` framed message, as in the Language Server
+    Protocol. Returns `None` at the end of input; raises `ValueError` on a malformed header.
+    """
+    length = None
+    while True:
+        line = await reader.readline()
+        if not line:
+            return None
+        line = line.strip()
+        if not line:
+            break
+        name, _, value = line.partition(b":")
+        if name.strip().lower() == b"content-length":
+            length = int(value)
+    if length is None:
+        raise ValueError("Message without Content-Length header")
+    try:
+        return await reader.readexactly(length)
+    except asyncio.IncompleteReadError:
+        return None
+
+
+def encode_message(message: Mapping[str, Any]) -> bytes:
+    body = json.dumps(message, separators=(",", ":")).encode()
+    return b"Content-Length: %d\r\n\r\n%s" % (len(body), body)
+
+
+def _tokens(buffer: TokenBuffer) -> List[Dict[str, object]]:
+    return [
+        {
+            "type": token.type.name,
+            "lexeme": token.lexeme,
+            "literal": token.literal,
+            "symbol": token.symbol,
+            "line": token.line,
+            "start": token.start,
+            "end": token.end,
+        }
+        for token in buffer
+    ]
+
+
+def _variables(params: Mapping[str, Any]) -> Dict[str, object]:
+    variables = params.get("variables") or dict()
+    if not isinstance(variables, dict):
+        raise RpcError(INVALID_PARAMS, "'variables' must be an object")
+    # Veda numbers are floats; JSON integers are not.
+    return {
+        name: float(value) if isinstance(value, int) and not isinstance(value, bool) else value
+        for name, value in variables.items()
+    }
+
+
+class Analysis:
+    """
+    Tokens, tree and diagnostics of one source, computed once and shared by every request on
+    the same document version. The tokens are a `TokenBuffer`, so they carry their offsets;
+    the bytecode is compiled on the first `evaluate`.
+    """
+
+    def __init__(self, source: str) -> None:
+        session = CollectingSession()
+        self.tokens = Scanner(source, reporter=session, symbols=session.symbols).scan_buffer()
+        expression = BufferTableParser(self.tokens, reporter=session).parse()
+        self.expression = None if session.had_error else expression  # type: Optional[Expr]
+        self.diagnostics = session.diagnostics
+        self.chunk = None  # type: Optional[Chunk]
+
+    def evaluate(self, variables: Mapping[str, object]) -> Dict[str, object]:
+        if self.expression is None:
+            return {"value": None, "diagnostics": self.diagnostics}
+        session = CollectingSession()
+        if self.chunk is None:
+            compiler = Compiler(reporter=session)
+            self.chunk = compiler.compile(Optimizer().optimize(self.expression))
+            if self.chunk is None:
+                self.expression = None
+                self.diagnostics = session.diagnostics
+                return {"value": None, "diagnostics": self.diagnostics}
+        try:
+            value = VM(variables, reporter=session).run(self.chunk)
+        except VedaRuntimeError as error:
+            session.runtime_error(error)
+            return {"value": None, "diagnostics": session.diagnostics}
+        return {"value": stringify(value), "diagnostics": []}
+
+
+class _Document:
+    __slots__ = ("text", "version", "analysis")
+
+    def __init__(self, text: str) -> None:
+        self.text = text
+        self.version = 0
+        self.analysis = None  # type: Optional[asyncio.Future[Analysis]]
+
+
+class Server:
+    """
+    JSON-RPC 2.0 server for Veda tooling, so that one warm process answers many requests.
+
+    Notifications (no `id`): `open` `{uri, text}`, `change` `{uri, text}` or `{uri, offset,
+    deleted, inserted}`, `close` `{uri}`, `$/cancelRequest` `{id}` and `exit`.
+    Requests take `{uri}` of an open document or `{text}`: `scan` returns the tokens with
+    their line and offsets, `parse` whether it parses, `print` the `AstPrinter` text and
+    `evaluate` (with optional `variables`) the value as Veda prints it. All of them also
+    return `diagnostics`, as `{line, column, where, message}` objects (runtime errors have no
+    `column`); `shutdown` returns `null`.
+
+    Requests run concurrently: each is a task, and scanning, parsing and evaluating run on
+    `executor` threads, each with its own `Session`. The analysis of an open document is
+    computed once per version and shared by all requests on it, and each request is answered
+    from the version current when it arrived. A cancelled request is answered with error
+    `-32800` right away.
+    """
+
+    def __init__(self, write: Callable[[bytes], None], executor: Optional[Executor] = None):
+        self.write = write
+        self.executor = executor
+        self.documents = dict()  # type: Dict[str, _Document]
+        self.tasks = dict()  # type: Dict[Any, asyncio.Task]
+        self.running = True
+        self.requests = {
+            "scan": self.scan,
+            "parse": self.parse,
+            "print": self.print,
+            "evaluate": self.evaluate,
+            "shutdown": self.shutdown,
+        }  # type: Dict[str, Callable[[Dict[str, Any], Awaitable[Analysis]], Awaitable[object]]]
+        self.notifications = {
+            "open": self.open,
+            "change": self.change,
+            "close": self.close,
+            "$/cancelRequest": self.cancel,
+            "exit": self.exit,
+        }  # type: Dict[str, Callable[[Dict[str, Any]], None]]
+
+    async def serve(self, reader: asyncio.StreamReader):
+        """
+        Answer messages from `reader` until `exit` or the end of input, then wait for the
+        requests still running.
+        """
+        while self.running:
+            try:
+                body = await read_message(reader)
+            except ValueError:
+                break
+            if body is None:
+                break
+            self.dispatch(body)
+        if self.tasks:
+            await asyncio.gather(*self.tasks.values(), return_exceptions=True)
+
+    def dispatch(self, body: bytes):
+        try:
+            message = json.loads(body)
+        except ValueError:
+            self.send_error(None, PARSE_ERROR, "Invalid JSON")
+            return
+        if not isinstance(message, dict) or not isinstance(message.get("method"), str):
+            id = message.get("id") if isinstance(message, dict) else None
+            self.send_error(id, INVALID_REQUEST, "Invalid request")
+            return
+        method = message["method"]
+        params = message.get("params")
+        if params is None:
+            params = dict()
+
+        if "id" not in message:
+            notification = self.notifications.get(method)
+            if notification is not None and isinstance(params, dict):
+                try:
+                    notification(params)
+                except (RpcError, KeyError, TypeError, ValueError):
+                    # Notifications have no response to carry the error.
+                    pass
+            return
+
+        id = message["id"]
+        handler = self.requests.get(method)
+        if handler is None:
+            self.send_error(id, METHOD_NOT_FOUND, f"Unknown method {method!r}")
+            return
+        if not isinstance(params, dict):
+            self.send_error(id, INVALID_PARAMS, "'params' must be an object")
+            return
+        try:
+            analysis = None if method == "shutdown" else self.analysis(params)
+        except RpcError as error:
+            self.send_error(id, error.code, error.message)
+            return
+        task = asyncio.ensure_future(self.respond(id, handler, params, analysis))
+        self.tasks[id] = task
+        task.add_done_callback(lambda task: self.finished(id, task))
+
+    async def respond(self, id: Any, handler: Callable[..., Awaitable[object]], params, analysis):
+        try:
+            result = await handler(params, analysis)
+        except RpcError as error:
+            self.send_error(id, error.code, error.message)
+        except Exception as error:
+            self.send_error(id, INTERNAL_ERROR, f"{type(error).__name__}: {error}")
+        else:
+            self.send({"jsonrpc": "2.0", "id": id, "result": result})
+
+    def finished(self, id: Any, task: asyncio.Task):
+        if self.tasks.get(id) is task:
+            del self.tasks[id]
+        # Also covers tasks cancelled before they started running.
+        if task.cancelled():
+            self.send_error(id, REQUEST_CANCELLED, "Request cancelled")
+
+    def send(self, message: Mapping[str, Any]):
+        self.write(encode_message(message))
+
+    def send_error(self, id: Any, code: int, message: str):
+        self.send({"jsonrpc": "2.0", "id": id, "error": {"code": code, "message": message}})
+
+    def run(self, function: Callable[..., Any], *args: Any) -> Awaitable[Any]:
+        return asyncio.get_running_loop().run_in_executor(self.executor, function, *args)
+
+    def analysis(self, params: Dict[str, Any]) -> Awaitable[Analysis]:
+        """
+        The analysis a request is answered from, taken when the request arrives so that later
+        changes to its document do not affect it.
+        """
+        uri = params.get("uri")
+        if uri is None:
+            text = params.get("text")
+            if not isinstance(text, str):
+                raise RpcError(INVALID_PARAMS, "Expected 'uri' or 'text'")
+            return self.run(Analysis, text)
+
+        document = self.documents.get(uri)
+        if document is None:
+            raise RpcError(INVALID_PARAMS, f"Document {uri!r} is not open")
+        if document.analysis is None:
+            document.analysis = asyncio.ensure_future(self.run(Analysis, document.text))
+        # Shared with other requests, so cancelling this one must not cancel it.
+        return asyncio.shield(document.analysis)
+
+    async def scan(self, params: Dict[str, Any], analysis: Awaitable[Analysis]) -> object:
+        analysis = await analysis
+        return {"tokens": _tokens(analysis.tokens), "diagnostics": analysis.diagnostics}
+
+    async def parse(self, params: Dict[str, Any], analysis: Awaitable[Analysis]) -> object:
+        analysis = await analysis
+        return {"valid": analysis.expression is not None, "diagnostics": analysis.diagnostics}
+
+    async def print(self, params: Dict[str, Any], analysis: Awaitable[Analysis]) -> object:
+        analysis = await analysis
+        text = None
+        if analysis.expression is not None:
+            text = await self.run(AstPrinter().print, analysis.expression)
+        return {"text": text, "diagnostics": analysis.diagnostics}
+
+    async def evaluate(self, params: Dict[str, Any], analysis: Awaitable[Analysis]) -> object:
+        variables = _variables(params)
+        return await self.run((await analysis).evaluate, variables)
+
+    async def shutdown(self, params: Dict[str, Any], analysis: None) -> object:
+        return None
+
+    def open(self, params: Dict[str, Any]):
+        text = params["text"]
+        if not isinstance(text, str):
+            raise TypeError("'text' must be a string")
+        self.documents[params["uri"]] = _Document(text)
+
+    def change(self, params: Dict[str, Any]):
+        document = self.documents[params["uri"]]
+        if "text" in params:
+            text = params["text"]
+        else:
+            offset, deleted = int(params["offset"]), int(params["deleted"])
+            if not (0 <= offset and 0 <= deleted and offset + deleted <= len(document.text)):
+                raise ValueError(f"Edit ({offset}, {deleted}) is out of range")
+            text = document.text[:offset] + params["inserted"] + document.text[offset + deleted :]
+        if not isinstance(text, str):
+            raise TypeError("'text' must be a string")
+        document.text = text
+        document.version += 1
+        document.analysis = None
+
+    def close(self, params: Dict[str, Any]):
+        self.documents.pop(params["uri"], None)
+
+    def cancel(self, params: Dict[str, Any]):
+        task = self.tasks.get(params["id"])
+        if task is not None:
+            task.cancel()
+
+    def exit(self, params: Dict[str, Any]):
+        self.running = False
+
+
+async def serve_stdio():
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    stdin = sys.stdin.fileno()
+    stdout = sys.stdout.buffer
+
+    def pump():
+        # A thread rather than `connect_read_pipe`, which cannot read regular files. It reads
+        # the descriptor, as the lock of `sys.stdin` could still be held at exit.
+        try:
+            while True:
+                chunk = os.read(stdin, 1 << 16)
+                if not chunk:
+                    break
+                loop.call_soon_threadsafe(reader.feed_data, chunk)
+            loop.call_soon_threadsafe(reader.feed_eof)
+        except RuntimeError:
+            # The loop is already closed.
+            pass
+
+    def write(data: bytes):
+        stdout.write(data)
+        stdout.flush()
+
+    threading.Thread(target=pump, daemon=True).start()
+    await Server(write).serve(reader)
+
+
+def main(args: Sequence[str]) -> int:
+    """
+    `veda serve`: run a `Server` on stdin and stdout.
+    """
+    if args:
+        print("Usage: veda serve", file=sys.stderr)
+        return 64
+    asyncio.run(serve_stdio())
+    return 0
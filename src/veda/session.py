@@ -0,0 +1,95 @@
+from __future__ import annotations
+
+from .symbols import SymbolTable
+from .token import Token
+from .token_type import TokenType
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, List, Optional, TextIO, Tuple, Union
+
+    from .expr import Expr
+    from .runtime import VedaRuntimeError
+    from .token_buffer import TokenView
+
+
+class Session:
+    """
+    Error state and diagnostics of one unit of work, such as checking or running one
+    source. `Scanner`, `Parser`, `Interpreter` and `VM` report into the session passed as
+    their `reporter`, so independent sources can be scanned, parsed and run from many
+    threads at once, each with its own session.
+
+    Diagnostics are printed to `out`, or to `sys.stdout` at the time of the report if it is
+    `None`, with their line only: the column of those reported from a `TokenBuffer` is left
+    out. Identifiers scanned by `scan` and `parse` are interned in the session's `symbols`.
+    `Veda` is the session every component uses by default, kept at class level.
+    """
+
+    def __init__(self, out: Optional[TextIO] = None) -> None:
+        self.out = out
+        self.had_error = False
+        self.had_runtime_error = False
+        self.symbols = SymbolTable()
+
+    def error(self, line: int, message: str, column: Optional[int] = None):
+        self.report(line, "", message, column)
+
+    def error_token(self, token: Union[Token, TokenView], message: str):
+        # Only the `TokenView`s of a `TokenBuffer` know their column.
+        if isinstance(token, Token):
+            line, column = token.line, None  # type: Tuple[int, Optional[int]]
+        else:
+            line, column = token.position
+        if token.type == TokenType.EOF:
+            self.report(line, " at end", message, column)
+        else:
+            self.report(line, f"at '{token.lexeme}'", message, column)
+
+    def report(self, line: int, where: str, message: str, column: Optional[int] = None):
+        print(f"[line: {line}] Error {where}: {message}", file=self.out)
+        self.had_error = True
+
+    def runtime_error(self, error: VedaRuntimeError):
+        print(f"{error}\n[line {error.token.line}]", file=self.out)
+        self.had_runtime_error = True
+
+    def scan(self, source: str) -> List[Token]:
+        from .scanner import Scanner
+
+        return Scanner(source, reporter=self, symbols=self.symbols).scan_tokens()
+
+    def parse(self, source: str) -> Optional[Expr]:
+        """
+        Scan and parse `source`, `None` if it has syntax errors. Nesting is not limited by
+        the Python stack, as for `veda run`.
+        """
+        from .table_parser import TableParser
+
+        expression = TableParser(self.scan(source), reporter=self).parse()
+        return None if self.had_error else expression
+
+
+class CollectingSession(Session):
+    """
+    A `Session` that keeps its diagnostics in `diagnostics`, as `{"line", "where",
+    "message"}` dicts, instead of printing them, with a `"column"` too when it is known.
+    Runtime errors have an empty `where`.
+    """
+
+    def __init__(self) -> None:
+        super().__init__()
+        self.diagnostics = list()  # type: List[Dict[str, object]]
+
+    def report(self, line: int, where: str, message: str, column: Optional[int] = None):
+        diagnostic = {"line": line}  # type: Dict[str, object]
+        if column is not None:
+            diagnostic["column"] = column
+        diagnostic["where"] = where.strip()
+        diagnostic["message"] = message
+        self.diagnostics.append(diagnostic)
+        self.had_error = True
+
+    def runtime_error(self, error: VedaRuntimeError):
+        self.diagnostics.append({"line": error.token.line, "where": "", "message": str(error)})
+        self.had_runtime_error = True
@@ -0,0 +1,219 @@
+from __future__ import annotations
+
+import os
+import sys
+import time
+
+from .walker import postorder
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, List, Optional, Sequence, TextIO, Tuple
+
+# Phases of `Veda.__run`, in the order they run.
+PHASES = ["load", "scan", "parse", "optimize", "compile", "run"]
+
+PROFILE_FORMATS = ["pstats", "collapsed"]
+
+
+def _count_nodes(expr: Any) -> int:
+    return 0 if expr is None else sum(1 for _ in postorder(expr))
+
+
+def _count_bytes(chunk: Any) -> int:
+    return len(chunk.code)
+
+
+# What each phase counts in its result, and the unit it counts in.
+_COUNTERS = {
+    "load": ("nodes", _count_nodes),
+    "scan": ("tokens", len),
+    "parse": ("nodes", _count_nodes),
+    "optimize": ("nodes", _count_nodes),
+    "compile": ("bytes", _count_bytes),
+    "run": ("bytes", _count_bytes),
+}  # type: Dict[str, Tuple[str, Callable[[Any], int]]]
+
+
+class Phase:
+    """
+    One timed phase. The code inside `with stats.phase(name) as phase:` stores what the
+    phase produced in `phase.result`; it is counted once the clock has stopped.
+    """
+
+    __slots__ = ("name", "seconds", "count", "unit", "result")
+
+    def __init__(self, name: str) -> None:
+        self.name = name
+        self.seconds = 0.0
+        self.count = 0
+        self.unit = _COUNTERS[name][0]
+        self.result = None  # type: Any
+
+    @property
+    def throughput(self) -> float:
+        return self.count / self.seconds if self.seconds else 0.0
+
+
+class _Timer:
+    __slots__ = ("stats", "phase", "start")
+
+    def __init__(self, stats: Stats, phase: Phase) -> None:
+        self.stats = stats
+        self.phase = phase
+
+    def __enter__(self) -> Phase:
+        if self.phase.name == self.stats.profile:
+            self.stats.profiler.enable()
+        self.start = time.perf_counter()
+        return self.phase
+
+    def __exit__(self, *exc_info: object):
+        phase = self.phase
+        phase.seconds = time.perf_counter() - self.start
+        if phase.name == self.stats.profile:
+            self.stats.profiler.disable()
+        if exc_info[0] is None:
+            phase.count = _COUNTERS[phase.name][1](phase.result)
+        # Keeping the tree alive would hold on to every run's memory.
+        phase.result = None
+        self.stats.phases.append(phase)
+
+
+class StackProfiler:
+    """
+    Deterministic profiler that records the wall time spent in every distinct call stack,
+    written out as collapsed stacks (`frame;frame;frame microseconds`, one stack per line),
+    the input format of flame graph tools.
+    """
+
+    def __init__(self) -> None:
+        self.stacks = dict()  # type: Dict[str, int]
+        self.paths = list()  # type: List[str]
+        self.last = 0
+
+    def enable(self):
+        self.paths.clear()
+        self.last = time.perf_counter_ns()
+        sys.setprofile(self.__event)
+
+    def disable(self):
+        sys.setprofile(None)
+
+    def __event(self, frame: Any, event: str, arg: Any):
+        now = time.perf_counter_ns()
+        paths = self.paths
+        if paths:
+            path = paths[-1]
+            self.stacks[path] = self.stacks.get(path, 0) + now - self.last
+        if event == "call":
+            code = frame.f_code
+            name = f"{code.co_name} ({os.path.basename(code.co_filename)})"
+            paths.append(f"{paths[-1]};{name}" if paths else name)
+        elif event == "c_call":
+            name = getattr(arg, "__qualname__", None) or getattr(arg, "__name__", "?")
+            paths.append(f"{paths[-1]};{name}" if paths else name)
+        elif paths:
+            paths.pop()
+        self.last = time.perf_counter_ns()
+
+    def write(self, file: TextIO):
+        for path, nanoseconds in sorted(self.stacks.items()):
+            if nanoseconds >= 1000:
+                file.write(f"{path} {nanoseconds // 1000}\n")
+
+
+class Stats:
+    """
+    Wall time, size and throughput of each phase of `Veda.__run`: tokens for the scanner,
+    tree nodes for the parse cache, parser and optimizer, and bytecode bytes for the
+    compiler and the VM. Runs append to `phases`, so one `Stats` can add up many runs.
+
+    `profile` names one phase to run under a profiler: cProfile for the `pstats` format,
+    `StackProfiler` for `collapsed`. `report` writes the profile to `profile_output`, or
+    after the table if there is none.
+    """
+
+    def __init__(
+        self,
+        profile: Optional[str] = None,
+        profile_format: str = "pstats",
+        profile_output: Optional[str] = None,
+    ) -> None:
+        if profile is not None and profile not in PHASES:
+            raise ValueError(f"Unknown phase {profile!r}, expected one of {', '.join(PHASES)}")
+        if profile_format not in PROFILE_FORMATS:
+            raise ValueError(f"Unknown profile format {profile_format!r}")
+        self.phases = list()  # type: List[Phase]
+        self.profile = profile
+        self.profile_format = profile_format
+        self.profile_output = profile_output
+        self.profiler = None  # type: Any
+        if profile is not None:
+            if profile_format == "pstats":
+                import cProfile
+
+                self.profiler = cProfile.Profile()
+            else:
+                self.profiler = StackProfiler()
+
+    def phase(self, name: str) -> _Timer:
+        return _Timer(self, Phase(name))
+
+    def totals(self) -> List[Phase]:
+        """
+        One phase per name, in `PHASES` order, adding up every run.
+        """
+        totals = dict()  # type: Dict[str, Phase]
+        for phase in self.phases:
+            total = totals.get(phase.name)
+            if total is None:
+                total = totals[phase.name] = Phase(phase.name)
+            total.seconds += phase.seconds
+            total.count += phase.count
+        return [totals[name] for name in PHASES if name in totals]
+
+    def report(self, file: TextIO):
+        file.write(f"{'phase':10} {'time (ms)':>12} {'count':>20} {'throughput':>24}\n")
+        for phase in self.totals():
+            file.write(
+                f"{phase.name:10} {phase.seconds * 1000:12.3f} "
+                f"{f'{phase.count:,} {phase.unit}':>20} "
+                f"{f'{phase.throughput:,.0f} {phase.unit}/s':>24}\n"
+            )
+        if self.profiler is not None:
+            self.write_profile(file)
+
+    def write_profile(self, file: TextIO):
+        if not any(phase.name == self.profile for phase in self.phases):
+            file.write(f"Phase {self.profile} did not run, nothing was profiled.\n")
+            return
+        if self.profile_format == "pstats":
+            if self.profile_output:
+                self.profiler.dump_stats(self.profile_output)
+                return
+            import pstats
+
+            pstats.Stats(self.profiler, stream=file).sort_stats("cumulative").print_stats(25)
+        elif self.profile_output:
+            with open(self.profile_output, "w") as f:
+                self.profiler.write(f)
+        else:
+            self.profiler.write(file)
+
+
+def parse_args(args: Sequence[str]) -> Tuple[Stats, List[str]]:
+    """
+    Take the `--stats` / `--profile` options out of the command line, returning the `Stats`
+    they ask for and the remaining arguments.
+    """
+    from .batch import _ArgumentParser
+
+    parser = _ArgumentParser(prog="veda", add_help=False)
+    parser.add_argument("--stats", action="store_true")
+    parser.add_argument("--profile", choices=PHASES)
+    parser.add_argument("--profile-format", choices=PROFILE_FORMATS, default="pstats")
+    parser.add_argument("--profile-output")
+    options, rest = parser.parse_known_args(args)
+    stats = Stats(options.profile, options.profile_format, options.profile_output)
+    return stats, rest
@@ -0,0 +1,49 @@
+from __future__ import annotations
+
+from .token_type import TokenType
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, List, Mapping, Optional
+
+
+class SymbolTable:
+    """
+    The distinct identifiers of a session, each stored once and numbered densely in order of
+    first appearance, so later stages can index lists by id instead of hashing names.
+
+    The keywords are entered first, with their token type in `types`, so the scanner tells a
+    keyword from an identifier and finds the identifier's id with a single dict lookup.
+    A `Scanner` given a table makes identifier tokens share the table's name object as their
+    lexeme and carry their id as their `symbol`.
+    """
+
+    def __init__(self, keywords: Optional[Mapping[str, TokenType]] = None) -> None:
+        if keywords is None:
+            from .scanner import Scanner
+
+            keywords = Scanner.keywords
+        self.ids = dict()  # type: Dict[str, int]
+        self.names = list()  # type: List[str]
+        self.types = list()  # type: List[TokenType]
+        for name, type in keywords.items():
+            self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.types.append(type)
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.ids
+
+    def lookup(self, name: str) -> int:
+        """
+        The id of `name`, entering it as a new identifier if it is not in the table yet.
+        """
+        id = self.ids.get(name)
+        if id is None:
+            id = self.ids[name] = len(self.names)
+            self.names.append(name)
+            self.types.append(TokenType.IDENTIFIER)
+        return id
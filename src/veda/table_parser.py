@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from .parse_tables import (
+    BINARY,
+    CONSTANT,
+    CONSTANTS,
+    GROUP_CLOSE,
+    GROUP_CLOSE_MESSAGE,
+    GROUP_OPEN,
+    LITERAL,
+    OPERANDS,
+    PREFIX,
+)
+from .parser import BufferParser, Parser
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import List, Tuple
+
+    from .expr import Expr
+    from .token import Token
+
+# Kinds of pending operator frames.
+_BINARY = 0
+_PREFIX = 1
+_GROUP = 2
+
+
+class TableParser(Parser):
+    """
+    Operator-precedence engine driven by the tables `generate_parser.py` derives from the
+    grammar in `Parser`'s docstring, producing the same trees and diagnostics as `Parser`.
+
+    Pending operators live on an explicit stack of `(kind, token, binding power)` frames and
+    their left operands on a second stack, so any nesting depth parses in constant Python
+    stack. Each operand is reduced with the prefix operators in front of it, then with every
+    pending binary operator that binds at least as tightly as the next one.
+    """
+
+    def expression(self) -> Expr:
+        tokens = self.tokens
+        nodes = self.nodes
+        operands = list()  # type: List[Expr]
+        frames = list()  # type: List[Tuple[int, Token, int]]
+
+        while True:
+            # An operand, after any prefix operators and opening parentheses.
+            token = tokens[self.current]
+            type = token.type
+            while type in PREFIX or type == GROUP_OPEN:
+                frames.append((_PREFIX if type in PREFIX else _GROUP, token, 0))
+                self.current += 1
+                token = tokens[self.current]
+                type = token.type
+
+            action = OPERANDS.get(type)
+            if action is None:
+                raise self.error(token, "Expect expression.")
+            self.current += 1
+            if action == LITERAL:
+                expr = nodes.Literal(token.literal)
+            elif action == CONSTANT:
+                expr = nodes.Literal(CONSTANTS[type])
+            else:
+                expr = nodes.Variable(token)
+
+            # Reduce, until the next token is a binary operator to shift.
+            while True:
+                while frames and frames[-1][0] == _PREFIX:
+                    expr = nodes.Unary(frames.pop()[1], expr)
+
+                token = tokens[self.current]
+                power = BINARY.get(token.type, 0)
+                while frames and frames[-1][0] == _BINARY and frames[-1][2] >= power:
+                    expr = nodes.Binary(operands.pop(), frames.pop()[1], expr)
+
+                if power:
+                    break
+                if not frames:
+                    return expr
+                # Only an open group is left on top.
+                if token.type != GROUP_CLOSE:
+                    raise self.error(token, GROUP_CLOSE_MESSAGE)
+                self.current += 1
+                frames.pop()
+                expr = nodes.Grouping(expr)
+
+            operands.append(expr)
+            frames.append((_BINARY, token, power))
+            self.current += 1
+
+
+class BufferTableParser(TableParser, BufferParser):
+    """
+    A `TableParser` over a `TokenBuffer`, as `BufferParser` is a `Parser` over one: any
+    nesting depth, and diagnostics at the line and column of their `TokenView`.
+    """
@@ -1,19 +1,49 @@
-from typing import Optional
+from __future__ import annotations
 
 from .token_type import TokenType
 
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Optional
+
 
 class Token:
+    __slots__ = ("type", "lexeme", "literal", "line", "symbol")
+
     type: TokenType
     lexeme: str
     literal: object
     line: int
+    # The symbol id of an identifier scanned with a `SymbolTable`, else `None`. Ids are local
+    # to a table, and follow from `lexeme` within one, so equality leaves them out.
+    symbol: Optional[int]
 
-    def __init__(self, type: TokenType, lexeme: str, literal: Optional[object], line: int) -> None:
+    def __init__(
+        self,
+        type: TokenType,
+        lexeme: str,
+        literal: Optional[object],
+        line: int,
+        symbol: Optional[int] = None,
+    ) -> None:
         self.type = type
         self.lexeme = lexeme
         self.literal = literal
         self.line = line
+        self.symbol = symbol
+
+    def __eq__(self, other: object) -> bool:
+        if not isinstance(other, Token):
+            return NotImplemented
+        return (
+            self.type == other.type
+            and self.lexeme == other.lexeme
+            and self.literal == other.literal
+            and self.line == other.line
+        )
+
+    def __hash__(self) -> int:
+        return hash((self.type, self.lexeme, self.line))
 
     def __str__(self) -> str:
         return f"<{self.type:21}, {self.lexeme}, {self.literal}>"
@@ -0,0 +1,164 @@
+from __future__ import annotations
+
+from array import array
+
+from .lines import LineTable
+from .token_type import TokenType
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Dict, Iterator, Optional, Tuple, Union
+
+    from .scanner import Binary
+
+# `TokenType` indexed by its value, so a kind code maps back to its enum in one lookup.
+_TYPES = (None,) + tuple(sorted(TokenType, key=lambda t: t.value))
+
+
+class TokenBuffer:
+    """
+    Columnar token store: kind codes (`TokenType.value`) and start and end offsets into the
+    source live in parallel `array("i")` columns, i.e. 12 bytes per token. Lexemes are sliced
+    from the source only when accessed, and NUMBER / STRING literals are decoded from their
+    lexeme on first access and kept in the `literals` side table. The symbol ids of
+    identifiers scanned with a `SymbolTable` are in the `symbols` side table.
+
+    Lines are not stored per token: `lines`, the `LineTable` of the source, is built on first
+    use and gives the line and column of a token by binary search. A token's line is the one
+    it ends on, as for `Token`s, where a multi-line string has the line of its closing quote.
+
+    The source may also be UTF-8 bytes (`Scanner.scan_buffer` of a binary source), with byte
+    offsets; lexemes and string literals are then decoded as they are accessed.
+    """
+
+    def __init__(self, source: Union[str, Binary]) -> None:
+        self.source = source
+        self.text = isinstance(source, str)
+        self.kinds = array("i")
+        self.starts = array("i")
+        self.ends = array("i")
+        self.literals = dict()  # type: Dict[int, object]
+        self.symbols = dict()  # type: Dict[int, int]
+        self.line_table = None  # type: Optional[LineTable]
+
+    @property
+    def lines(self) -> LineTable:
+        if self.line_table is None:
+            self.line_table = LineTable(self.source)
+        return self.line_table
+
+    def append(self, type: TokenType, start: int, end: int):
+        self.kinds.append(type.value)
+        self.starts.append(start)
+        self.ends.append(end)
+
+    def __len__(self) -> int:
+        return len(self.kinds)
+
+    def __getitem__(self, index: int) -> "TokenView":
+        if index < 0:
+            index += len(self.kinds)
+        if not 0 <= index < len(self.kinds):
+            raise IndexError("token index out of range")
+        return TokenView(self, index)
+
+    def __iter__(self) -> Iterator["TokenView"]:
+        for index in range(len(self.kinds)):
+            yield TokenView(self, index)
+
+    def type_at(self, index: int) -> TokenType:
+        return _TYPES[self.kinds[index]]  # type: ignore
+
+    def lexeme_at(self, index: int) -> str:
+        lexeme = self.source[self.starts[index] : self.ends[index]]
+        return lexeme if self.text else str(lexeme, "utf-8")  # type: ignore
+
+    def line_at(self, index: int) -> int:
+        return self.lines.line(self.ends[index])
+
+    def column_at(self, index: int) -> int:
+        return self.lines.column(self.starts[index])
+
+    def position_at(self, index: int) -> Tuple[int, int]:
+        """
+        Where diagnostics put a token: on its line, as `line_at`, at the column of its first
+        character, or at column 1 for a string that starts on an earlier line.
+        """
+        line = self.line_at(index)
+        start, column = self.lines.position(self.starts[index])
+        return line, column if start == line else 1
+
+    def literal_at(self, index: int) -> object:
+        kind = self.kinds[index]
+        if kind == TokenType.NUMBER.value:
+            literal = self.literals.get(index)
+            if literal is None:
+                literal = self.literals[index] = float(self.lexeme_at(index))
+            return literal
+        if kind == TokenType.STRING.value:
+            literal = self.literals.get(index)
+            if literal is None:
+                literal = self.source[self.starts[index] + 1 : self.ends[index] - 1]
+                if not self.text:
+                    literal = str(literal, "utf-8")
+                self.literals[index] = literal
+            return literal
+        return None
+
+    def symbol_at(self, index: int) -> Optional[int]:
+        return self.symbols.get(index)
+
+
+class TokenView:
+    """
+    A lightweight, read-only `Token` look-alike pointing at one row of a `TokenBuffer`.
+    """
+
+    __slots__ = ("buffer", "index")
+
+    def __init__(self, buffer: TokenBuffer, index: int) -> None:
+        self.buffer = buffer
+        self.index = index
+
+    @property
+    def type(self) -> TokenType:
+        return self.buffer.type_at(self.index)
+
+    @property
+    def lexeme(self) -> str:
+        return self.buffer.lexeme_at(self.index)
+
+    @property
+    def literal(self) -> object:
+        return self.buffer.literal_at(self.index)
+
+    @property
+    def line(self) -> int:
+        return self.buffer.line_at(self.index)
+
+    @property
+    def symbol(self) -> Optional[int]:
+        return self.buffer.symbol_at(self.index)
+
+    @property
+    def column(self) -> int:
+        # Of the first character, so for a multi-line string on an earlier line than `line`.
+        return self.buffer.column_at(self.index)
+
+    @property
+    def position(self) -> Tuple[int, int]:
+        return self.buffer.position_at(self.index)
+
+    @property
+    def start(self) -> int:
+        return self.buffer.starts[self.index]
+
+    @property
+    def end(self) -> int:
+        return self.buffer.ends[self.index]
+
+    def __str__(self) -> str:
+        return f"<{self.type:21}, {self.lexeme}, {self.literal}>"
+
+    def __repr__(self) -> str:
+        return str(self)
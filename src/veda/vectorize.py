@@ -0,0 +1,164 @@
+from typing import Any, Callable, Dict, List, Mapping, Optional
+
+import numpy as np
+
+from .expr import Binary, Expr, Grouping, Literal, Unary, Variable
+from .interpreter import Interpreter
+from .runtime import NUMBER_TYPES, VedaRuntimeError
+from .token_type import TokenType
+from .walker import fold
+
+# Operand kinds. A `NUMBER` value is a Python number or a float64 array, a `BOOLEAN` one a
+# `bool` or a bool array; everything else (strings, nil, object arrays) is `OTHER`.
+NUMBER = "number"
+BOOLEAN = "boolean"
+OTHER = "other"
+
+_ARITHMETIC = {
+    TokenType.MINUS: np.subtract,
+    TokenType.STAR: np.multiply,
+    TokenType.SLASH: np.divide,
+}  # type: Dict[TokenType, Callable[..., Any]]
+
+_COMPARISONS = {
+    TokenType.GREATER: np.greater,
+    TokenType.GREATER_EQUAL: np.greater_equal,
+    TokenType.LESS: np.less,
+    TokenType.LESS_EQUAL: np.less_equal,
+}  # type: Dict[TokenType, Callable[..., Any]]
+
+
+def _kind(value: object) -> str:
+    if isinstance(value, np.ndarray):
+        if value.dtype == np.float64:
+            return NUMBER
+        if value.dtype == np.bool_:
+            return BOOLEAN
+        return OTHER
+    if type(value) in NUMBER_TYPES:
+        return NUMBER
+    if type(value) is bool:
+        return BOOLEAN
+    return OTHER
+
+
+def _column(values: Any) -> np.ndarray:
+    """
+    Numbers become float64 and booleans stay bool; anything else is kept as Python objects.
+    """
+    array = np.asarray(values)
+    if array.dtype == np.bool_:
+        return array
+    # NumPy makes `True` 1.0 in a list that also holds numbers, where Veda keeps it a bool.
+    if array.dtype.kind in "iuf" and (
+        isinstance(values, np.ndarray) or bool not in set(map(type, values))
+    ):
+        return array.astype(np.float64, copy=False)
+    # A list mixing numbers and strings would otherwise become an array of strings.
+    return np.array(list(values), dtype=object)
+
+
+def _narrow(values: List[object]) -> np.ndarray:
+    types = set(map(type, values))
+    if types and types <= NUMBER_TYPES:
+        return np.array(values, dtype=np.float64)
+    if types == {bool}:
+        return np.array(values, dtype=np.bool_)
+    array = np.empty(len(values), dtype=object)
+    array[:] = values
+    return array
+
+
+class VectorEvaluator:
+    """
+    Evaluates one `Expr` over whole columns of inputs at once: identifiers bind to the
+    equally long columns in `columns`, and the result is one value per row.
+
+    The tree is walked once, and each operator applied to all rows with a NumPy ufunc when
+    both operands are numbers (or, for `==`, `!=` and `!`, booleans). Other operands, such
+    as strings for `+`, fall back to the `Interpreter`'s scalar semantics row by row, and
+    the result is narrowed back to a numeric array when it allows. Results match evaluating
+    each row on its own, except that a type error is reported for the first failing
+    operator rather than for the first failing row.
+    """
+
+    def __init__(self, columns: Mapping[str, Any], size: Optional[int] = None) -> None:
+        self.columns = {name: _column(values) for name, values in columns.items()}
+        sizes = {len(column) for column in self.columns.values()}
+        if size is not None:
+            sizes.add(size)
+        if len(sizes) > 1:
+            raise ValueError(f"Columns have different lengths: {sorted(sizes)}")
+        self.size = sizes.pop() if sizes else 1
+        self.interpreter = Interpreter()
+        self.handlers = {
+            Binary: self.binary,
+            Grouping: lambda expr, expression: expression,
+            Literal: lambda expr: expr.value,
+            Unary: self.unary,
+            Variable: self.variable,
+        }
+
+    def evaluate(self, expr: Expr) -> np.ndarray:
+        with np.errstate(divide="ignore", invalid="ignore", over="ignore"):
+            value = fold(expr, self.handlers, dict())
+        if isinstance(value, np.ndarray):
+            return value
+        return _narrow([value] * self.size)
+
+    def variable(self, expr: Variable) -> object:
+        column = self.columns.get(expr.name.lexeme)
+        if column is None:
+            raise VedaRuntimeError(expr.name, f"Undefined variable '{expr.name.lexeme}'.")
+        return column
+
+    def rows(self, function: Callable[..., object], *operands: object) -> object:
+        """
+        Apply the scalar `function` row by row.
+        """
+        columns = [
+            operand.tolist() if isinstance(operand, np.ndarray) else [operand] * self.size
+            for operand in operands
+        ]
+        return _narrow([function(*row) for row in zip(*columns)])
+
+    def unary(self, expr: Unary, right: object) -> object:
+        operator = expr.operator
+        kind = _kind(right)
+        if not isinstance(right, np.ndarray):
+            return self.interpreter.unary(operator, right)
+        if operator.type == TokenType.MINUS and kind == NUMBER:
+            return np.negative(right)
+        if operator.type == TokenType.BANG and kind == BOOLEAN:
+            return np.logical_not(right)
+        if operator.type == TokenType.BANG and kind == NUMBER:
+            # Every number is truthy.
+            return np.zeros(self.size, dtype=np.bool_)
+        return self.rows(lambda value: self.interpreter.unary(operator, value), right)
+
+    def binary(self, expr: Binary, left: object, right: object) -> object:
+        operator = expr.operator
+        _type = operator.type
+        a, b = _kind(left), _kind(right)
+        if not isinstance(left, np.ndarray) and not isinstance(right, np.ndarray):
+            return self.interpreter.binary(operator, left, right)
+
+        if a == NUMBER and b == NUMBER:
+            if _type == TokenType.PLUS:
+                return np.add(left, right)
+            if _type in _ARITHMETIC:
+                return _ARITHMETIC[_type](left, right)
+            if _type in _COMPARISONS:
+                return _COMPARISONS[_type](left, right)
+        if _type in (TokenType.EQUAL_EQUAL, TokenType.BANG_EQUAL) and OTHER not in (a, b):
+            # Numbers and booleans are never equal to each other.
+            equal = np.equal(left, right) if a == b else np.zeros(self.size, dtype=np.bool_)
+            return equal if _type == TokenType.EQUAL_EQUAL else np.logical_not(equal)
+        return self.rows(lambda x, y: self.interpreter.binary(operator, x, y), left, right)
+
+
+def evaluate_columns(expr: Expr, columns: Mapping[str, Any], size: Optional[int] = None):
+    """
+    Evaluate `expr` once per row of `columns`, returning a NumPy array of the results.
+    """
+    return VectorEvaluator(columns, size).evaluate(expr)
@@ -1,46 +1,143 @@
+from __future__ import annotations
+
+import os
 import sys
-from typing import List
 
-from .ast_printer import AstPrinter
-from .token import Token
-from .token_type import TokenType
+from .session import Session
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, List, Optional, Union
+
+    from .parse_cache import ParseCache
+    from .scanner import Binary
+    from .stats import Stats
+    from .token import Token
+
+
+# Shorter sources are parsed faster than the parse cache can hash them, once the cost of
+# importing `hashlib` is counted, so they skip it.
+CACHE_MIN_SIZE = 4096
+
+# Longer scripts are mapped into memory and scanned as bytes, instead of being read and
+# decoded into a `str` first.
+MMAP_MIN_SIZE = 1 << 20
+
+
+class _Disabled:
+    """
+    The phase context of `_DISABLED`, shared by every phase: entering it costs one call.
+    """
+
+    __slots__ = ("result",)
+
+    def __enter__(self) -> _Disabled:
+        return self
+
+    def __exit__(self, *exc_info: object):
+        self.result = None
+
+
+class _NoStats:
+    __slots__ = ()
+
+    _disabled = _Disabled()
+
+    def phase(self, name: str) -> _Disabled:
+        return self._disabled
+
+
+# What `Veda` runs with when no statistics are collected, so that `stats` is only imported by
+# `--stats` and `--profile`.
+_DISABLED = _NoStats()
 
 
 class Veda:
     had_error = False
+    had_runtime_error = False
+
+    def __init__(self, stats: Optional["Stats"] = None) -> None:
+        # Filled in by every run when set, see `Stats`.
+        self.stats = stats
 
     def main(self, *args: str):
-        if len(args) > 1:
-            print("Usage: veda [script]")
-            sys.exit(64)
-        elif len(args) == 1:
+        if args and args[0] == "--memory":
+            from .memory import main
+
+            sys.exit(main(args[1:]))
+        if any(arg.startswith(("--stats", "--profile")) for arg in args):
+            from .stats import parse_args
+
+            self.stats, rest = parse_args(args)
+            if len(rest) != 1 or rest[0].startswith("-") or os.path.isdir(rest[0]):
+                print("Usage: veda --stats [--profile PHASE] script", file=sys.stderr)
+                sys.exit(64)
+            args = tuple(rest)
+        if args and args[0] == "check":
+            from .check import main
+
+            sys.exit(main(args[1:]))
+        if args and args[0] == "serve":
+            from .server import main
+
+            sys.exit(main(args[1:]))
+        if len(args) == 1 and not args[0].startswith("-") and not os.path.isdir(args[0]):
             self.__run_file(args[0])
+        elif args:
+            from .batch import main
+
+            sys.exit(main(args))
         else:
             self.__run_prompt()
 
-    @classmethod
-    def error(cls, line: int, message: str):
-        cls.report(line, "", message)
+    # The class-level session: diagnostics go to stdout at the time of the report.
+    out = None
+    error = classmethod(Session.error)
+    error_token = classmethod(Session.error_token)
+    report = classmethod(Session.report)
+    runtime_error = classmethod(Session.runtime_error)
 
-    @classmethod
-    def error_token(cls, token: Token, message: str):
-        if token.type == TokenType.EOF:
-            cls.report(token.line, " at end", message)
-        else:
-            cls.report(token.line, f"at '{token.lexeme}'", message)
+    def __run_file(self, path: str):
+        try:
+            status = self.run_file(path)
+        finally:
+            if self.stats is not None:
+                self.stats.report(sys.stderr)
+        if status:
+            sys.exit(status)
 
-    @classmethod
-    def report(cls, line: int, where: str, message: str):
-        print(f"[line: {line}] Error {where}: {message}")
-        cls.had_error = True
+    def run_file(self, path: str) -> int:
+        """
+        Run the script at `path` and return its exit status: 65 if it does not scan or parse,
+        70 if it fails at runtime, else 0. Mapped or read, a script is UTF-8 with its line
+        endings left as they are, so it runs the same whatever its size.
+        """
+        size = os.path.getsize(path)
+        if size and size >= MMAP_MIN_SIZE:
+            import mmap
 
-    def __run_file(self, path: str):
-        _file = None
-        with open(path) as f:
-            _file = f.read()
-        self.__run(_file)
+            with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                self.__run(data, self.__cache(len(data)))
+        else:
+            _file = None
+            with open(path, encoding="utf-8", newline="") as f:
+                _file = f.read()
+            self.__run(_file, self.__cache(len(_file)))
         if self.had_error:
-            sys.exit(65)
+            return 65
+        if self.had_runtime_error:
+            return 70
+        return 0
+
+    def __cache(self, size: int) -> Optional["ParseCache"]:
+        if size < CACHE_MIN_SIZE:
+            return None
+        if self.stats is not None and self.stats.profile in ("scan", "parse"):
+            # A cache hit would skip the profiled phase.
+            return None
+        from .parse_cache import ParseCache
+
+        return ParseCache.default()
 
     def __run_prompt(self):
         while True:
@@ -51,15 +148,37 @@ class Veda:
             self.__run(line)
             self.had_error = False
 
-    def __run(self, source: str):
-        from .parser import Parser
+    def __run(self, source: Union[str, "Binary"], cache: Optional["ParseCache"] = None):
+        from .compiler import Compiler
+        from .optimizer import Optimizer
         from .scanner import Scanner
+        from .table_parser import TableParser
+        from .vm import VM
 
-        tokens = Scanner(source).scan_tokens()  # type: List[Token]
+        stats = self.stats or _DISABLED  # type: Any
+        expression = None
+        if cache is not None:
+            with stats.phase("load") as phase:
+                expression = phase.result = cache.load(source)
+        if expression is None:
+            with stats.phase("scan") as phase:
+                tokens = phase.result = Scanner(source).scan_tokens()  # type: List[Token]
 
-        expression = Parser(tokens).parse()
-        if self.had_error:
-            return
-        if not expression:
+            with stats.phase("parse") as phase:
+                expression = phase.result = TableParser(tokens).parse()
+            if self.had_error:
+                return
+            if not expression:
+                return
+            if cache is not None:
+                # Only clean parses are cached, so diagnostics are reported on every run.
+                cache.store(source, expression)
+        with stats.phase("optimize") as phase:
+            expression = phase.result = Optimizer().optimize(expression)
+        with stats.phase("compile") as phase:
+            chunk = phase.result = Compiler().compile(expression)
+        if chunk is None:
             return
-        print(AstPrinter().print(expression))
+        with stats.phase("run") as phase:
+            phase.result = chunk
+            VM().interpret(chunk)
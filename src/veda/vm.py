@@ -0,0 +1,135 @@
+from __future__ import annotations
+
+from .chunk import Chunk, OpCode
+from .runtime import NUMBER_TYPES, VedaRuntimeError, divide, is_equal, is_truthy, stringify
+from .veda import Veda
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Mapping, Optional
+
+    from .session import Session
+
+CONSTANT = OpCode.CONSTANT
+CONSTANT_LONG = OpCode.CONSTANT_LONG
+NIL = OpCode.NIL
+TRUE = OpCode.TRUE
+FALSE = OpCode.FALSE
+NEGATE = OpCode.NEGATE
+NOT = OpCode.NOT
+ADD = OpCode.ADD
+SUBTRACT = OpCode.SUBTRACT
+MULTIPLY = OpCode.MULTIPLY
+DIVIDE = OpCode.DIVIDE
+EQUAL = OpCode.EQUAL
+NOT_EQUAL = OpCode.NOT_EQUAL
+GREATER = OpCode.GREATER
+GREATER_EQUAL = OpCode.GREATER_EQUAL
+LESS = OpCode.LESS
+LESS_EQUAL = OpCode.LESS_EQUAL
+RETURN = OpCode.RETURN
+GET_VARIABLE = OpCode.GET_VARIABLE
+
+
+class VM:
+    """
+    Stack-based virtual machine executing a `Chunk`, in the spirit of clox: one loop, one
+    opcode per iteration, operands on a plain list used as the value stack. Identifiers
+    are looked up in `variables`.
+    """
+
+    def __init__(
+        self,
+        variables: Optional[Mapping[str, object]] = None,
+        reporter: Optional[Session] = None,
+    ) -> None:
+        self.variables = variables if variables is not None else dict()
+        self.reporter = reporter if reporter is not None else Veda  # type: Any
+
+    def interpret(self, chunk: Chunk):
+        try:
+            print(stringify(self.run(chunk)))
+        except VedaRuntimeError as error:
+            self.reporter.runtime_error(error)
+
+    def run(self, chunk: Chunk) -> object:
+        code = chunk.code
+        constants = chunk.constants
+        numbers = NUMBER_TYPES
+        stack = []  # type: list
+        push = stack.append
+        pop = stack.pop
+        ip = 0
+
+        while True:
+            op = code[ip]
+            ip += 1
+            if op == CONSTANT:
+                push(constants[code[ip]])
+                ip += 1
+            elif op <= DIVIDE and op >= ADD:
+                b = pop()
+                a = stack[-1]
+                if type(a) in numbers and type(b) in numbers:
+                    if op == ADD:
+                        stack[-1] = a + b
+                    elif op == SUBTRACT:
+                        stack[-1] = a - b
+                    elif op == MULTIPLY:
+                        stack[-1] = a * b
+                    else:
+                        stack[-1] = divide(a, b)
+                elif op == ADD and type(a) is str and type(b) is str:
+                    stack[-1] = a + b
+                elif op == ADD:
+                    raise self.error(chunk, ip, "Operands must be two numbers or two strings.")
+                else:
+                    raise self.error(chunk, ip, "Operands must be numbers.")
+            elif op >= GREATER and op <= LESS_EQUAL:
+                b = pop()
+                a = stack[-1]
+                if type(a) not in numbers or type(b) not in numbers:
+                    raise self.error(chunk, ip, "Operands must be numbers.")
+                if op == GREATER:
+                    stack[-1] = a > b
+                elif op == GREATER_EQUAL:
+                    stack[-1] = a >= b
+                elif op == LESS:
+                    stack[-1] = a < b
+                else:
+                    stack[-1] = a <= b
+            elif op == NEGATE:
+                if type(stack[-1]) not in numbers:
+                    raise self.error(chunk, ip, "Operand must be a number.")
+                stack[-1] = -stack[-1]
+            elif op == NOT:
+                stack[-1] = not is_truthy(stack[-1])
+            elif op == EQUAL:
+                b = pop()
+                stack[-1] = is_equal(stack[-1], b)
+            elif op == NOT_EQUAL:
+                b = pop()
+                stack[-1] = not is_equal(stack[-1], b)
+            elif op == NIL:
+                push(None)
+            elif op == TRUE:
+                push(True)
+            elif op == FALSE:
+                push(False)
+            elif op == CONSTANT_LONG:
+                push(constants[code[ip] | (code[ip + 1] << 8) | (code[ip + 2] << 16)])
+                ip += 3
+            elif op == RETURN:
+                return pop()
+            elif op == GET_VARIABLE:
+                name = constants[code[ip] | (code[ip + 1] << 8) | (code[ip + 2] << 16)]
+                ip += 3
+                if name not in self.variables:
+                    raise VedaRuntimeError(chunk.tokens[ip - 4], f"Undefined variable '{name}'.")
+                push(self.variables[name])
+            else:
+                raise ValueError(f"Unknown opcode {op} at {ip - 1}")
+
+    def error(self, chunk: Chunk, ip: int, message: str) -> VedaRuntimeError:
+        # `ip` has already moved past the failing instruction.
+        return VedaRuntimeError(chunk.tokens[ip - 1], message)
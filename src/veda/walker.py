@@ -0,0 +1,90 @@
+# NOTE: This file is generated by `generate_ast.py` automatically, do not modify it manually
+
+from __future__ import annotations
+
+from .expr import Binary, Expr, Grouping, Literal, Unary, Variable
+
+TYPE_CHECKING = False
+if TYPE_CHECKING:
+    from typing import Any, Callable, Dict, Iterator, List, Optional, Tuple, Type, TypeVar
+
+    T = TypeVar("T")
+
+# Marks, on the work stack, that the node below it has had all its children handled.
+_EXIT = object()
+
+# Child exprs of each node class, last child first: the order they are pushed onto
+# the work stack so that they are handled first child first.
+CHILDREN = {
+    Binary: lambda node: (node.right, node.left),
+    Grouping: lambda node: (node.expression,),
+    Literal: lambda node: (),
+    Unary: lambda node: (node.right,),
+    Variable: lambda node: (),
+}  # type: Dict[Type[Expr], Callable[[Any], Tuple[Expr, ...]]]
+
+ARITY = {
+    Binary: 2,
+    Grouping: 1,
+    Literal: 0,
+    Unary: 1,
+    Variable: 0,
+}  # type: Dict[Type[Expr], int]
+
+
+def postorder(root: Expr) -> Iterator[Expr]:
+    """
+    Yield every node of `root`, children before their parent, in constant Python stack.
+    """
+    children = CHILDREN
+    stack = [root]  # type: List[Any]
+    while stack:
+        node = stack.pop()
+        if node is _EXIT:
+            yield stack.pop()
+        else:
+            stack.append(node)
+            stack.append(_EXIT)
+            stack.extend(children[type(node)](node))
+
+
+def fold(
+    root: Expr,
+    handlers: Dict[Type[Expr], Callable[..., T]],
+    memo: Optional[Dict[int, T]] = None,
+) -> T:
+    """
+    Compute `handlers[type(node)](node, *child_results)` for every node, bottom-up, and
+    return the result for `root`. Runs in constant Python stack whatever the tree depth.
+
+    With a `memo` dict, results are recorded by node `id`, and a node met again (a shared
+    subtree of a DAG) reuses its result without being walked again. The caller keeps the
+    nodes alive for as long as it keeps the memo.
+    """
+    children = CHILDREN
+    arity = ARITY
+    values = list()  # type: List[T]
+    stack = [root]  # type: List[Any]
+    while stack:
+        node = stack.pop()
+        if node is _EXIT:
+            node = stack.pop()
+            count = arity[type(node)]
+            arguments = values[-count:]
+            del values[-count:]
+            value = handlers[type(node)](node, *arguments)
+            if memo is not None:
+                memo[id(node)] = value
+            values.append(value)
+        elif memo is not None and id(node) in memo:
+            values.append(memo[id(node)])
+        elif arity[type(node)]:
+            stack.append(node)
+            stack.append(_EXIT)
+            stack.extend(children[type(node)](node))
+        else:
+            value = handlers[type(node)](node)
+            if memo is not None:
+                memo[id(node)] = value
+            values.append(value)
+    return values[0]
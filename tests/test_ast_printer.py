@@ -12,3 +12,21 @@ def test_simple_expression():
         Grouping(Literal(45.67)),
     )
     assert AstPrinter().print(expression) == "(* (- 123) (group 45.67))"
+
+
+def test_deeply_nested_expression():
+    expression = Literal(1.0)
+    for _ in range(100_000):
+        expression = Unary(Token(TokenType.MINUS, "-", None, 1), Grouping(expression))
+    printed = AstPrinter().print(expression)
+    assert printed.startswith("(- (group (- (group ")
+    assert printed.count("1.0") == 1
+
+
+def test_print_matches_visitor():
+    expression = Binary(
+        Unary(Token(TokenType.BANG, "!", None, 1), Literal(None)),
+        Token(TokenType.EQUAL_EQUAL, "==", None, 1),
+        Grouping(Binary(Literal("a"), Token(TokenType.PLUS, "+", None, 1), Literal(True))),
+    )
+    assert AstPrinter().print(expression) == expression.accept(AstPrinter())
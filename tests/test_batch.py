@@ -0,0 +1,89 @@
+import io
+
+import pytest
+
+from src.veda import Veda
+from src.veda.batch import collect_paths, main, run_file
+
+
+@pytest.fixture
+def scripts(tmp_path, monkeypatch):
+    monkeypatch.setenv("VEDA_CACHE_DIR", str(tmp_path / "cache"))
+    root = tmp_path / "scripts"
+    (root / "b").mkdir(parents=True)
+    (root / "a.veda").write_text("1 + 2")
+    (root / "b" / "c.veda").write_text('\n"a" - 1')
+    (root / "b" / "notes.txt").write_text("1 +")
+    (root / "d.veda").write_text("1 +")
+    for i in range(20):
+        (root / f"e{i:02}.veda").write_text(f"{i} * 2")
+    return root
+
+
+def test_collect_paths(scripts):
+    paths = collect_paths([str(scripts / "d.veda"), str(scripts)])
+    names = [path[len(str(scripts)) + 1 :] for path in paths]
+    assert names[:4] == ["d.veda", "a.veda", "d.veda", "e00.veda"]
+    assert names[-1] == "b/c.veda"
+    assert len(names) == 24
+
+
+def test_run_file(scripts):
+    assert run_file(str(scripts / "a.veda")) == ("3\n", 0)
+    assert run_file(str(scripts / "b" / "c.veda")) == ("Operands must be numbers.\n[line 2]\n", 70)
+    assert run_file(str(scripts / "d.veda"))[1] == 65
+    assert run_file(str(scripts / "missing.veda"))[1] == 66
+    assert not Veda.had_error and not Veda.had_runtime_error
+
+
+@pytest.mark.parametrize("options", [["-j", "1"], ["-j", "3", "--chunksize", "2"], ["-j", "4"]])
+def test_output_order_and_status(scripts, options):
+    out = io.StringIO()
+    assert main(options + [str(scripts)], out) == 70
+    output = out.getvalue()
+    assert output.startswith(f"==> {scripts / 'a.veda'} <==\n3\n==> {scripts / 'd.veda'} <==\n")
+    assert f"==> {scripts / 'e19.veda'} <==\n38\n" in output
+    assert output.endswith(
+        f"==> {scripts / 'b' / 'c.veda'} <==\nOperands must be numbers.\n[line 2]\n"
+    )
+
+    reference = io.StringIO()
+    main(["-j", "1", str(scripts)], reference)
+    assert output == reference.getvalue()
+
+
+def test_status_is_highest(scripts):
+    assert main([str(scripts / "a.veda"), str(scripts / "e00.veda")], io.StringIO()) == 0
+    assert main([str(scripts / "a.veda"), str(scripts / "d.veda")], io.StringIO()) == 65
+    assert main([str(scripts / "d.veda"), str(scripts / "missing.veda")], io.StringIO()) == 66
+
+
+def test_deeply_nested_scripts(scripts):
+    deep = scripts / "deep.veda"
+    deep.write_text("(" * 2000 + "1" + " + 1)" * 2000)
+    unbalanced = scripts / "unbalanced.veda"
+    unbalanced.write_text("-(" * 2000 + "1")
+    paths = [str(deep), str(unbalanced), str(scripts / "a.veda")]
+    assert run_file(str(deep)) == ("2001\n", 0)
+
+    out = io.StringIO()
+    assert main(["-j", "2", "--chunksize", "1"] + paths, out) == 65
+    assert out.getvalue() == (
+        f"==> {deep} <==\n2001\n"
+        f"==> {unbalanced} <==\n[line: 1] Error  at end: Expect ')' after expression.\n"
+        f"==> {scripts / 'a.veda'} <==\n3\n"
+    )
+
+
+def test_usage_errors(capsys):
+    for args in (["--jobs", "x", "a.veda"], ["-j", "-1", "a.veda"], ["-j", "2"]):
+        with pytest.raises(SystemExit) as exit:
+            main(args)
+        assert exit.value.code == 64
+
+
+def test_main_runs_directories_in_batch(scripts, capsys):
+    with pytest.raises(SystemExit) as exit:
+        Veda().main("-j", "2", str(scripts))
+    assert exit.value.code == 70
+    assert capsys.readouterr().out.count("==> ") == 23
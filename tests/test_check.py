@@ -0,0 +1,147 @@
+import io
+import json
+
+import pytest
+
+from src.veda import Veda
+from src.veda.check import check_file, check_source, main
+
+
+@pytest.fixture
+def scripts(tmp_path):
+    root = tmp_path / "scripts"
+    (root / "b").mkdir(parents=True)
+    (root / "a.veda").write_text("1 + 2")
+    (root / "b" / "c.veda").write_text("1 +;\n2 * @ (3;\n4 5")
+    for i in range(10):
+        (root / f"e{i}.veda").write_text(f"{i} *" if i % 3 else f"{i}")
+    return root
+
+
+def test_check_source():
+    assert check_source("(1 + 2) * x") == []
+    assert check_source('1 +;\n"a" + @;\n(2 "b', "s.veda") == [
+        {
+            "path": "s.veda",
+            "line": 1,
+            "column": 4,
+            "where": "at ';'",
+            "message": "Expect expression.",
+        },
+        {"path": "s.veda", "line": 2, "column": 7, "where": "", "message": "Unexpected character."},
+        {
+            "path": "s.veda",
+            "line": 2,
+            "column": 8,
+            "where": "at ';'",
+            "message": "Expect expression.",
+        },
+        {"path": "s.veda", "line": 3, "column": 6, "where": "", "message": "Unterminated string."},
+        {
+            "path": "s.veda",
+            "line": 3,
+            "column": 6,
+            "where": "at end",
+            "message": "Expect ')' after expression.",
+        },
+    ]
+    assert not Veda.had_error
+
+
+def test_check_source_columns():
+    # The error is reported on the line a token ends on, as `veda run` does, and a string
+    # starting on an earlier line is put at the start of that line.
+    diagnostics = check_source('1 +\n  @ 2 "a\nb" -;\n\t\t(3 4)')
+    assert [(d["line"], d["column"], d["message"]) for d in diagnostics] == [
+        (2, 3, "Unexpected character."),
+        (3, 1, "Expect end of expression."),
+        (4, 6, "Expect ')' after expression."),
+    ]
+
+
+def test_check_file(scripts):
+    assert check_file(str(scripts / "a.veda")) == ([], 0)
+    diagnostics, status = check_file(str(scripts / "b" / "c.veda"))
+    assert status == 65
+    assert [diagnostic["line"] for diagnostic in diagnostics] == [1, 2, 2, 3]
+    diagnostics, status = check_file(str(scripts / "missing.veda"))
+    assert status == 66
+    assert diagnostics[0]["message"].startswith("Cannot read script:")
+
+
+@pytest.mark.parametrize("options", [["-j", "1"], ["-j", "3", "--chunksize", "2"]])
+def test_main(scripts, options):
+    out = io.StringIO()
+    assert main(options + [str(scripts)], out) == 65
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [line["path"][len(str(scripts)) + 1 :] for line in lines] == [
+        "e1.veda",
+        "e2.veda",
+        "e4.veda",
+        "e5.veda",
+        "e7.veda",
+        "e8.veda",
+        "b/c.veda",
+        "b/c.veda",
+        "b/c.veda",
+        "b/c.veda",
+    ]
+    assert lines[0] == {
+        "path": str(scripts / "e1.veda"),
+        "line": 1,
+        "column": 4,
+        "where": "at end",
+        "message": "Expect expression.",
+    }
+
+
+def test_main_status(scripts):
+    assert main([str(scripts / "a.veda"), str(scripts / "e0.veda")], io.StringIO()) == 0
+    assert main([str(scripts / "a.veda"), str(scripts / "missing.veda")], io.StringIO()) == 66
+
+
+def test_veda_check(scripts, capsys):
+    with pytest.raises(SystemExit) as exit:
+        Veda().main("check", str(scripts / "b" / "c.veda"))
+    assert exit.value.code == 65
+    assert len(capsys.readouterr().out.splitlines()) == 4
+
+
+def test_check_deeply_nested(scripts):
+    deep = scripts / "deep.veda"
+    deep.write_text("(" * 3000 + "1" + ")" * 3000 + " +\n" + "-" * 3000 + "2")
+    unbalanced = scripts / "unbalanced.veda"
+    unbalanced.write_text("(" * 3000 + "1")
+    out = io.StringIO()
+    assert main([str(deep), str(unbalanced), str(scripts / "e1.veda")], out) == 65
+    lines = [json.loads(line) for line in out.getvalue().splitlines()]
+    assert [(line["path"][len(str(scripts)) + 1 :], line["where"]) for line in lines] == [
+        ("unbalanced.veda", "at end"),
+        ("e1.veda", "at end"),
+    ]
+
+
+@pytest.mark.parametrize(
+    "source, run, check",
+    [
+        ("1 + 2", 0, 0),
+        ("(1", 65, 65),
+        ("1 +", 65, 65),
+        ("@ 1", 65, 65),
+        ("(" * 3000 + "1", 65, 65),
+        ("(" * 3000 + "1" + ")" * 3000, 0, 0),
+        # Only the first expression runs, so errors after it are reported by `check` alone.
+        ("1 2", 0, 65),
+        ("1; 2 +", 0, 65),
+    ],
+)
+def test_check_and_run(tmp_path, capsys, monkeypatch, source, run, check):
+    monkeypatch.setenv("VEDA_NO_CACHE", "1")
+    script = tmp_path / "script.veda"
+    script.write_text(source)
+    assert Veda().run_file(str(script)) == run
+    Veda.had_error = False
+    capsys.readouterr()
+    diagnostics, status = check_file(str(script))
+    assert status == check
+    assert bool(diagnostics) == bool(check)
@@ -0,0 +1,90 @@
+import random
+
+import pytest
+
+from src.veda import Parser, Scanner, Veda
+from src.veda.codegen import PythonCompiler, VedaSyntaxError, compile_source
+from src.veda.expr import Literal, Unary
+from src.veda.interpreter import Interpreter
+from src.veda.runtime import VedaRuntimeError, stringify
+from src.veda.token import Token
+from src.veda.token_type import TokenType
+
+from .test_vm import ERROR_SOURCES, SOURCES
+
+
+def _parse(source: str):
+    return Parser(Scanner(source).scan_tokens()).parse()
+
+
+def _run(evaluate):
+    try:
+        return stringify(evaluate())
+    except VedaRuntimeError as error:
+        return str(error), error.token.line
+
+
+def _assert_matches_interpreter(source: str):
+    expression = _parse(source)
+    expected = _run(lambda: Interpreter().evaluate(expression))
+    assert _run(PythonCompiler().compile(expression)) == expected
+
+
+@pytest.mark.parametrize("source", SOURCES + ['"a" + "b" == "ab"', "!(1 < 2)", "!-1", '!"s"'])
+def test_matches_interpreter(source):
+    _assert_matches_interpreter(source)
+
+
+@pytest.mark.parametrize("source, message, line", ERROR_SOURCES)
+def test_runtime_errors(source, message, line):
+    assert _run(PythonCompiler().compile(_parse(source))) == (message, line)
+
+
+def test_matches_interpreter_random():
+    rng = random.Random(13)
+    atoms = ["1", "2.5", "0", '"s"', "true", "false", "nil"]
+    operators = ["+", "-", "*", "/", "==", "!=", "<", "<=", ">", ">="]
+    for _ in range(500):
+        parts = [rng.choice(atoms)]
+        for _ in range(rng.randint(0, 8)):
+            parts.append(rng.choice(operators))
+            operand = rng.choice(["", "-", "!", "!!"]) + rng.choice(atoms)
+            if rng.random() < 0.3:
+                operand = f"({operand} {rng.choice(operators)} {rng.choice(atoms)})"
+            parts.append(operand)
+        _assert_matches_interpreter(" ".join(parts))
+
+
+def test_deep_expression_falls_back_to_vm():
+    expression = Literal(1.0)
+    for _ in range(10_000):
+        expression = Unary(Token(TokenType.MINUS, "-", None, 1), expression)
+    assert PythonCompiler().compile(expression)() == 1.0
+
+
+def test_compile_source_deep_expression():
+    depth = 10_000
+    assert compile_source("-(" * depth + "1" + ")" * depth)() == 1.0
+    with pytest.raises(VedaSyntaxError):
+        compile_source("(" * depth + "1")
+    Veda.had_error = False
+
+
+def test_compile_source_is_cached():
+    function = compile_source("(1 + 2) * 3")
+    assert function() == 9.0
+    assert compile_source("(1 + 2) * 3") is function
+
+
+def test_compile_source_syntax_error(capsys):
+    with pytest.raises(VedaSyntaxError):
+        compile_source("1 +")
+    assert "Expect expression." in capsys.readouterr().out
+    Veda.had_error = False
+
+
+def test_variables():
+    function = PythonCompiler().compile(_parse("-x * 2 + y"))
+    assert function({"x": 1.5, "y": 4.0}) == 1.0
+    with pytest.raises(VedaRuntimeError, match="Undefined variable 'y'."):
+        function({"x": 1.5})
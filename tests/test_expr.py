@@ -0,0 +1,96 @@
+import pickle
+from pathlib import Path
+
+import pytest
+
+from src.veda.expr import Binary, Grouping, Literal, Unary
+from src.veda.generate_ast import GenerateAst
+from src.veda.token import Token
+from src.veda.token_type import TokenType
+from src.veda.walker import fold, postorder
+
+
+def _expression():
+    # -(1) * "a"
+    return Binary(
+        Unary(Token(TokenType.MINUS, "-", None, 1), Grouping(Literal(1.0))),
+        Token(TokenType.STAR, "*", None, 1),
+        Literal("a"),
+    )
+
+
+@pytest.mark.parametrize("name", ["expr.py", "walker.py"])
+def test_generated_file_is_up_to_date(name, tmp_path):
+    GenerateAst.run(str(tmp_path))
+    expected = (Path(__file__).parent.parent / "src" / "veda" / name).read_text()
+    assert (tmp_path / name).read_text() == expected
+
+
+def test_nodes_are_slotted():
+    for node in (_expression(), Grouping(Literal(1.0)), Literal(None)):
+        assert not hasattr(node, "__dict__")
+
+
+def test_structural_equality_and_hash():
+    assert _expression() == _expression()
+    assert hash(_expression()) == hash(_expression())
+    assert Literal(1.0) != Literal(True)
+    assert Literal(1.0) != Grouping(Literal(1.0))
+
+
+def test_match_args():
+    match _expression():
+        case Binary(Unary(operator, Grouping(Literal(value))), _, Literal(right)):
+            assert (operator.lexeme, value, right) == ("-", 1.0, "a")
+        case _:
+            assert False
+
+
+def test_repr():
+    assert repr(Grouping(Literal(None))) == "Grouping(expression=Literal(value=None))"
+
+
+def test_pickle_round_trip():
+    expression = _expression()
+    assert pickle.loads(pickle.dumps(expression)) == expression
+
+
+def test_postorder():
+    names = [type(node).__name__ for node in postorder(_expression())]
+    assert names == ["Literal", "Grouping", "Unary", "Literal", "Binary"]
+
+
+def test_fold_deep_tree():
+    expression = Literal(1.0)
+    for _ in range(100_000):
+        expression = Grouping(expression)
+    depth = fold(expression, {Literal: lambda node: 0, Grouping: lambda node, inner: inner + 1})
+    assert depth == 100_000
+    assert sum(1 for _ in postorder(expression)) == 100_001
+
+
+def test_deep_tree():
+    def deep(value):
+        expression = Literal(value)
+        for index in range(50_000):
+            if index % 2:
+                expression = Grouping(expression)
+            else:
+                expression = Unary(Token(TokenType.MINUS, "-", None, 1), expression)
+        return expression
+
+    expression = deep(1.0)
+    assert expression == deep(1.0)
+    assert expression != deep(True)
+    assert hash(expression) == hash(deep(1.0))
+    assert repr(expression).startswith("Grouping(expression=Unary(operator=<")
+    assert repr(expression).endswith("Literal(value=1.0)" + ")" * 50_000)
+    assert pickle.loads(pickle.dumps(expression)) == expression
+
+
+def test_pickle_keeps_shared_subtrees():
+    shared = Grouping(Literal(1.0))
+    expression = Binary(shared, Token(TokenType.PLUS, "+", None, 1), shared)
+    copy = pickle.loads(pickle.dumps(expression))
+    assert copy == expression
+    assert copy.left is copy.right
@@ -0,0 +1,125 @@
+import pickle
+import random
+
+import pytest
+
+from src.veda import Parser, Scanner, Veda
+from src.veda.incremental import Document
+
+ALPHABET = list('12.+-*/!=<>()"ab \n') + ["//", "(1)", "(2 + 3)", "nil", "true"]
+
+
+def _full(source: str):
+    scanner = Scanner(source)
+    spans = list(scanner.match_spans(source, 0, final=True))
+    tokens = [token for token, _, _ in spans] + [Scanner(source).scan_tokens()[-1]]
+    offsets = [(start, end) for _, start, end in spans] + [(len(source), len(source))]
+    return tokens, offsets, Parser(Scanner(source).scan_tokens()).parse()
+
+
+def _assert_matches_full_parse(document: Document):
+    tokens, offsets, expression = _full(document.source)
+    assert [(t.type, t.lexeme, t.literal) for t in document.tokens] == [
+        (t.type, t.lexeme, t.literal) for t in tokens
+    ]
+    assert [document.line_at(i) for i in range(len(tokens))] == [t.line for t in tokens]
+    assert [(document.start_at(i), document.end_at(i)) for i in range(len(tokens))] == offsets
+    assert [t.line for t in document.tokens] == [t.line for t in tokens]
+    assert document.expression == expression
+
+
+@pytest.fixture(autouse=True)
+def _quiet(capsys):
+    yield
+    capsys.readouterr()
+    Veda.had_error = False
+
+
+def test_random_edits_match_full_reparse():
+    rng = random.Random(5)
+    for _ in range(30):
+        document = Document("".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 60))))
+        _assert_matches_full_parse(document)
+        for _ in range(30):
+            offset = rng.randint(0, len(document.source))
+            deleted = rng.randint(0, min(3, len(document.source) - offset))
+            inserted = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 3)))
+            document.edit(offset, deleted, inserted)
+            _assert_matches_full_parse(document)
+
+
+def test_edit_merges_with_neighbouring_tokens():
+    document = Document("1. + a")
+    document.edit(2, 0, "5")
+    assert document.source == "1.5 + a"
+    document.edit(7, 0, "b")
+    assert [t.lexeme for t in document.tokens] == ["1.5", "+", "ab", ""]
+    _assert_matches_full_parse(document)
+
+
+def test_edit_reuses_untouched_groups():
+    source = " + ".join(f"({i} * {i})" for i in range(200))
+    document = Document(source)
+
+    offset = source.index("(100 * 100)") + 1
+    document.edit(offset, 3, "7")
+    _assert_matches_full_parse(document)
+    # The chain up to the group in front of the edit (the `+` after it was scanned again),
+    # that group, the rest of the edited group after `7` and the chain after that group.
+    assert document.reused == 4
+    assert document.reparsed == 7
+
+    # `(` is scanned again: its group's `0 * 0` and the chain from the `+` after it.
+    document.edit(0, 0, "\n\n")
+    _assert_matches_full_parse(document)
+    assert document.reused == 2
+    assert document.reparsed == 3
+
+
+def test_edit_reparses_only_the_damaged_region():
+    source = " + ".join(f"a{i} * {i}" for i in range(20_000))
+    document = Document(source)
+
+    for index in (10_000, 0, 19_999, 5_000):
+        offset = source.index(f"a{index} ")
+        document.edit(offset, 1, "(b - ")
+        document.edit(offset + len(f"(b - {index}"), 0, ")")
+        source = document.source
+        assert document.reparsed < 12
+    document.edit(len(source), 0, " == c")
+    assert document.reparsed < 12
+    _assert_matches_full_parse(document)
+
+
+def test_edit_leaves_earlier_trees_alone():
+    document = Document("(1 + a) * 2\n+ 3 -\nb")
+    before = document.expression
+    b = document.tokens[-2]
+    copy = pickle.loads(pickle.dumps(before))
+    document.edit(0, 0, "4 +\n\n")
+    document.edit(document.source.index("3"), 1, "x")
+    _assert_matches_full_parse(document)
+    assert before == copy
+    assert b.line == 3
+    assert document.tokens[-2].line == document.line_at(len(document.tokens) - 2) == 5
+
+
+def test_edit_moves_later_tokens_to_their_new_line(capsys):
+    document = Document("1 +\nfoo")
+    document.edit(0, 0, "\n\n")
+    _assert_matches_full_parse(document)
+    assert document.expression.right.name.line == 4
+
+    # Groups taken over from the previous parse hold the moved tokens too.
+    source = " + ".join(f"({i} * x{i})" for i in range(50))
+    document = Document(source)
+    document.edit(source.index("(25"), 0, "\n")
+    _assert_matches_full_parse(document)
+    assert document.reused > 0
+    document.edit(0, 1, "")
+    _assert_matches_full_parse(document)
+
+
+def test_edit_out_of_range():
+    with pytest.raises(ValueError):
+        Document("1 + 2").edit(4, 2, "")
@@ -0,0 +1,105 @@
+import math
+
+import pytest
+
+from src.veda import Parser, Scanner
+from src.veda.ast_printer import AstPrinter
+from src.veda.expr import Literal
+from src.veda.interner import Interner
+from src.veda.interpreter import Interpreter
+from src.veda.optimizer import Optimizer
+from src.veda.pratt_parser import PrattParser
+from src.veda.runtime import VedaRuntimeError, stringify
+from src.veda.token import Token
+from src.veda.token_type import TokenType
+from src.veda.walker import postorder
+
+from .test_parser import SOURCES
+from .test_vm import SOURCES as VM_SOURCES
+
+
+def _parse(source: str, interner=None, parser=Parser):
+    return parser(Scanner(source).scan_tokens(), interner).parse()
+
+
+@pytest.mark.parametrize("parser", [Parser, PrattParser])
+@pytest.mark.parametrize("source", SOURCES)
+def test_interned_parse_is_equal(source, parser):
+    assert _parse(source, Interner(), parser) == _parse(source, parser=parser)
+
+
+def test_equal_subtrees_are_shared():
+    expression = _parse("(1 + 2) * (1 + 2) == (1 + 2) * (1 + 2)", Interner())
+    left, right = expression.left, expression.right
+    assert left is right
+    assert left.left is left.right
+    assert left.left.expression.left is not left.left.expression.right
+
+
+def test_distinct_literals_are_not_shared():
+    interner = Interner()
+    expression = _parse('1 == true == "1" == 0 == nil == false == 1', interner)
+    literals = [node for node in postorder(expression) if isinstance(node, Literal)]
+    assert len(literals) == 7
+    assert len({id(node) for node in literals}) == 6
+    zero = interner.Literal(0.0)
+    assert interner.Literal(-0.0) is not zero and interner.Literal(0.0) is zero
+    assert interner.Literal(math.nan) is interner.Literal(math.nan)
+
+
+def test_operators_on_different_lines_are_not_shared():
+    expression = _parse('("a" - 1) + ("a" - 1)', Interner())
+    assert expression.left is expression.right
+
+    expression = _parse('("a" - 1) +\n("a"\n- 1)', Interner())
+    assert expression.left is not expression.right
+    with pytest.raises(VedaRuntimeError) as error:
+        Interpreter().evaluate_shared(expression.right)
+    assert error.value.token.line == 3
+
+
+def _repeated(depth: int) -> str:
+    source = "1"
+    for _ in range(depth):
+        source = f"({source}) + ({source})"
+    return source
+
+
+def test_dag_size_scales_with_distinct_subexpressions():
+    interner = Interner()
+    expression = _parse(_repeated(10), interner)
+    assert len(interner) == 1 + 2 * 10
+    assert len(list(postorder(expression))) == 4 * 2**10 - 3
+
+
+def test_memoized_print_matches():
+    source = _repeated(8)
+    expected = AstPrinter().print(_parse(source))
+    assert AstPrinter(memoize=True).print(_parse(source, Interner())) == expected
+    assert AstPrinter(memoize=True).print(_parse(source)) == expected
+
+
+@pytest.mark.parametrize("source", VM_SOURCES)
+def test_evaluate_shared_matches_interpreter(source):
+    expression = _parse(source, Interner())
+    expected = Interpreter().evaluate(expression)
+    assert stringify(Interpreter().evaluate_shared(expression)) == stringify(expected)
+
+
+def _doubled(depth: int):
+    # The DAG of `_repeated(depth)`, built directly: 2 ** depth leaves once expanded.
+    interner = Interner()
+    plus = Token(TokenType.PLUS, "+", None, 1)
+    expression = interner.Literal(1.0)
+    for _ in range(depth):
+        group = interner.Grouping(expression)
+        expression = interner.Binary(group, plus, group)
+    return expression
+
+
+def test_evaluate_shared_on_exponential_tree():
+    assert Interpreter().evaluate_shared(_doubled(60)) == 2.0**60
+
+
+def test_optimizer_on_shared_subtrees():
+    assert Optimizer().optimize(_doubled(60)) == Literal(2.0**60)
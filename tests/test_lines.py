@@ -0,0 +1,50 @@
+import mmap
+import random
+
+import pytest
+
+from src.veda.lines import LineTable
+
+
+def _positions(source):
+    line, column = 1, 1
+    for char in source:
+        yield line, column
+        if char == "\n":
+            line, column = line + 1, 1
+        else:
+            column += 1
+    yield line, column
+
+
+@pytest.mark.parametrize("source", ["", "\n", "a", "ab\ncd\n", "\n\nx\n\ny", "é\nü"])
+def test_positions(source):
+    lines = LineTable(source)
+    assert len(lines) == source.count("\n") + 1
+    for offset, (line, column) in enumerate(_positions(source)):
+        assert lines.position(offset) == (line, column)
+        assert (lines.line(offset), lines.column(offset)) == (line, column)
+
+
+def test_positions_random():
+    rng = random.Random(24)
+    for _ in range(50):
+        source = "".join(rng.choice("ab \n") for _ in range(rng.randrange(200)))
+        lines = LineTable(source)
+        assert [lines.position(offset) for offset in range(len(source) + 1)] == list(
+            _positions(source)
+        )
+
+
+def test_binary_sources(tmp_path):
+    source = 'é\n"x\ny"\n1'
+    data = source.encode()
+    path = tmp_path / "source.veda"
+    path.write_bytes(data)
+    with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for binary in (data, bytearray(data), memoryview(data), mapped):
+            lines = LineTable(binary)
+            assert list(lines.starts) == [0, 3, 6, 9]
+            # Columns count bytes.
+            assert lines.position(2) == (1, 3)
+            assert lines.position(len(data)) == (4, 2)
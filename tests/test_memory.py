@@ -0,0 +1,137 @@
+import io
+import random
+import tracemalloc
+
+import pytest
+
+from src.veda import Parser, Scanner, Veda
+from src.veda.interner import Interner
+from src.veda.memory import measure, node_sizes, profile_memory
+from src.veda.session import Session
+
+
+def _source(operands: int, seed: int = 0) -> str:
+    rng = random.Random(seed)
+    parts = ["x"]
+    for _ in range(operands - 1):
+        parts.append(rng.choice("+-*/"))
+        parts.append(rng.choice(["1.5", "y", "(2 - z)", "-w", '"s"']))
+    return " ".join(parts)
+
+
+def test_measure():
+    def allocate():
+        scratch = [object() for _ in range(10_000)]
+        return [len(scratch)] * 1000
+
+    result, usage = measure(allocate)
+    assert result == [10_000] * 1000
+    assert usage.name == "allocate"
+    assert usage.retained >= 8000
+    assert usage.peak > usage.retained + 10_000 * 16
+    assert not tracemalloc.is_tracing()
+
+
+def test_measure_keeps_tracing_on():
+    tracemalloc.start()
+    try:
+        _, usage = measure(bytearray, 100_000, name="buffer")
+        assert tracemalloc.is_tracing()
+    finally:
+        tracemalloc.stop()
+    assert usage.name == "buffer"
+    assert 100_000 <= usage.retained <= usage.peak
+
+
+def test_node_sizes_count_shared_nodes_once():
+    tokens = Scanner("(a + 1) * (a + 1)").scan_tokens()
+    plain = node_sizes(Parser(tokens).parse())
+    shared = node_sizes(Parser(tokens, Interner()).parse())
+    assert {name: count for name, (count, _) in plain.items()} == {
+        "Binary": 3,
+        "Grouping": 2,
+        "Literal": 2,
+        "Variable": 2,
+    }
+    assert {name: count for name, (count, _) in shared.items()} == {
+        "Binary": 2,
+        "Grouping": 1,
+        "Literal": 1,
+        "Variable": 1,
+    }
+    assert shared["Binary"][1] == plain["Binary"][1] * 2 // 3
+
+
+@pytest.mark.parametrize("engine", Scanner.ENGINES)
+def test_budgets(engine):
+    source = _source(20_000)
+    report = profile_memory(source, engine)
+    scan, parse, printing = report.stages
+    assert [usage.name for usage in report.stages] == ["scan", "parse", "print"]
+
+    assert scan.count == len(Scanner(source).scan_tokens())
+    assert scan.per_item < 120
+    assert parse.count == sum(count for count, _ in report.nodes.values())
+    assert parse.per_item < 80
+    assert all(size / count <= 64 for count, size in report.nodes.values())
+    assert printing.peak < 4 * printing.count
+
+
+def test_syntax_error():
+    out = io.StringIO()
+    report = profile_memory("1 +", reporter=Session(out))
+    assert out.getvalue() == "[line: 1] Error  at end: Expect expression.\n"
+    assert [usage.name for usage in report.stages] == ["scan", "parse"]
+    assert report.stage("parse").count == 0
+    assert report.stage("print") is None
+    assert report.nodes == {}
+
+
+def test_main(tmp_path, capsys):
+    script = tmp_path / "script.veda"
+    script.write_text("(1 + 2) * -x")
+    with pytest.raises(SystemExit) as exit:
+        Veda().main("--memory", "--engine", "regex", str(script))
+    assert exit.value.code == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert lines[0].split()[:4] == ["stage", "peak", "(B)", "retained"]
+    assert [line.split()[0] for line in lines[1:4]] == ["scan", "parse", "print"]
+    assert "9 tokens" in lines[1]
+    assert [line.split()[:2] for line in lines[5:]] == [
+        ["node", "count"],
+        ["Binary", "2"],
+        ["Grouping", "1"],
+        ["Literal", "2"],
+        ["Unary", "1"],
+        ["Variable", "1"],
+    ]
+
+
+def test_main_deeply_nested(tmp_path, capsys):
+    depth = 10_000
+    script = tmp_path / "script.veda"
+    script.write_text("-(" * depth + "1" + ")" * depth)
+    with pytest.raises(SystemExit) as exit:
+        Veda().main("--memory", str(script))
+    assert exit.value.code == 0
+    lines = capsys.readouterr().out.splitlines()
+    assert [line.split()[:2] for line in lines[5:]] == [
+        ["node", "count"],
+        ["Grouping", f"{depth:,}"],
+        ["Literal", "1"],
+        ["Unary", f"{depth:,}"],
+    ]
+
+
+def test_main_errors(tmp_path, capsys):
+    with pytest.raises(SystemExit) as exit:
+        Veda().main("--memory", str(tmp_path / "missing.veda"))
+    assert exit.value.code == 66
+    script = tmp_path / "script.veda"
+    script.write_text("1 +")
+    with pytest.raises(SystemExit) as exit:
+        Veda().main("--memory", str(script))
+    assert exit.value.code == 65
+    with pytest.raises(SystemExit) as exit:
+        Veda().main("--memory")
+    assert exit.value.code == 64
@@ -0,0 +1,77 @@
+import math
+import random
+
+import pytest
+
+from src.veda import Parser, Scanner
+from src.veda.ast_printer import AstPrinter
+from src.veda.expr import Binary, Literal, Unary
+from src.veda.interpreter import Interpreter
+from src.veda.optimizer import Optimizer
+from src.veda.runtime import VedaRuntimeError, stringify
+from src.veda.token import Token
+from src.veda.token_type import TokenType
+
+
+def _optimize(source: str) -> str:
+    expression = Parser(Scanner(source).scan_tokens()).parse()
+    return AstPrinter().print(Optimizer().optimize(expression))
+
+
+def _evaluate(expression):
+    try:
+        return stringify(Interpreter().evaluate(expression))
+    except VedaRuntimeError as error:
+        return str(error), error.token
+
+
+@pytest.mark.parametrize(
+    "source, expected",
+    [
+        ("(1 + 2) * 3", "9.0"),
+        ("!!true", "True"),
+        ("((((1))))", "1.0"),
+        ('"a" + "b" == "ab"', "True"),
+        ("1 / 0", "inf"),
+        ("-(2)", "-2.0"),
+        ("nil == false", "False"),
+        ('"a" - 1', "(- a 1.0)"),
+        ('("a" - 1) * 1', "(- a 1.0)"),
+        ('1 * ("a" - 1) / 1 - 0', "(- a 1.0)"),
+        ('(("a" - 1) + 0)', "(+ (- a 1.0) 0.0)"),
+        ('- -("a" - 1)', "(- a 1.0)"),
+        ('!!(1 < "b")', "(< 1.0 b)"),
+        ('!(1 < "b")', "(! (< 1.0 b))"),
+        ('(1 + 2) * ("x" + nil)', "(* 3.0 (+ x nil))"),
+        ('("x" + nil) + ""', "(+ (+ x nil) )"),
+        ('("a" - 1) - -0', "(- (- a 1.0) -0.0)"),
+    ],
+)
+def test_optimize(source, expected):
+    assert _optimize(source) == expected
+
+
+def test_negative_zero_is_preserved():
+    minus = Token(TokenType.MINUS, "-", None, 1)
+    expression = Unary(minus, Literal(0.0))
+    folded = Optimizer().optimize(expression)
+    assert isinstance(folded, Literal) and math.copysign(1.0, folded.value) == -1.0  # type: ignore
+
+    plus = Token(TokenType.PLUS, "+", None, 1)
+    assert Optimizer().optimize(Binary(expression, plus, Literal(0.0))) == Literal(0.0)
+
+
+def test_optimized_evaluates_the_same():
+    rng = random.Random(17)
+    atoms = ["1", "0", "2.5", '"s"', '""', "true", "nil"]
+    operators = ["+", "-", "*", "/", "==", "!=", "<", "<=", ">", ">="]
+    for _ in range(1000):
+        parts = [rng.choice(atoms)]
+        for _ in range(rng.randint(0, 6)):
+            parts.append(rng.choice(operators))
+            operand = rng.choice(["", "-", "!", "- -", "!!"]) + rng.choice(atoms)
+            if rng.random() < 0.4:
+                operand = f"({operand} {rng.choice(operators)} {rng.choice(atoms)})"
+            parts.append(operand)
+        expression = Parser(Scanner(" ".join(parts)).scan_tokens()).parse()
+        assert _evaluate(Optimizer().optimize(expression)) == _evaluate(expression)
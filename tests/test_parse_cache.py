@@ -0,0 +1,159 @@
+import math
+import os
+
+import pytest
+
+from src.veda import Parser, Scanner, Veda, parse_cache, veda
+from src.veda.ast_printer import AstPrinter
+from src.veda.expr import Grouping, Literal, Unary
+from src.veda.parse_cache import ParseCache, decode, encode
+from src.veda.token import Token
+from src.veda.token_type import TokenType
+from src.veda.veda import CACHE_MIN_SIZE
+
+from .test_parser import SOURCES
+from .test_vm import SOURCES as VM_SOURCES
+
+
+def _parse(source: str):
+    return Parser(Scanner(source).scan_tokens()).parse()
+
+
+@pytest.mark.parametrize("source", SOURCES + VM_SOURCES)
+def test_round_trip(source):
+    expression = _parse(source)
+    assert decode(encode(expression)) == expression
+
+
+def test_round_trip_keeps_literal_types():
+    for value in (0.0, -0.0, 1.0, True, False, None, "", "1"):
+        decoded = decode(encode(Literal(value)))
+        assert type(decoded.value) is type(value)
+        assert decoded == Literal(value)
+    assert math.isnan(decode(encode(Literal(math.nan))).value)
+    assert math.copysign(1.0, decode(encode(Literal(-0.0))).value) == -1.0
+
+
+def test_round_trip_deep_tree():
+    expression = Literal(1.0)
+    for _ in range(100_000):
+        expression = Unary(Token(TokenType.MINUS, "-", None, 3), Grouping(expression))
+    decoded = decode(encode(expression))
+    assert AstPrinter().print(decoded) == AstPrinter().print(expression)
+
+
+@pytest.mark.parametrize("data", [b"", b"garbage", encode(Literal(1.0))[:-3]])
+def test_decode_rejects_corrupt_data(data):
+    with pytest.raises(ValueError):
+        decode(data)
+
+
+def test_load_and_store(tmp_path):
+    cache = ParseCache(str(tmp_path))
+    source = '-1 * (2 + 3) / "4"'
+    assert cache.load(source) is None
+    cache.store(source, _parse(source))
+    assert cache.load(source) == _parse(source)
+    assert cache.load(source + " ") is None
+    assert os.listdir(tmp_path) == [os.path.basename(cache.path(source))]
+
+
+def test_corrupt_entry_is_a_miss(tmp_path):
+    cache = ParseCache(str(tmp_path))
+    cache.store("1", _parse("1"))
+    with open(cache.path("1"), "wb") as f:
+        f.write(b"\x00")
+    assert cache.load("1") is None
+    assert not os.path.exists(cache.path("1"))
+
+
+@pytest.mark.parametrize("name", ["scanner.py", "parse_tables.py", "table_parser.py"])
+def test_parser_change_is_a_miss(tmp_path, monkeypatch, name):
+    sources = list()
+    for path in parse_cache._PARSER_SOURCES:
+        with open(path, "rb") as f:
+            copy = tmp_path / os.path.basename(path)
+            copy.write_bytes(f.read())
+        sources.append(str(copy))
+    monkeypatch.setattr(parse_cache, "_PARSER_SOURCES", sources)
+    directory = str(tmp_path / "cache")
+    ParseCache(directory).store("1", _parse("1"))
+    assert ParseCache(directory).load("1") == _parse("1")
+    with open(tmp_path / name, "a") as f:
+        f.write("\n")
+    assert ParseCache(directory).load("1") is None
+
+
+def test_eviction_keeps_recent_entries(tmp_path):
+    cache = ParseCache(str(tmp_path), max_size=len(encode(_parse("1 + 1"))) * 3)
+    for i in range(10):
+        source = f"{i} + {i}"
+        cache.store(source, _parse(source))
+        os.utime(cache.path(source), (i, i))
+    cache.evict()
+    assert [cache.load(f"{i} + {i}") is not None for i in range(10)] == [False] * 7 + [True] * 3
+
+
+def test_unwritable_directory_is_ignored(tmp_path):
+    blocker = tmp_path / "file"
+    blocker.write_text("")
+    cache = ParseCache(str(blocker / "cache"))
+    cache.store("1", _parse("1"))
+    assert cache.load("1") is None
+
+
+def test_default_directory(monkeypatch, tmp_path):
+    monkeypatch.delenv("VEDA_NO_CACHE", raising=False)
+    monkeypatch.delenv("VEDA_CACHE_DIR", raising=False)
+    monkeypatch.setenv("XDG_CACHE_HOME", str(tmp_path))
+    assert ParseCache.default().directory == str(tmp_path / "veda")
+    monkeypatch.setenv("VEDA_CACHE_DIR", str(tmp_path / "x"))
+    assert ParseCache.default().directory == str(tmp_path / "x")
+    monkeypatch.setenv("VEDA_NO_CACHE", "1")
+    assert ParseCache.default() is None
+
+
+def test_run_file_uses_cache(tmp_path, capsys, monkeypatch):
+    monkeypatch.setenv("VEDA_CACHE_DIR", str(tmp_path / "cache"))
+    script = tmp_path / "script.veda"
+    script.write_text("// " + "-" * CACHE_MIN_SIZE + '\n(1 + 2) * 3 == 9\n"a" - 1')
+    Veda().main(str(script))
+    assert len(os.listdir(tmp_path / "cache")) == 1
+
+    monkeypatch.setattr(Scanner, "scan_tokens", None)
+    Veda().main(str(script))
+    assert capsys.readouterr().out == "true\ntrue\n"
+
+
+def test_mapped_scripts_share_cache_entries(tmp_path, capsys, monkeypatch):
+    monkeypatch.setenv("VEDA_CACHE_DIR", str(tmp_path / "cache"))
+    script = tmp_path / "script.veda"
+    script.write_text("// é" + "-" * CACHE_MIN_SIZE + '\n"é" + "a"')
+    Veda().main(str(script))
+    monkeypatch.setattr(veda, "MMAP_MIN_SIZE", 1)
+    monkeypatch.setattr(Scanner, "scan_tokens", None)
+    Veda().main(str(script))
+    assert capsys.readouterr().out == "éa\néa\n"
+    assert len(os.listdir(tmp_path / "cache")) == 1
+
+
+def test_run_file_skips_cache_for_small_scripts(tmp_path, capsys, monkeypatch):
+    monkeypatch.setenv("VEDA_CACHE_DIR", str(tmp_path / "cache"))
+    script = tmp_path / "script.veda"
+    script.write_text("1 + 2")
+    Veda().main(str(script))
+    assert capsys.readouterr().out == "3\n"
+    assert not os.path.exists(tmp_path / "cache")
+
+
+def test_run_file_does_not_cache_errors(tmp_path, capsys, monkeypatch):
+    monkeypatch.setenv("VEDA_CACHE_DIR", str(tmp_path / "cache"))
+    script = tmp_path / "script.veda"
+    script.write_text("// " + "-" * CACHE_MIN_SIZE + "\n1 +")
+    for _ in range(2):
+        with pytest.raises(SystemExit) as exit:
+            Veda().main(str(script))
+        Veda.had_error = False
+        assert exit.value.code == 65
+    assert capsys.readouterr().out.count("Expect expression.") == 2
+    assert not os.path.exists(tmp_path / "cache")
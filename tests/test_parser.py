@@ -0,0 +1,178 @@
+import io
+import random
+from pathlib import Path
+
+import pytest
+
+from src.veda import BufferParser, Parser, Scanner, StreamParser, Veda
+from src.veda.ast_printer import AstPrinter
+from src.veda.generate_parser import GenerateParser
+from src.veda.interner import Interner
+from src.veda.pratt_parser import PrattParser
+from src.veda.table_parser import BufferTableParser, TableParser
+
+SOURCES = [
+    "1",
+    "-1 * (2 + 3) / 4",
+    "!true == false != nil",
+    '"a" + "b" < "c" >= 1 <= 2 > 3',
+    "- - - 1",
+    "((((1))))",
+    "1 + 2 - 3 * 4 / 5 == 6 != 7",
+    "1 2 3",
+    "x + y * -(z)",
+]
+
+OPERATORS = ["+", "-", "*", "/", "==", "!=", "<", "<=", ">", ">="]
+
+ERROR_SOURCES = ["", "1 +", "(1", "(1 2)", ")", "* 1"]
+
+
+def _parse(source: str):
+    return Parser(Scanner(source).scan_tokens()).parse()
+
+
+def _stream_parse(source: str):
+    return StreamParser(Scanner(io.StringIO(source)).iter_tokens(chunk_size=2)).parse()
+
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_stream_parser_parity(source):
+    assert AstPrinter().print(_stream_parse(source)) == AstPrinter().print(_parse(source))
+
+
+@pytest.mark.parametrize("source", ERROR_SOURCES)
+def test_stream_parser_error_parity(source, capsys):
+    expected = _parse(source), capsys.readouterr().out
+    actual = _stream_parse(source), capsys.readouterr().out
+    Veda.had_error = False
+    assert expected[0] is None and actual == expected
+
+
+def test_stream_parser_stops_pulling_after_expression():
+    pulled = []
+
+    def tokens():
+        for token in Scanner("1 + 2 3 4 5 6").iter_tokens():
+            pulled.append(token)
+            yield token
+
+    assert AstPrinter().print(StreamParser(tokens()).parse()) == "(+ 1.0 2.0)"
+    assert len(pulled) == 4
+
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_buffer_parser_parity(source):
+    expression = BufferParser(Scanner(source).scan_buffer()).parse()
+    assert AstPrinter().print(expression) == AstPrinter().print(_parse(source))
+
+
+@pytest.mark.parametrize("source", ERROR_SOURCES)
+def test_buffer_parser_error_parity(source, capsys):
+    expected = _parse(source), capsys.readouterr().out
+    actual = BufferParser(Scanner(source).scan_buffer()).parse(), capsys.readouterr().out
+    Veda.had_error = False
+    assert expected[0] is None and actual == expected
+
+
+@pytest.mark.parametrize("source", SOURCES + ERROR_SOURCES)
+def test_pratt_parser_parity(source, capsys):
+    tokens = Scanner(source).scan_tokens()
+    expected = Parser(tokens).parse(), capsys.readouterr().out
+    actual = PrattParser(tokens).parse(), capsys.readouterr().out
+    Veda.had_error = False
+    assert actual == expected
+
+
+def test_pratt_parser_parity_random(capsys):
+    rng = random.Random(3)
+    atoms = ["1", "2.5", '"s"', "true", "false", "nil", "(", ")", "!", "-"] + OPERATORS
+    for _ in range(500):
+        source = " ".join(rng.choice(atoms) for _ in range(rng.randint(1, 25)))
+        tokens = Scanner(source).scan_tokens()
+        expected = Parser(tokens).parse(), capsys.readouterr().out
+        actual = PrattParser(tokens).parse(), capsys.readouterr().out
+        assert actual == expected
+    Veda.had_error = False
+
+
+def test_parse_tables_are_up_to_date(tmp_path):
+    GenerateParser.run(str(tmp_path))
+    expected = (Path(__file__).parent.parent / "src" / "veda" / "parse_tables.py").read_text()
+    assert (tmp_path / "parse_tables.py").read_text() == expected
+
+
+@pytest.mark.parametrize("source", SOURCES + ERROR_SOURCES)
+def test_table_parser_parity(source, capsys):
+    tokens = Scanner(source).scan_tokens()
+    expected = Parser(tokens).parse(), capsys.readouterr().out
+    actual = TableParser(tokens).parse(), capsys.readouterr().out
+    Veda.had_error = False
+    assert actual == expected
+
+
+def test_table_parser_parity_random(capsys):
+    rng = random.Random(5)
+    atoms = ["1", "2.5", '"s"', "true", "false", "nil", "x", "(", ")", "!", "-"] + OPERATORS
+    for _ in range(1000):
+        source = " ".join(rng.choice(atoms) for _ in range(rng.randint(1, 25)))
+        tokens = Scanner(source).scan_tokens()
+        expected = Parser(tokens).parse(), capsys.readouterr().out
+        actual = TableParser(tokens).parse(), capsys.readouterr().out
+        assert actual == expected, source
+    Veda.had_error = False
+
+
+def test_table_parser_interner():
+    tokens = Scanner("(1 + x) * (1 + x)").scan_tokens()
+    expression = TableParser(tokens, Interner()).parse()
+    assert expression == Parser(tokens).parse()
+    assert expression.left is expression.right
+
+
+def test_table_parser_deep_nesting():
+    depth = 100_000
+    source = "-(" * depth + "1" + " + 2)" * depth
+    expression = TableParser(Scanner(source).scan_tokens()).parse()
+    printed = AstPrinter().print(expression)
+    assert printed == "(- (group (+ " * depth + "1.0" + " 2.0)))" * depth
+
+
+@pytest.mark.parametrize("source", SOURCES + ERROR_SOURCES)
+def test_buffer_table_parser_parity(source, capsys):
+    expected = Parser(Scanner(source).scan_tokens()).parse(), capsys.readouterr().out
+    actual = BufferTableParser(Scanner(source).scan_buffer()).parse(), capsys.readouterr().out
+    Veda.had_error = False
+    assert actual[1] == expected[1]
+    assert (actual[0] is None) == (expected[0] is None)
+    if expected[0] is not None:
+        assert AstPrinter().print(actual[0]) == AstPrinter().print(expected[0])
+
+
+def test_buffer_table_parser_deep_nesting():
+    depth = 100_000
+    source = "(" * depth + "1" + ")" * depth
+    expression = BufferTableParser(Scanner(source).scan_buffer()).parse()
+    assert AstPrinter().print(expression) == "(group " * depth + "1.0" + ")" * depth
+
+
+def test_parse_all_recovers(capsys):
+    source = "1 + ; 2 * 3; (4 ; 5 6; -7"
+    parser = Parser(Scanner(source).scan_tokens())
+    expressions = parser.parse_all()
+    Veda.had_error = False
+    assert [AstPrinter().print(expression) for expression in expressions] == [
+        "(* 2.0 3.0)",
+        "(- 7.0)",
+    ]
+    assert capsys.readouterr().out == (
+        "[line: 1] Error at ';': Expect expression.\n"
+        "[line: 1] Error at ';': Expect ')' after expression.\n"
+        "[line: 1] Error at '6': Expect end of expression.\n"
+    )
+
+
+@pytest.mark.parametrize("source", SOURCES[:7] + SOURCES[8:])
+def test_parse_all_single_expression(source):
+    (expression,) = Parser(Scanner(source).scan_tokens()).parse_all()
+    assert AstPrinter().print(expression) == AstPrinter().print(_parse(source))
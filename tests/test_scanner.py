@@ -1,6 +1,12 @@
+import io
+import mmap
+import random
+import tracemalloc
+
 import pytest
 
-from src.veda import Scanner, Token, TokenType
+from src.veda import Scanner, Token, TokenType, Veda, scanner
+from src.veda.scanner import _bytes_token_pattern, _token_pattern
 
 
 def _token_equal(a: Token, b: Token):
@@ -394,3 +400,230 @@ def test_scan_if_else_stmt():
     assert _token_equal(tokens[13], TOKEN_SEMICOLON)
     assert _token_equal(tokens[14], TOKEN_RIGHT_BRACE)
     assert _token_equal(tokens[15], TOKEN_EOF)
+
+
+PARITY_SOURCES = [
+    "",
+    "(",
+    ")",
+    "{}",
+    ",.-+;/*",
+    "! != = == > >= < <=",
+    "and class else false fun for if nil or print return super this true var while",
+    '"abcdef"',
+    "1.25;",
+    "90.9",
+    "var v=1.25;",
+    "  var v  =   1234.567 ; ",
+    '  var language  =  "veda" ; ',
+    """
+        if v == true {
+            print "abc";
+        } else {
+            return nil;
+        }
+    """,
+    "1. .5 1.a a1_ _x 007",
+    "// comment only",
+    "a // trailing comment\nb",
+    "a / b // c / d\n/",
+    '"multi\nline\nstring" x',
+    '"unterminated\nstring',
+    "@ # $ ~ é 中 \0",
+    "\r\t \n\n\r\n",
+]
+
+ALPHABET = list('abcxyz_019.+-*/!=<>(){},;"@ \t\r\n') + ["//", "and", "nil", "1.5", "é"]
+
+
+def _scan_with(engine: str, source: str, capsys):
+    Veda.had_error = False
+    tokens = Scanner(source, engine=engine).scan_tokens()
+    output = capsys.readouterr().out
+    had_error = Veda.had_error
+    Veda.had_error = False
+    return [(t.type, t.lexeme, t.literal, t.line) for t in tokens], output, had_error
+
+
+def _assert_parity(source: str, capsys):
+    assert _scan_with("regex", source, capsys) == _scan_with("classic", source, capsys)
+
+
+@pytest.mark.parametrize("source", PARITY_SOURCES)
+def test_regex_engine_parity(source, capsys):
+    _assert_parity(source, capsys)
+
+
+def test_regex_engine_parity_random(capsys):
+    rng = random.Random(20220101)
+    for _ in range(200):
+        source = "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 200)))
+        _assert_parity(source, capsys)
+
+
+def test_regex_engine_parity_large(capsys):
+    rng = random.Random(7)
+    source = "".join(rng.choice(ALPHABET) for _ in range(100_000))
+    _assert_parity(source, capsys)
+
+
+def test_unknown_engine():
+    with pytest.raises(ValueError):
+        Scanner("", engine="nope")
+
+
+@pytest.mark.parametrize("chunk_size", [1, 2, 3, 7, 1 << 16])
+def test_iter_tokens_stream_parity(chunk_size, capsys):
+    rng = random.Random(chunk_size)
+    sources = PARITY_SOURCES + [
+        "".join(rng.choice(ALPHABET) for _ in range(rng.randint(0, 300))) for _ in range(50)
+    ]
+    for source in sources:
+        expected = _scan_with("classic", source, capsys)
+
+        Veda.had_error = False
+        tokens = Scanner(io.StringIO(source)).iter_tokens(chunk_size)
+        actual = [(t.type, t.lexeme, t.literal, t.line) for t in tokens]
+        assert (actual, capsys.readouterr().out, Veda.had_error) == expected
+        Veda.had_error = False
+
+
+def test_iter_tokens_is_lazy():
+    tokens = Scanner(io.StringIO("1 + 2" * 100_000)).iter_tokens(chunk_size=64)
+    assert _token_equal(next(tokens), Token(TokenType.NUMBER, "1", 1.0, 1))
+    assert _token_equal(next(tokens), TOKEN_PLUS)
+
+
+@pytest.mark.parametrize("source", PARITY_SOURCES)
+def test_scan_buffer_parity(source, capsys):
+    expected = _scan_with("classic", source, capsys)
+
+    Veda.had_error = False
+    buffer = Scanner(source).scan_buffer()
+    actual = [(t.type, t.lexeme, t.literal, t.line) for t in buffer]
+    assert (actual, capsys.readouterr().out, Veda.had_error) == expected
+    Veda.had_error = False
+
+
+def test_scan_buffer_spans(capsys):
+    source = 'x = 1;\n  "a\nb" // c\n\t y.z @\n'
+    spans = [(start, end) for _, start, end in Scanner(source).match_spans(source, 0, True)]
+    buffer = Scanner(source).scan_buffer()
+    assert capsys.readouterr().out == "[line: 4] Error : Unexpected character.\n" * 2
+    Veda.had_error = False
+    assert [(token.start, token.end) for token in buffer][:-1] == spans
+    assert [token.lexeme for token in buffer] == [source[a:b] for a, b in spans] + [""]
+    assert [(token.line, token.column) for token in buffer] == [
+        (1, 1),
+        (1, 3),
+        (1, 5),
+        (1, 6),
+        (3, 3),
+        (4, 3),
+        (4, 4),
+        (4, 5),
+        (5, 1),
+    ]
+
+
+def test_scan_buffer_does_not_count_lines():
+    buffer = Scanner("1 +\n2\n" * 100).scan_buffer()
+    assert buffer.line_table is None
+    assert buffer[-1].line == 201
+    assert len(buffer.lines) == 201
+
+
+def test_scan_buffer_is_smaller_than_token_list():
+    source = "var x = 1.5 + y * (2 - z); // note\n" * 2000
+
+    tracemalloc.start()
+    tokens = Scanner(source).scan_tokens()
+    token_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    buffer = Scanner(source).scan_buffer()
+    buffer_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert len(buffer) == len(tokens)
+    assert buffer_bytes * 4 < token_bytes
+
+
+@pytest.mark.parametrize("pattern", [_token_pattern, _bytes_token_pattern])
+def test_token_pattern_group_numbers(pattern):
+    groups = pattern().groupindex
+    assert [groups[name] for name in ("blank", "identifier", "number", "operator")] == [
+        scanner._BLANK,
+        scanner._IDENTIFIER,
+        scanner._NUMBER,
+        scanner._OPERATOR,
+    ]
+    assert [groups[name] for name in ("comment", "string", "unterminated")] == [
+        scanner._COMMENT,
+        scanner._STRING,
+        scanner._UNTERMINATED,
+    ]
+
+
+def _binary_sources(source: str, tmp_path):
+    data = source.encode()
+    yield data
+    yield bytearray(data)
+    yield memoryview(data)
+    if data:
+        path = tmp_path / "source.veda"
+        path.write_bytes(data)
+        with open(path, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            yield mapped
+
+
+@pytest.mark.parametrize("source", PARITY_SOURCES)
+def test_binary_source_parity(source, tmp_path, capsys):
+    expected = _scan_with("classic", source, capsys)
+    for data in _binary_sources(source, tmp_path):
+        assert _scan_with("classic", data, capsys) == expected
+
+        Veda.had_error = False
+        buffer = Scanner(data).scan_buffer()
+        actual = [(t.type, t.lexeme, t.literal, t.line) for t in buffer]
+        assert (actual, capsys.readouterr().out, Veda.had_error) == expected
+        Veda.had_error = False
+
+
+def test_binary_source_parity_random(capsys):
+    rng = random.Random(21)
+    for _ in range(200):
+        source = "".join(rng.choice(ALPHABET + ["中", "\u00e9\u0301"]) for _ in range(100))
+        assert _scan_with("classic", source.encode(), capsys) == _scan_with(
+            "classic", source, capsys
+        )
+
+
+def test_binary_buffer_offsets_are_bytes():
+    buffer = Scanner('"é" x'.encode()).scan_buffer()
+    assert (buffer.starts[0], buffer.ends[0], buffer.starts[1]) == (0, 4, 5)
+    assert (buffer[0].lexeme, buffer[0].literal, buffer[1].lexeme) == ('"é"', "é", "x")
+
+
+def test_binary_source_invalid_utf8(tmp_path, capsys):
+    source = b'"a\xff\nb" 1 + "\xc3\xa9" @ "\xe9\n" 2'
+    expected = [(TokenType.NUMBER, "1"), (TokenType.PLUS, "+"), (TokenType.STRING, '"é"')]
+    expected += [(TokenType.NUMBER, "2"), (TokenType.EOF, "")]
+    out = (
+        "[line: 2] Error : Invalid UTF-8 in string.\n"
+        "[line: 2] Error : Unexpected character.\n"
+        "[line: 3] Error : Invalid UTF-8 in string.\n"
+    )
+    data = tmp_path / "source.veda"
+    data.write_bytes(source)
+    with open(data, "rb") as f, mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+        for data in (source, mapped):
+            tokens = Scanner(data).scan_tokens()
+            assert [(t.type, t.lexeme) for t in tokens] == expected
+            assert capsys.readouterr().out == out
+            buffer = Scanner(data).scan_buffer()
+            assert [(t.type, t.lexeme) for t in buffer] == expected
+            assert buffer[2].literal == "é"
+            assert capsys.readouterr().out == out
+    Veda.had_error = False
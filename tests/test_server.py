@@ -0,0 +1,268 @@
+import asyncio
+import json
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+from src.veda import Scanner, server
+from src.veda.server import (
+    INVALID_PARAMS,
+    INVALID_REQUEST,
+    METHOD_NOT_FOUND,
+    PARSE_ERROR,
+    REQUEST_CANCELLED,
+    Server,
+    encode_message,
+    read_message,
+)
+
+ROOT = Path(__file__).resolve().parents[1]
+
+
+def _decode(data: bytes):
+    messages = list()
+    while data:
+        header, _, rest = data.partition(b"\r\n\r\n")
+        length = int(header.split(b":")[1])
+        messages.append(json.loads(rest[:length]))
+        data = rest[length:]
+    return messages
+
+
+def _serve(*messages):
+    output = list()
+
+    async def run():
+        reader = asyncio.StreamReader()
+        for message in messages:
+            reader.feed_data(message if isinstance(message, bytes) else encode_message(message))
+        reader.feed_eof()
+        await Server(output.append).serve(reader)
+
+    asyncio.run(run())
+    return _decode(b"".join(output))
+
+
+def _request(id, method, **params):
+    return {"jsonrpc": "2.0", "id": id, "method": method, "params": params}
+
+
+def _notification(method, **params):
+    return {"jsonrpc": "2.0", "method": method, "params": params}
+
+
+def _results(responses):
+    return {response["id"]: response.get("result", response.get("error")) for response in responses}
+
+
+def test_requests_on_text():
+    results = _results(
+        _serve(
+            _request(1, "scan", text="1 + x"),
+            _request(6, "scan", text='1\n"a\nb" +\n  y'),
+            _request(2, "parse", text="1 +"),
+            _request(3, "print", text="-(1 + 2)"),
+            _request(4, "evaluate", text="x * 2 + y", variables={"x": 3, "y": 0.5}),
+            _request(5, "shutdown"),
+        )
+    )
+    assert [token["type"] for token in results[1]["tokens"]] == [
+        "NUMBER",
+        "PLUS",
+        "IDENTIFIER",
+        "EOF",
+    ]
+    assert results[1]["tokens"][2] == {
+        "type": "IDENTIFIER",
+        "lexeme": "x",
+        "literal": None,
+        "symbol": len(Scanner.keywords),
+        "line": 1,
+        "start": 4,
+        "end": 5,
+    }
+    assert results[2] == {
+        "valid": False,
+        "diagnostics": [
+            {"line": 1, "column": 4, "where": "at end", "message": "Expect expression."}
+        ],
+    }
+    assert results[3] == {"text": "(- (group (+ 1.0 2.0)))", "diagnostics": []}
+    assert results[4] == {"value": "6.5", "diagnostics": []}
+    assert results[5] is None
+    assert [(token["line"], token["start"], token["end"]) for token in results[6]["tokens"]] == [
+        (1, 0, 1),
+        (3, 2, 7),
+        (3, 8, 9),
+        (4, 12, 13),
+        (4, 13, 13),
+    ]
+
+
+def test_evaluate_errors():
+    results = _results(
+        _serve(
+            _request(1, "evaluate", text='"a" - 1'),
+            _request(2, "evaluate", text="\n1 + x"),
+            _request(3, "evaluate", text="1 +"),
+            _request(4, "evaluate", text="x", variables=[1]),
+            _request(5, "evaluate", text="x == true", variables={"x": True}),
+        )
+    )
+    assert results[1] == {
+        "value": None,
+        "diagnostics": [{"line": 1, "where": "", "message": "Operands must be numbers."}],
+    }
+    assert results[2]["diagnostics"][0]["message"] == "Undefined variable 'x'."
+    assert results[2]["diagnostics"][0]["line"] == 2
+    assert results[3]["value"] is None
+    assert results[3]["diagnostics"][0]["message"] == "Expect expression."
+    assert results[3]["diagnostics"][0]["column"] == 4
+    assert results[4]["code"] == INVALID_PARAMS
+    assert results[5]["value"] == "true"
+
+
+def test_deeply_nested_text():
+    depth = 20_000
+    text = "-(" * depth + "1" + ")" * depth
+    results = _results(
+        _serve(
+            _request(1, "scan", text=text),
+            _request(2, "parse", text=text),
+            _request(3, "print", text=text),
+            _request(4, "evaluate", text=text),
+            _request(5, "parse", text="-(" * depth),
+        )
+    )
+    assert len(results[1]["tokens"]) == 3 * depth + 2
+    assert results[2] == {"valid": True, "diagnostics": []}
+    assert results[3]["text"] == "(- (group " * depth + "1.0" + "))" * depth
+    assert results[4] == {"value": "1", "diagnostics": []}
+    assert results[5]["valid"] is False
+    assert results[5]["diagnostics"][0]["message"] == "Expect expression."
+
+
+def test_documents(monkeypatch):
+    analyses = list()
+
+    class Analysis(server.Analysis):
+        def __init__(self, source):
+            analyses.append(source)
+            super().__init__(source)
+
+    monkeypatch.setattr(server, "Analysis", Analysis)
+    results = _results(
+        _serve(
+            _notification("open", uri="a", text="1 + 2"),
+            *[_request(i, "print", uri="a") for i in range(5)],
+            _notification("change", uri="a", offset=4, deleted=1, inserted="(3 * 4)"),
+            _request(5, "evaluate", uri="a"),
+            _request(6, "parse", uri="a"),
+            _notification("change", uri="a", text="1 +"),
+            _request(7, "parse", uri="a"),
+            _notification("close", uri="a"),
+            _request(8, "parse", uri="a"),
+        )
+    )
+    assert [results[i]["text"] for i in range(5)] == ["(+ 1.0 2.0)"] * 5
+    assert results[5] == {"value": "13", "diagnostics": []}
+    assert results[6]["valid"] and not results[7]["valid"]
+    assert results[8]["code"] == INVALID_PARAMS
+    assert analyses == ["1 + 2", "1 + (3 * 4)", "1 +"]
+
+
+def test_cancel():
+    responses = _serve(
+        _notification("open", uri="a", text="1 + 2"),
+        _request(1, "print", uri="a"),
+        _request(2, "print", uri="a"),
+        _notification("$/cancelRequest", id=1),
+        _notification("$/cancelRequest", id=99),
+    )
+    results = _results(responses)
+    assert len(responses) == 2
+    assert results[1] == {"code": REQUEST_CANCELLED, "message": "Request cancelled"}
+    assert results[2]["text"] == "(+ 1.0 2.0)"
+
+
+def test_cancel_running_request():
+    async def run():
+        output = list()
+        reader = asyncio.StreamReader()
+        instance = Server(output.append)
+        serving = asyncio.ensure_future(instance.serve(reader))
+        reader.feed_data(encode_message(_request(1, "print", text=" + ".join(["1"] * 50_000))))
+        while not instance.tasks:
+            await asyncio.sleep(0)
+        await asyncio.sleep(0.01)
+        reader.feed_data(encode_message(_notification("$/cancelRequest", id=1)))
+        reader.feed_eof()
+        await serving
+        return _decode(b"".join(output))
+
+    (response,) = asyncio.run(run())
+    assert response["error"]["code"] == REQUEST_CANCELLED
+
+
+def test_protocol_errors():
+    responses = _serve(
+        b"Content-Length: 5\r\n\r\n{nope",
+        {"jsonrpc": "2.0", "id": 1},
+        [1, 2],
+        _request(2, "nope"),
+        _request(3, "parse"),
+        {"jsonrpc": "2.0", "id": 4, "method": "parse", "params": [1]},
+        _notification("change", uri="missing", text="1"),
+        _notification("nope"),
+    )
+    assert [(response["id"], response["error"]["code"]) for response in responses] == [
+        (None, PARSE_ERROR),
+        (1, INVALID_REQUEST),
+        (None, INVALID_REQUEST),
+        (2, METHOD_NOT_FOUND),
+        (3, INVALID_PARAMS),
+        (4, INVALID_PARAMS),
+    ]
+
+
+def test_exit_stops_reading():
+    responses = _serve(_request(1, "shutdown"), _notification("exit"), _request(2, "shutdown"))
+    assert [response["id"] for response in responses] == [1]
+
+
+def test_read_message():
+    async def run(data):
+        reader = asyncio.StreamReader()
+        reader.feed_data(data)
+        reader.feed_eof()
+        return await read_message(reader)
+
+    framed = b"Content-Type: application/json\r\ncontent-length: 2\r\n\r\n{}"
+    assert asyncio.run(run(framed)) == b"{}"
+    assert asyncio.run(run(b"")) is None
+    assert asyncio.run(run(b"Content-Length: 10\r\n\r\n{}")) is None
+    with pytest.raises(ValueError):
+        asyncio.run(run(b"Content-Type: x\r\n\r\n{}"))
+
+
+def test_stdio():
+    messages = [
+        _notification("open", uri="a", text="(1 + x) * 2"),
+        _request(1, "evaluate", uri="a", variables={"x": 2}),
+        _request(2, "print", uri="a"),
+        _notification("exit"),
+    ]
+    process = subprocess.run(
+        [sys.executable, "-m", "src.veda", "serve"],
+        cwd=ROOT,
+        input=b"".join(map(encode_message, messages)),
+        capture_output=True,
+        check=True,
+    )
+    results = _results(_decode(process.stdout))
+    assert results == {
+        1: {"value": "6", "diagnostics": []},
+        2: {"text": "(* (group (+ 1.0 x)) 2.0)", "diagnostics": []},
+    }
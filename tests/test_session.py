@@ -0,0 +1,87 @@
+import io
+from concurrent.futures import ThreadPoolExecutor
+
+from src.veda import Parser, Scanner, Session, Veda
+from src.veda.ast_printer import AstPrinter
+from src.veda.compiler import Compiler
+from src.veda.incremental import Document
+from src.veda.interpreter import Interpreter
+from src.veda.vm import VM
+
+
+def _check(index):
+    out = io.StringIO()
+    session = Session(out)
+    source = f"{index} + ({index} * 2)" if index % 2 else f"{index} + @ ("
+    expression = session.parse(source)
+    printed = None if expression is None else AstPrinter().print(expression)
+    return index, printed, session.had_error, out.getvalue()
+
+
+def test_threads():
+    with ThreadPoolExecutor(8) as executor:
+        results = list(executor.map(_check, range(400)))
+    for index, printed, had_error, output in results:
+        if index % 2:
+            assert (printed, had_error, output) == (
+                f"(+ {index}.0 (group (* {index}.0 2.0)))",
+                False,
+                "",
+            )
+        else:
+            assert printed is None and had_error
+            assert output == (
+                "[line: 1] Error : Unexpected character.\n"
+                "[line: 1] Error  at end: Expect expression.\n"
+            )
+    assert not Veda.had_error
+
+
+def test_reporters(capsys):
+    session = Session()
+    tokens = Scanner('"a', reporter=session).scan_tokens()
+    assert session.had_error
+    assert Parser(tokens, reporter=Session()).parse() is None
+    assert capsys.readouterr().out == (
+        "[line: 1] Error : Unterminated string.\n[line: 1] Error  at end: Expect expression.\n"
+    )
+    assert not Veda.had_error
+
+
+def test_runtime_errors():
+    out = io.StringIO()
+    session = Session(out)
+    expression = session.parse('"a" - 1')
+    VM(reporter=session).interpret(Compiler().compile(expression))
+    Interpreter(reporter=session).interpret(expression)
+    assert session.had_runtime_error and not session.had_error
+    assert out.getvalue() == "Operands must be numbers.\n[line 1]\n" * 2
+    assert not Veda.had_runtime_error
+
+
+def test_document():
+    out = io.StringIO()
+    session = Session(out)
+    document = Document("1 + (2)", reporter=session)
+    assert not session.had_error
+    assert document.edit(4, 3, "") is None
+    assert session.had_error
+    assert out.getvalue() == "[line: 1] Error  at end: Expect expression.\n"
+    assert not Veda.had_error
+
+
+def test_veda_is_the_default(capsys):
+    assert Parser(Scanner("1 +").scan_tokens()).parse() is None
+    assert Veda.had_error
+    Veda.had_error = False
+    assert capsys.readouterr().out == "[line: 1] Error  at end: Expect expression.\n"
+
+
+def test_parse_deeply_nested():
+    depth = 10_000
+    out = io.StringIO()
+    session = Session(out)
+    expression = session.parse("-(" * depth + "1" + ")" * depth)
+    assert AstPrinter().print(expression) == "(- (group " * depth + "1.0" + "))" * depth
+    assert Session(out).parse("(" * depth + "1") is None
+    assert out.getvalue() == "[line: 1] Error  at end: Expect ')' after expression.\n"
@@ -0,0 +1,52 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+
+# Modules that running a small script must not import: only other features need them, and
+# each one adds milliseconds to every launch.
+DEFERRED = [
+    "typing",
+    "re",
+    "tempfile",
+    "hashlib",
+    "argparse",
+    "numpy",
+    "src.veda.ast_printer",
+    "src.veda.batch",
+    "src.veda.interner",
+    "src.veda.parse_cache",
+    "src.veda.pratt_parser",
+    "src.veda.stats",
+    "src.veda.token_buffer",
+]
+
+
+def _importtime(tmp_path):
+    script = tmp_path / "script.veda"
+    script.write_text("1 + 2 * 3")
+    env = dict(os.environ, VEDA_CACHE_DIR=str(tmp_path / "cache"))
+    process = subprocess.run(
+        [sys.executable, "-X", "importtime", "-m", "src.veda", str(script)],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    assert process.stdout == "7\n"
+
+    imports = set()
+    for line in process.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        imports.add(line.split("|")[-1].strip())
+    return imports
+
+
+def test_deferred_modules_are_not_imported(tmp_path):
+    imports = _importtime(tmp_path)
+    assert "src.veda.scanner" in imports
+    assert [name for name in DEFERRED if name in imports] == []
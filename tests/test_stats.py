@@ -0,0 +1,90 @@
+import pstats
+
+import pytest
+
+from src.veda import Veda
+from src.veda.stats import Stats
+
+
+@pytest.fixture
+def script(tmp_path, monkeypatch):
+    monkeypatch.setenv("VEDA_CACHE_DIR", str(tmp_path / "cache"))
+    script = tmp_path / "script.veda"
+    script.write_text("(1 + 2) * -3 == -9")
+    return script
+
+
+def test_phases(script, capsys):
+    stats = Stats()
+    assert Veda(stats).run_file(str(script)) == 0
+    assert capsys.readouterr().out == "true\n"
+
+    phases = {phase.name: phase for phase in stats.totals()}
+    assert list(phases) == ["scan", "parse", "optimize", "compile", "run"]
+    assert phases["scan"].count == 12
+    assert phases["parse"].count == 10
+    assert phases["optimize"].count == 1
+    assert all(phase.seconds > 0 for phase in phases.values())
+    assert all(phase.result is None for phase in stats.phases)
+
+
+def test_phases_add_up(script, capsys):
+    stats = Stats()
+    Veda(stats).run_file(str(script))
+    Veda(stats).run_file(str(script))
+    assert len(stats.phases) == 10
+    assert [phase.count for phase in stats.totals()][:2] == [24, 20]
+
+
+def test_parse_error(tmp_path, capsys):
+    script = tmp_path / "script.veda"
+    script.write_text("1 +")
+    stats = Stats()
+    assert Veda(stats).run_file(str(script)) == 65
+    Veda.had_error = False
+    assert [phase.name for phase in stats.totals()] == ["scan", "parse"]
+    assert stats.totals()[1].count == 0
+
+
+def test_unknown_phase():
+    with pytest.raises(ValueError):
+        Stats(profile="lex")
+    with pytest.raises(ValueError):
+        Stats(profile="scan", profile_format="svg")
+
+
+def test_main_stats(script, capsys):
+    Veda().main("--stats", str(script))
+    out, err = capsys.readouterr()
+    assert out == "true\n"
+    assert err.splitlines()[0].split() == ["phase", "time", "(ms)", "count", "throughput"]
+    assert err.splitlines()[1].split()[0] == "scan"
+    assert "12 tokens" in err
+
+
+def test_main_usage(script):
+    with pytest.raises(SystemExit) as exit:
+        Veda().main("--stats", str(script), str(script))
+    assert exit.value.code == 64
+    with pytest.raises(SystemExit) as exit:
+        Veda().main("--profile", "lex", str(script))
+    assert exit.value.code == 64
+
+
+def test_profile_pstats(script, tmp_path, capsys):
+    output = tmp_path / "parse.prof"
+    Veda().main("--profile", "parse", "--profile-output", str(output), str(script))
+    functions = {name for _, _, name in pstats.Stats(str(output)).stats}
+    assert "parse" in functions
+    assert "scan_tokens" not in functions
+
+
+def test_profile_collapsed(script, capsys):
+    Veda().main("--stats", "--profile", "scan", "--profile-format", "collapsed", str(script))
+    stacks = capsys.readouterr().err.splitlines()[6:]
+    assert stacks
+    for line in stacks:
+        path, microseconds = line.rsplit(" ", 1)
+        assert int(microseconds) > 0
+    assert any(line.startswith("scan_tokens (scanner.py);scan_token") for line in stacks)
+    assert not any("parse" in line for line in stacks)
@@ -0,0 +1,104 @@
+import tracemalloc
+
+import pytest
+
+from src.veda import Parser, Scanner, Session, TokenType, Veda
+from src.veda.symbols import SymbolTable
+
+from .test_scanner import ALPHABET, PARITY_SOURCES
+
+
+def test_lookup():
+    symbols = SymbolTable()
+    keywords = len(Scanner.keywords)
+    assert len(symbols) == keywords
+    assert symbols.types[symbols.lookup("while")] == TokenType.WHILE
+    assert "x" not in symbols
+    x = symbols.lookup("x")
+    assert (x, symbols.lookup("y"), symbols.lookup("x")) == (keywords, keywords + 1, keywords)
+    assert symbols.names[x] == "x" and symbols.types[x] == TokenType.IDENTIFIER
+    assert "x" in symbols and len(symbols) == keywords + 2
+
+
+def test_session_shares_symbols():
+    session = Session()
+    first = session.scan("alpha + beta")
+    second = session.scan("beta * alpha")
+    assert first[0].symbol == second[2].symbol
+    assert first[2].symbol == second[0].symbol
+    assert first[0].lexeme is second[2].lexeme
+    assert first[0].symbol != first[2].symbol
+    assert Session().scan("beta")[0].symbol == len(Scanner.keywords)
+    assert first[0].literal is None
+
+
+def test_symbols_leave_trees_equal():
+    session = Session()
+    session.parse("y")
+    expression = session.parse("x + y")
+    assert expression.left.name.symbol != Session().parse("x").name.symbol
+    assert expression == Parser(Scanner("x + y").scan_tokens()).parse()
+    assert hash(expression) == hash(Parser(Scanner("x + y").scan_tokens()).parse())
+
+
+def _scan(source, symbols, capsys, **options):
+    tokens = Scanner(source, symbols=symbols, **options).scan_tokens()
+    Veda.had_error = False
+    capsys.readouterr()
+    return tokens
+
+
+@pytest.mark.parametrize(
+    "options, encode",
+    [({}, False), ({"engine": "regex"}, False), ({}, True)],
+    ids=["classic", "regex", "bytes"],
+)
+def test_engine_parity(options, encode, capsys):
+    sources = PARITY_SOURCES + ["".join(ALPHABET) * 3, "and or x_1 x_1 nil"]
+    for source in sources:
+        data = source.encode() if encode else source
+        symbols = SymbolTable()
+        plain = _scan(data, None, capsys, **options)
+        interned = _scan(data, symbols, capsys, **options)
+        assert [(t.type, t.lexeme, t.line) for t in interned] == [
+            (t.type, t.lexeme, t.line) for t in plain
+        ]
+        for token, reference in zip(interned, plain):
+            assert token.literal == reference.literal
+            if token.type == TokenType.IDENTIFIER:
+                assert symbols.names[token.symbol] is token.lexeme
+            else:
+                assert token.symbol is None
+
+
+def test_buffer_carries_ids(capsys):
+    for source in ["a + b * a", b"a + b * a"]:
+        symbols = SymbolTable()
+        buffer = Scanner(source, symbols=symbols).scan_buffer()
+        assert [t.literal for t in buffer] == [None] * 6
+        assert [t.symbol for t in buffer] == [
+            symbols.ids["a"],
+            None,
+            symbols.ids["b"],
+            None,
+            symbols.ids["a"],
+            None,
+        ]
+    assert Scanner("a").scan_buffer()[0].symbol is None
+
+
+def test_interning_saves_memory():
+    source = " + ".join(f"identifier_{i % 50}" for i in range(20_000))
+
+    tracemalloc.start()
+    plain = Scanner(source).scan_tokens()
+    plain_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    interned = Scanner(source, symbols=SymbolTable()).scan_tokens()
+    interned_bytes = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    assert len(plain) == len(interned)
+    assert interned_bytes < plain_bytes * 0.8
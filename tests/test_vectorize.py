@@ -0,0 +1,122 @@
+import math
+import random
+
+import pytest
+
+from src.veda import Parser, Scanner
+from src.veda.interpreter import Interpreter
+from src.veda.runtime import VedaRuntimeError, stringify
+
+from .test_vm import SOURCES
+
+np = pytest.importorskip("numpy")
+
+from src.veda.vectorize import evaluate_columns  # noqa: E402
+
+
+def _parse(source: str):
+    return Parser(Scanner(source).scan_tokens()).parse()
+
+
+def _rows(source: str, columns):
+    expression = _parse(source)
+    size = len(next(iter(columns.values())))
+    results = []
+    for i in range(size):
+        variables = {name: values[i] for name, values in columns.items()}
+        try:
+            results.append(stringify(Interpreter(variables).evaluate(expression)))
+        except VedaRuntimeError as error:
+            return str(error)
+    return results
+
+
+def _vector(source: str, columns):
+    try:
+        result = evaluate_columns(_parse(source), columns)
+    except VedaRuntimeError as error:
+        return str(error)
+    return [stringify(value) for value in result.tolist()]
+
+
+COLUMNS = {
+    "x": [1.0, -2.5, 0.0, 3.0, -0.0],
+    "y": [2.0, 0.0, 0.0, -1.0, 4.0],
+    "b": [True, False, True, False, True],
+    "s": ["a", "b", "", "d", "e"],
+    "m": [1.0, "a", None, True, 2.0],
+    "n": [1.0, True, 0.0, False, 2],
+}
+
+
+@pytest.mark.parametrize(
+    "source",
+    [
+        "x + y * 2",
+        "x / y",
+        "-x - y",
+        "x < y == (x >= y) != b",
+        "x == y",
+        "x != b",
+        "!x == !b",
+        "!!b",
+        's + s + "!"',
+        's == "a"',
+        "m == 1",
+        "!m",
+        "m == nil",
+        "n == true",
+        "n == 1",
+        "!n",
+        "n + 1",
+        "x == nil",
+        "1 + 2 == x",
+        "s + 1",
+        "-b",
+        "x + s",
+    ]
+    + SOURCES,
+)
+def test_matches_row_by_row(source):
+    assert _vector(source, COLUMNS) == _rows(source, COLUMNS)
+
+
+def test_matches_row_by_row_random():
+    rng = random.Random(13)
+    atoms = ["x", "y", "b", "1", "0", "true", "nil", "-x"]
+    operators = ["+", "-", "*", "/", "==", "!=", "<", "<=", ">", ">="]
+    for _ in range(300):
+        parts = [rng.choice(atoms)]
+        for _ in range(rng.randint(0, 5)):
+            parts.append(rng.choice(operators))
+            parts.append(rng.choice(["", "!", "-"]) + rng.choice(atoms))
+        source = " ".join(parts)
+        expected = _rows(source, COLUMNS)
+        if isinstance(expected, list):
+            assert _vector(source, COLUMNS) == expected, source
+
+
+def test_numeric_result_is_a_float_array():
+    x = np.arange(1_000_000, dtype=np.int64)
+    result = evaluate_columns(_parse("x * 2 + 1 / 2"), {"x": x})
+    assert result.dtype == np.float64
+    assert result[-1] == 1_999_998.5
+
+
+def test_string_result_narrows_back_to_numbers():
+    result = evaluate_columns(_parse('(s + "") == "a"'), {"s": ["a", "b"]})
+    assert result.dtype == np.bool_ and result.tolist() == [True, False]
+
+
+def test_constant_is_broadcast():
+    result = evaluate_columns(_parse("1 + 2"), {"x": [1, 2, 3]})
+    assert result.tolist() == [3.0, 3.0, 3.0]
+    assert evaluate_columns(_parse("0 / 0"), {}, size=2).dtype == np.float64
+    assert math.isnan(evaluate_columns(_parse("0 / 0"), {})[0])
+
+
+def test_errors():
+    with pytest.raises(VedaRuntimeError, match="Undefined variable 'z'."):
+        evaluate_columns(_parse("x +\n z"), COLUMNS)
+    with pytest.raises(ValueError):
+        evaluate_columns(_parse("x"), {"x": [1], "y": [1, 2]})
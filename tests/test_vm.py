@@ -0,0 +1,172 @@
+import io
+import math
+import random
+
+import pytest
+
+from src.veda import Parser, Scanner, Session, Veda, veda
+from src.veda.chunk import Chunk
+from src.veda.compiler import Compiler
+from src.veda.interpreter import Interpreter
+from src.veda.runtime import VedaRuntimeError, stringify
+from src.veda.vm import VM
+
+SOURCES = [
+    "1 + 2 * 3 - 4 / 2",
+    "-(1 + 2) * -3",
+    "(1 + 2) * 3 / 2 == 4.5",
+    '"ab" + "cd"',
+    '"a" == "a"',
+    "nil == nil",
+    "nil == false",
+    "1 == true",
+    "!nil",
+    "!0",
+    "!!true",
+    "1 < 2 == 2 >= 3",
+    "1 <= 1 != 2 > 3",
+    "1 / 0",
+    "-1 / 0",
+    "0 / 0",
+    "3 != 3",
+]
+
+ERROR_SOURCES = [
+    ('"a" - 1', "Operands must be numbers.", 1),
+    ('1 + "a"', "Operands must be two numbers or two strings.", 1),
+    ("1 +\n\n true", "Operands must be two numbers or two strings.", 1),
+    ('-"a"', "Operand must be a number.", 1),
+    ('1 +\n (2 <\n "b")', "Operands must be numbers.", 2),
+    ("nil * 2", "Operands must be numbers.", 1),
+    ("1 +\n x", "Undefined variable 'x'.", 2),
+]
+
+
+def _parse(source: str):
+    return Parser(Scanner(source).scan_tokens()).parse()
+
+
+def _evaluate_both(source: str):
+    expression = _parse(source)
+    results = []
+    for evaluate in (Interpreter().evaluate, lambda e: VM().run(Compiler().compile(e))):
+        try:
+            results.append(stringify(evaluate(expression)))
+        except VedaRuntimeError as error:
+            results.append((str(error), error.token.line))
+    return results
+
+
+@pytest.mark.parametrize("source", SOURCES)
+def test_vm_matches_interpreter(source):
+    tree, vm = _evaluate_both(source)
+    assert vm == tree
+
+
+@pytest.mark.parametrize("source, message, line", ERROR_SOURCES)
+def test_runtime_errors(source, message, line):
+    tree, vm = _evaluate_both(source)
+    assert vm == tree == (message, line)
+
+
+def test_vm_matches_interpreter_random():
+    rng = random.Random(11)
+    atoms = ["1", "2.5", "0", '"s"', "true", "nil"]
+    operators = ["+", "-", "*", "/", "==", "!=", "<", "<=", ">", ">="]
+    for _ in range(500):
+        parts = [rng.choice(atoms)]
+        for _ in range(rng.randint(0, 8)):
+            parts.append(rng.choice(operators))
+            parts.append(rng.choice(["", "-", "!"]) + rng.choice(atoms))
+        tree, vm = _evaluate_both(" ".join(parts))
+        assert vm == tree
+
+
+def test_division_by_zero():
+    assert math.isinf(VM().run(Compiler().compile(_parse("1 / 0"))))
+    assert math.isnan(VM().run(Compiler().compile(_parse("0 / 0"))))
+
+
+def test_constant_long():
+    source = " + ".join(str(i) for i in range(1000))
+    chunk = Compiler().compile(_parse(source))
+    assert len(chunk.constants) == 1000
+    assert VM().run(chunk) == sum(range(1000))
+
+
+def test_constants_are_shared():
+    chunk = Compiler().compile(_parse("1 + a * 1 + 2 / 1"))
+    assert chunk.constants == [1.0, "a", 2.0]
+    assert VM({"a": 3.0}).run(chunk) == 6.0
+    chunk = Compiler().compile(_parse('a + "a" + a'))
+    assert chunk.constants == ["a"]
+    assert VM({"a": "b"}).run(chunk) == "bab"
+
+    chunk = Chunk()
+    assert [chunk.add_constant(value) for value in (0.0, -0.0, 1.0, True, 0.0)] == [0, 1, 2, 3, 0]
+
+
+def test_too_many_constants(monkeypatch):
+    monkeypatch.setattr(Chunk, "MAX_CONSTANTS", 3)
+    session = Session(io.StringIO())
+    assert Compiler(reporter=session).compile(_parse("1 + 2 * 1 -\n 3 / x")) is None
+    assert session.out.getvalue() == "[line: 2] Error at 'x': Too many constants in one chunk.\n"
+    assert Compiler(reporter=session).compile(_parse("1 + 2 * 1 - 3 / 2")) is not None
+
+
+def test_run_file(tmp_path, capsys, monkeypatch):
+    monkeypatch.setenv("VEDA_CACHE_DIR", str(tmp_path / "cache"))
+    script = tmp_path / "script.veda"
+    script.write_text('(1 + 2) * 3 == 9\n"a" - 1')
+    Veda().main(str(script))
+    assert capsys.readouterr().out == "true\n"
+
+    script.write_text('\n"a" - 1')
+    with pytest.raises(SystemExit) as exit:
+        Veda().main(str(script))
+    Veda.had_runtime_error = False
+    assert exit.value.code == 70
+    assert capsys.readouterr().out == "Operands must be numbers.\n[line 2]\n"
+
+
+def test_run_file_mapped(tmp_path, capsys, monkeypatch):
+    monkeypatch.setattr(veda, "MMAP_MIN_SIZE", 1)
+    monkeypatch.setenv("VEDA_NO_CACHE", "1")
+    script = tmp_path / "script.veda"
+    script.write_text('// é\n("é" + "a" == "éa") == !(1 < 2)\n"a" - 1')
+    assert Veda().run_file(str(script)) == 0
+    assert capsys.readouterr().out == "false\n"
+
+    script.write_text('"é" -\n  1 @')
+    assert Veda().run_file(str(script)) == 65
+    Veda.had_error = False
+    assert capsys.readouterr().out == "[line: 2] Error : Unexpected character.\n"
+
+
+@pytest.mark.parametrize("mmap_min_size", [0, 1 << 20])
+def test_run_file_line_endings(tmp_path, capsys, monkeypatch, mmap_min_size):
+    monkeypatch.setattr(veda, "MMAP_MIN_SIZE", mmap_min_size)
+    monkeypatch.setenv("VEDA_NO_CACHE", "1")
+    script = tmp_path / "script.veda"
+    script.write_bytes(b'"a\r\nb" == "a\nb"')
+    assert Veda().run_file(str(script)) == 0
+    assert capsys.readouterr().out == "false\n"
+
+    # A lone `\r` is a blank, not a line break.
+    script.write_bytes(b"1\r\r\n\r+ nil")
+    assert Veda().run_file(str(script)) == 70
+    Veda.had_runtime_error = False
+    assert capsys.readouterr().out == ("Operands must be two numbers or two strings.\n[line 2]\n")
+
+    # Too short to map, whatever the threshold.
+    script.write_bytes(b"")
+    assert Veda().run_file(str(script)) == 65
+    Veda.had_error = False
+    assert capsys.readouterr().out == "[line: 1] Error  at end: Expect expression.\n"
+
+
+def test_variables():
+    expression = _parse('x * 2 == y + 1 != (s + "!" == "a!")')
+    variables = {"x": 1.5, "y": 2.0, "s": "a"}
+    assert VM(variables).run(Compiler().compile(expression)) is False
+    assert Interpreter(variables).evaluate(expression) is False